@@ -0,0 +1,270 @@
+# File: backend/api/admission.py
+"""
+Admission control for the QA and audio routes.
+
+Every request takes a slot before it does any work:
+- At most `max_in_flight` requests run at once across the app, and at
+  most `max_queue` more wait for a slot. Beyond that requests fail fast
+  with 503.
+- Each user (the JWT subject, or the client address when there is no
+  valid token) may run `user_max_in_flight` requests and queue
+  `user_max_queue` more. Beyond that their requests fail with 429, so one
+  student resending a question can't crowd out the class.
+- Freed slots go to the waiting request with the best priority: typed
+  questions before audio uploads, then first come first served.
+- A request that waits longer than `max_wait_seconds` gets 503.
+
+Rejections carry a Retry-After estimate based on recent request times.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from api.auth import token_subject
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_TEXT = 0
+PRIORITY_AUDIO = 1
+PRIORITY_NAMES = {PRIORITY_TEXT: "text", PRIORITY_AUDIO: "audio"}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request can't be admitted; maps to 429 or 503"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(f"Request rejected ({reason}), retry after {retry_after}s")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Slot:
+    """A granted admission; `release` hands it to the next waiter and is idempotent"""
+
+    def __init__(self, controller: "AdmissionController", key: str):
+        self._controller = controller
+        self.key = key
+        self.granted_at = time.monotonic()
+        self.released = False
+        self.streaming = False  # Released by hold_for_stream instead of the dependency
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._controller._release(self)
+
+
+class _Waiter:
+    def __init__(self, key: str, priority: int, seq: int, future: asyncio.Future):
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    """Global and per-user concurrency limits with a priority queue (see module docstring)"""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        user_max_in_flight: int,
+        user_max_queue: int,
+        max_wait_seconds: float
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.user_max_in_flight = user_max_in_flight
+        self.user_max_queue = user_max_queue
+        self.max_wait_seconds = max_wait_seconds
+
+        self.in_flight = 0
+        self._user_in_flight: Dict[str, int] = {}
+        self._user_waiting: Dict[str, int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+
+        self.admitted = 0
+        self.rejected = 0
+        # Recent times requests held their slot, in seconds
+        self._durations: deque = deque(maxlen=200)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self, ahead: Optional[int] = None) -> int:
+        """Seconds until a slot is likely to free up for a request behind `ahead` others"""
+        avg = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        ahead = self.queue_depth if ahead is None else ahead
+        return max(1, math.ceil(avg * (ahead + 1) / self.max_in_flight))
+
+    def _reject(self, status_code: int, reason: str, retry_after: int) -> AdmissionRejected:
+        self.rejected += 1
+        metrics.ADMISSION_REJECTIONS.labels(reason).inc()
+        return AdmissionRejected(status_code, reason, retry_after)
+
+    def _grant(self, key: str) -> Slot:
+        self.in_flight += 1
+        self._user_in_flight[key] = self._user_in_flight.get(key, 0) + 1
+        self.admitted += 1
+        return Slot(self, key)
+
+    async def acquire(self, key: str, priority: int = PRIORITY_TEXT) -> Slot:
+        """Take a slot for `key`, waiting in the queue if needed; raises AdmissionRejected"""
+        user_in_flight = self._user_in_flight.get(key, 0)
+        user_waiting = self._user_waiting.get(key, 0)
+        if user_in_flight + user_waiting >= self.user_max_in_flight + self.user_max_queue:
+            raise self._reject(429, "user_limit", self.retry_after(user_waiting))
+
+        queue_seconds = metrics.ADMISSION_QUEUE_SECONDS.labels(PRIORITY_NAMES[priority])
+        if (not self._waiters and self.in_flight < self.max_in_flight
+                and user_in_flight < self.user_max_in_flight):
+            queue_seconds.observe(0.0)
+            return self._grant(key)
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject(503, "queue_full", self.retry_after())
+
+        waiter = _Waiter(key, priority, next(self._seq), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._user_waiting[key] = user_waiting + 1
+        # Slots may be free while every waiter's user is at their limit
+        self._dispatch()
+        try:
+            slot = await asyncio.wait_for(waiter.future, self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            raise self._reject(503, "queue_timeout", self.retry_after())
+        except asyncio.CancelledError:
+            # The client went away; give back a slot granted just before
+            if waiter.future.done() and not waiter.future.cancelled():
+                waiter.future.result().release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._decrement(self._user_waiting, key)
+
+        queue_seconds.observe(time.monotonic() - waiter.enqueued_at)
+        return slot
+
+    def _release(self, slot: Slot) -> None:
+        self.in_flight -= 1
+        self._decrement(self._user_in_flight, slot.key)
+        self._durations.append(time.monotonic() - slot.granted_at)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the best waiters whose users are under their limit"""
+        while self.in_flight < self.max_in_flight:
+            eligible = [
+                w for w in self._waiters
+                if not w.future.done() and self._user_in_flight.get(w.key, 0) < self.user_max_in_flight
+            ]
+            if not eligible:
+                return
+            waiter = min(eligible, key=lambda w: (w.priority, w.seq))
+            self._waiters.remove(waiter)
+            self._decrement(self._user_waiting, waiter.key)
+            waiter.future.set_result(self._grant(waiter.key))
+
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str) -> None:
+        if counts.get(key, 0) <= 1:
+            counts.pop(key, None)
+        else:
+            counts[key] -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "users_active": len(self._user_in_flight),
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=settings.QA_MAX_IN_FLIGHT,
+    max_queue=settings.QA_MAX_QUEUE,
+    user_max_in_flight=settings.QA_USER_MAX_IN_FLIGHT,
+    user_max_queue=settings.QA_USER_MAX_QUEUE,
+    max_wait_seconds=settings.QA_MAX_QUEUE_WAIT_SECONDS
+)
+metrics.ADMISSION_IN_FLIGHT.set_function(lambda: admission.in_flight)
+metrics.ADMISSION_QUEUE_DEPTH.set_function(lambda: admission.queue_depth)
+
+
+def client_key(request: Request) -> str:
+    """The JWT subject of the request, or its client address"""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        user_id = token_subject(authorization[7:].strip())
+        if user_id is not None:
+            return f"user:{user_id}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+def rejection_error(e: AdmissionRejected) -> HTTPException:
+    """429 or 503 telling the client when to retry"""
+    detail = (
+        "Too many requests in progress, please wait for your earlier questions"
+        if e.status_code == 429 else
+        "The teacher is busy, please retry shortly"
+    )
+    return HTTPException(
+        status_code=e.status_code,
+        detail=detail,
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def admit(priority: int):
+    """
+    Dependency holding an admission slot for the rest of the request.
+    Streaming routes pass the slot to `hold_for_stream`, so it is kept
+    until the stream ends.
+    """
+    async def dependency(request: Request):
+        try:
+            slot = await admission.acquire(client_key(request), priority)
+        except AdmissionRejected as e:
+            raise rejection_error(e)
+        try:
+            yield slot
+        finally:
+            if not slot.streaming:
+                slot.release()
+
+    return dependency
+
+
+def hold_for_stream(slot: Slot, events: AsyncIterator) -> AsyncIterator:
+    """Wrap a response's event iterator so `slot` is released when it finishes"""
+    slot.streaming = True
+
+    async def held():
+        try:
+            async for event in events:
+                yield event
+        finally:
+            slot.release()
+
+    return held()
+
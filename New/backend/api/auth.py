@@ -1,37 +1,65 @@
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from database.session import get_db
 from database.models.user import User
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.auth_cache import AuthCache, CurrentUser, watch_user_changes
 import secrets
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import settings
+from app.metrics import cache_lookup
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Hashes made at another cost are upgraded on login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
-# JWT settings
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "insecure-secret-key-for-dev-only")
+# bcrypt releases the GIL, so hashing in threads keeps the event loop free;
+# the pool size bounds how many cores a login burst can take from QA traffic
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+# JWT settings (SECRET_KEY is the older name of the variable)
+SECRET_KEY = os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY") or "insecure-secret-key-for-dev-only"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # OAuth2 scheme for token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-def verify_password(plain_password, hashed_password):
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+# Verified tokens and resolved users, so authenticated requests skip the
+# JWT check and the user query; dropped whenever a commit changes the user
+auth_cache = AuthCache(
+    os.path.join(settings.CACHE_DIR, "auth_invalidations.json"),
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+)
+watch_user_changes(auth_cache)
+
+async def _run_password_job(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, fn, *args)
+
+async def verify_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password against a hash. Returns (valid, new hash), where the
+    new hash is set when the stored one uses an outdated cost.
+    """
+    return await _run_password_job(pwd_context.verify_and_update, plain_password, hashed_password)
 
-def get_password_hash(password):
+async def get_password_hash(password) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return await _run_password_job(pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
@@ -50,24 +78,45 @@ def create_reset_token():
     """Generate a secure reset token."""
     return secrets.token_urlsafe(32)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get the current user from a JWT token."""
+def token_subject(token: str) -> Optional[str]:
+    """User id of a valid token, or None; no database lookup"""
+    user_id = auth_cache.token_user_id(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.PyJWTError:
+            return None
+        user_id = payload.get("sub")
+        if user_id is not None:
+            auth_cache.put_token(token, user_id, float(payload["exp"]))
+    return user_id
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> CurrentUser:
+    """Get the current user from a JWT token, from cache when possible."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except jwt.PyJWTError:
+    user_id = token_subject(token)
+    if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = auth_cache.get_user(user_id)
+    cache_lookup("auth_user", user is not None)
     if user is None:
+        # Timestamp taken before the query, so a change committed meanwhile still invalidates it
+        loaded_at = time.time()
+        model = await db.get(User, user_id)
+        if model is None:
+            raise credentials_exception
+        user = CurrentUser.from_model(model)
+        auth_cache.put_user(user, loaded_at)
+        # End the read transaction so the route doesn't hold a pooled connection for nothing
+        await db.commit()
+    
+    if not user.is_active:
         raise credentials_exception
     
     return user
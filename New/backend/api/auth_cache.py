@@ -0,0 +1,197 @@
+# File: backend/api/auth_cache.py
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from database.models import StudentProfile, User
+
+logger = logging.getLogger(__name__)
+
+# User columns that a cached identity depends on
+WATCHED_USER_FIELDS = ("email", "student_id", "college_id", "password_hash", "is_active")
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated user as routes see it; detached from any session, so it can be cached"""
+    id: str
+    email: str
+    student_id: str
+    college_id: str
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            student_id=user.student_id,
+            college_id=user.college_id,
+            is_active=bool(user.is_active),
+        )
+
+
+class AuthCache:
+    """
+    Bounded TTL caches for authentication.
+
+    - Tokens: verified JWTs mapped to their user id. A token is kept until
+      it expires or for `ttl_seconds`, whichever comes first.
+    - Users: resolved identities keyed by user id, kept for `ttl_seconds`.
+
+    Both caches evict least-recently-used entries beyond `max_entries`.
+
+    `invalidate(user_id)` drops a user's identity. It also records the time
+    in a small JSON file, so other server processes drop identities they
+    loaded before then. They notice on their next lookup, when the file's
+    stamp changes.
+    """
+
+    def __init__(self, invalidations_path: str, ttl_seconds: float = 60.0, max_entries: int = 10000):
+        self.path = Path(invalidations_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # token -> (user id, expires at)
+        self._tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # user id -> (identity, loaded at)
+        self._users: "OrderedDict[str, Tuple[CurrentUser, float]]" = OrderedDict()
+        # user id -> time of the last change, shared between processes
+        self._invalidated: Dict[str, float] = {}
+        self._stamp: Optional[tuple] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def _reload(self) -> None:
+        """Pick up invalidations written by other processes"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._invalidated, self._stamp = {}, None
+            return
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._invalidated = {str(k): float(v) for k, v in json.load(f).items()}
+            self._stamp = stamp
+        except (OSError, ValueError) as e:
+            # Fail closed: forget every cached identity until the file is readable
+            logger.error(f"Error reading auth invalidations: {str(e)}")
+            self._users.clear()
+
+    def _put(self, cache: OrderedDict, key: str, value: tuple) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def token_user_id(self, token: str) -> Optional[str]:
+        """User id of a token verified earlier, or None"""
+        entry = self._tokens.get(token)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if time.time() >= expires_at:
+            del self._tokens[token]
+            return None
+        self._tokens.move_to_end(token)
+        return user_id
+
+    def put_token(self, token: str, user_id: str, expires_at: float) -> None:
+        self._put(self._tokens, token, (user_id, min(expires_at, time.time() + self.ttl_seconds)))
+
+    def get_user(self, user_id: str) -> Optional[CurrentUser]:
+        """Cached identity, unless it is older than the TTL or than the user's last change"""
+        self._reload()
+        entry = self._users.get(user_id)
+        if entry is not None:
+            user, loaded_at = entry
+            if time.time() - loaded_at < self.ttl_seconds and loaded_at > self._invalidated.get(user_id, 0.0):
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return user
+            del self._users[user_id]
+        self.misses += 1
+        return None
+
+    def put_user(self, user: CurrentUser, loaded_at: float) -> None:
+        """Cache an identity read from the database at `loaded_at` (taken before the query)"""
+        self._put(self._users, user.id, (user, loaded_at))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached identity here and in every other process"""
+        self._users.pop(user_id, None)
+        self._reload()
+        now = time.time()
+        # Entries older than the TTL can't outlive it anyway
+        invalidated = {k: v for k, v in self._invalidated.items() if now - v < self.ttl_seconds}
+        invalidated[user_id] = now
+
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(invalidated, f)
+            os.replace(tmp_path, self.path)
+            stat = self.path.stat()
+            self._invalidated, self._stamp = invalidated, (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logger.error(f"Error writing auth invalidations: {str(e)}")
+            self._invalidated = invalidated
+        logger.info(f"Invalidated cached identity of user {user_id}")
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def watch_user_changes(cache: AuthCache) -> None:
+    """
+    Invalidate cached identities whenever a commit changes a user's watched
+    columns or profile, deletes a user, or changes a profile, whichever route
+    or script made the change.
+    """
+
+    @event.listens_for(Session, "after_flush")
+    def collect(session, flush_context):
+        changed = session.info.setdefault("auth_changed_users", set())
+        for obj in list(session.dirty) + list(session.deleted):
+            if isinstance(obj, User):
+                state = inspect(obj)
+                if obj in session.deleted or any(
+                    state.attrs[field].history.has_changes() for field in WATCHED_USER_FIELDS
+                ):
+                    changed.add(obj.id)
+            elif isinstance(obj, StudentProfile):
+                changed.add(obj.user_id)
+        for obj in session.new:
+            if isinstance(obj, StudentProfile):
+                changed.add(obj.user_id)
+
+    @event.listens_for(Session, "after_commit")
+    def invalidate(session):
+        for user_id in session.info.pop("auth_changed_users", ()):
+            cache.invalidate(user_id)
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def discard(session, previous_transaction):
+        session.info.pop("auth_changed_users", None)
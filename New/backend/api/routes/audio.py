@@ -1,12 +1,16 @@
 # File: backend/api/routes/audio.py
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
-import shutil
+import asyncio
 import os
 import time
-from audio.speech_to_text import SpeechToText
+from app.config import settings
+from api.admission import PRIORITY_AUDIO, admit
+from audio.stt_pool import TranscriptionQueueFull
+from audio.streaming_stt import BYTES_PER_SAMPLE, SAMPLE_RATE, StreamingTranscriber
 from audio.text_to_speech import TextToSpeech
+from api.uploads import speech_to_text, read_audio_upload, queue_full_error
 import logging
 
 # Set up logging
@@ -14,7 +18,6 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-speech_to_text = SpeechToText()
 text_to_speech = TextToSpeech()
 
 # Ensure audio directory exists
@@ -49,31 +52,17 @@ def remove_file(file_path: Path):
     except Exception as e:
         logger.error(f"Error removing file {file_path}: {e}")
 
-@router.post("/speech-to-text")
-async def convert_speech_to_text(background_tasks: BackgroundTasks, audio: UploadFile = File(...)):
+@router.post("/speech-to-text", dependencies=[Depends(admit(PRIORITY_AUDIO))])
+async def convert_speech_to_text(request: Request, audio: UploadFile = File(...)):
     """Convert speech to text"""
     logger.info(f"Received audio file for conversion: {audio.filename}")
-    
-    if not audio.filename.endswith(('.wav', '.mp3', '.ogg', '.m4a')):
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported audio format. Please use WAV, MP3, OGG, or M4A files."
-        )
-    
-    temp_file = TEMP_DIR / f"input_{audio.filename}"
-    
+    data = await read_audio_upload(audio)
+
     try:
-        # Save uploaded file
-        with temp_file.open("wb") as buffer:
-            shutil.copyfileobj(audio.file, buffer)
-        
         # Convert to text
-        text = await speech_to_text.convert(temp_file)
+        text = await speech_to_text.convert_bytes(data)
         logger.info(f"Successfully converted audio to text: {text[:50]}...")
         
-        # Schedule cleanup
-        background_tasks.add_task(remove_file, temp_file)
-        
         return JSONResponse(
             content={
                 "text": text,
@@ -82,17 +71,93 @@ async def convert_speech_to_text(background_tasks: BackgroundTasks, audio: Uploa
             status_code=200
         )
         
+    except TranscriptionQueueFull as e:
+        raise queue_full_error(e.retry_after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing audio: {str(e)}")
-        # Clean up on error
-        if temp_file.exists():
-            temp_file.unlink()
         raise HTTPException(
             status_code=500,
             detail=f"Error processing audio: {str(e)}"
         )
 
-@router.post("/text-to-speech")
+@router.websocket("/stream")
+async def stream_speech_to_text(websocket: WebSocket):
+    """
+    Live speech to text. The client sends binary frames of 16 kHz mono
+    16-bit little-endian PCM while the student speaks, then the text message
+    "end". The server replies with JSON messages: {"type": "partial"} while
+    an utterance is in progress, {"type": "final"} as each one ends (the
+    last with "done": true), or {"type": "error"}. A stream longer than
+    STT_STREAM_MAX_SECONDS, in audio sent or in time connected, is closed
+    with an error.
+    """
+    await websocket.accept()
+    if speech_to_text.pool.is_full():
+        speech_to_text.pool.rejected += 1
+        await websocket.send_json({
+            "type": "error",
+            "message": "Speech to text is busy",
+            "retry_after": speech_to_text.pool.retry_after()
+        })
+        await websocket.close(code=1013)  # Try again later
+        return
+
+    async def send(message: dict):
+        try:
+            await websocket.send_json(message)
+        except Exception:
+            # The client went away; late partials are simply dropped
+            pass
+
+    max_seconds = settings.STT_STREAM_MAX_SECONDS
+    max_bytes = int(max_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    # Audio arrives in real time; allow a little slack for the final "end"
+    deadline = asyncio.get_running_loop().time() + max_seconds + 5
+
+    async def too_long():
+        logger.info("Closing speech stream over the length limit")
+        await send({"type": "error", "message": f"Recording is longer than {int(max_seconds)} seconds"})
+        await websocket.close(code=1009)  # Message too big
+
+    transcriber = StreamingTranscriber(speech_to_text.pool, send)
+    received = 0
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    websocket.receive(), deadline - asyncio.get_running_loop().time()
+                )
+            except asyncio.TimeoutError:
+                await too_long()
+                return
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                received += len(message["bytes"])
+                if received > max_bytes:
+                    await too_long()
+                    return
+                transcriber.feed(message["bytes"])
+            elif message.get("text") == "end":
+                break
+            if transcriber.failed:
+                await websocket.close(code=1013)
+                return
+
+        text = await transcriber.finish()
+        logger.info(f"Streamed transcription complete: {text[:50]}...")
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info("Speech stream client disconnected")
+    except Exception as e:
+        logger.error(f"Error in speech stream: {str(e)}")
+        await send({"type": "error", "message": "Transcription failed"})
+        await websocket.close(code=1011)
+
+@router.post("/text-to-speech", dependencies=[Depends(admit(PRIORITY_AUDIO))])
 async def convert_text_to_speech(text: str, background_tasks: BackgroundTasks):
     """Convert text to speech"""
     logger.info("Received text for speech conversion")
@@ -113,8 +178,9 @@ async def convert_text_to_speech(text: str, background_tasks: BackgroundTasks):
                 detail="Failed to generate audio file"
             )
         
-        # Schedule cleanup for later
-        background_tasks.add_task(remove_file, audio_file)
+        # Schedule cleanup for later; cached audio is kept for reuse
+        if text_to_speech.cache is None:
+            background_tasks.add_task(remove_file, audio_file)
         
         return FileResponse(
             path=audio_file,
@@ -134,10 +200,26 @@ async def cleanup_files():
     """Clean up old temporary files"""
     try:
         cleanup_old_files(TEMP_DIR)
-        cleanup_old_files(RESPONSE_DIR)
+        if text_to_speech.cache is not None:
+            # Cached responses are bounded by the cache's byte quota, not by age
+            text_to_speech.cache.evict()
+        else:
+            cleanup_old_files(RESPONSE_DIR)
         return {"status": "success", "message": "Cleanup completed"}
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Cleanup failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/tts-cache/stats")
+async def tts_cache_stats():
+    """Hit rate of the TTS audio cache and the synthesis it saved"""
+    if text_to_speech.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **text_to_speech.cache.stats()}
+
+@router.get("/stt/stats")
+async def stt_stats():
+    """Queue depth and wait times of the speech to text worker pool"""
+    return speech_to_text.pool.stats()
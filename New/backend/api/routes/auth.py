@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from database.session import get_db
 from database.models.user import User
@@ -16,10 +18,10 @@ from api.auth import (
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,15 +29,16 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if student ID already exists
-    existing_student_id = db.query(User).filter(User.student_id == user_data.student_id).first()
+    existing_student_id = await db.scalar(select(User).where(User.student_id == user_data.student_id))
     if existing_student_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Student ID already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Hand the read connection back while bcrypt runs
+    await db.rollback()
+    hashed_password = await get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         student_id=user_data.student_id,
@@ -43,31 +46,49 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         password_hash=hashed_password
     )
     
-    # Save to database
+    # Save to database; a concurrent registration may have taken the email or ID meanwhile
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or student ID already registered"
+        )
+    await db.refresh(new_user)
     
     return new_user
 
 @router.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """Log in and obtain an access token."""
     # Find user by student ID
-    user = db.query(User).filter(User.student_id == form_data.username).first()
+    user = await db.scalar(select(User).where(User.student_id == form_data.username))
+    user_id, stored_hash = (user.id, user.password_hash) if user else (None, None)
+    # Hand the read connection back while bcrypt runs
+    await db.rollback()
     
     # Check if user exists and password is correct
-    if not user or not verify_password(form_data.password, user.password_hash):
+    valid, new_hash = await verify_password(form_data.password, stored_hash) if user_id else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect student ID or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade a hash stored at an outdated bcrypt cost, unless the password changed meanwhile
+    if new_hash:
+        user = await db.get(User, user_id)
+        if user is not None and user.password_hash == stored_hash:
+            user.password_hash = new_hash
+            await db.commit()
+    
     # Create access token
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
-        data={"sub": user.id},
+        data={"sub": user_id},
         expires_delta=access_token_expires
     )
     
@@ -77,11 +98,11 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 async def request_password_reset(
     request_data: PasswordResetRequest, 
     request: Request, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Request a password reset link via email."""
     # Find user by email
-    user = db.query(User).filter(User.email == request_data.email).first()
+    user = await db.scalar(select(User).where(User.email == request_data.email))
     
     # Whether user exists or not, we return success to prevent email enumeration
     if not user:
@@ -94,7 +115,7 @@ async def request_password_reset(
     # Update user with reset token
     user.reset_token = reset_token
     user.reset_token_expires = token_expires
-    db.commit()
+    await db.commit()
     
     # Build reset URL
     # In production, this would be a frontend URL
@@ -107,10 +128,10 @@ async def request_password_reset(
     return {"detail": "If a user with this email exists, a password reset link has been sent"}
 
 @router.post("/reset-password")
-async def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db)):
+async def reset_password(reset_data: PasswordReset, db: AsyncSession = Depends(get_db)):
     """Reset password using reset token."""
     # Find user by reset token
-    user = db.query(User).filter(User.reset_token == reset_data.token).first()
+    user = await db.scalar(select(User).where(User.reset_token == reset_data.token))
     
     # Check if user exists and token is valid
     if not user or not user.reset_token_expires or user.reset_token_expires < datetime.utcnow():
@@ -119,22 +140,33 @@ async def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db
             detail="Invalid or expired token"
         )
     
-    # Update password
-    user.password_hash = get_password_hash(reset_data.new_password)
+    user_id = user.id
+    # Hand the read connection back while bcrypt runs
+    await db.rollback()
+    password_hash = await get_password_hash(reset_data.new_password)
+    
+    # Update password, unless the token was used or replaced meanwhile
+    user = await db.get(User, user_id)
+    if user is None or user.reset_token != reset_data.token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired token"
+        )
+    user.password_hash = password_hash
     user.reset_token = None
     user.reset_token_expires = None
-    db.commit()
+    await db.commit()
     
     return {"detail": "Password has been reset successfully"}
 
 @router.post("/request-college-id")
-async def request_college_id(request_data: CollegeIDRequest, db: Session = Depends(get_db)):
+async def request_college_id(request_data: CollegeIDRequest, db: AsyncSession = Depends(get_db)):
     """Request college ID recovery via email."""
     # Find user by email and student ID
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.email == request_data.email,
         User.student_id == request_data.student_id
-    ).first()
+    ))
     
     # Whether user exists or not, we return success to prevent enumeration
     if not user:
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import base64
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from api.deps import get_db, get_current_user
-from database.models import User, Feedback
+from api.auth import get_current_user
+from api.auth_cache import CurrentUser
+from app.config import settings
+from database.session import get_db
+from database.models import Feedback, FeedbackRollup
+from database.rollups import record_feedback
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
@@ -22,16 +29,47 @@ class FeedbackResponse(BaseModel):
     feedback_text: str
     improvement_suggestions: Optional[str]
     category: Optional[str]
-    created_at: str
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
+class FeedbackPage(BaseModel):
+    items: List[FeedbackResponse]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page; None on the last
+
+class FeedbackRollupResponse(BaseModel):
+    category: Optional[str]
+    day: Optional[date]  # None in per-category totals
+    feedback_count: int
+    rating_sum: int
+    average_rating: float
+
+class FeedbackSummary(BaseModel):
+    start: date
+    end: date
+    feedback_count: int
+    average_rating: float
+    by_category: List[FeedbackRollupResponse]
+    by_day: List[FeedbackRollupResponse]
+
+def encode_cursor(feedback: Feedback) -> str:
+    """Opaque keyset cursor for the position after `feedback`"""
+    raw = f"{feedback.created_at.isoformat()}|{feedback.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, feedback_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), feedback_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
 @router.post("/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
-def submit_feedback(
+async def submit_feedback(
     feedback_data: FeedbackCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Submit feedback from the current user."""
     try:
@@ -40,26 +78,101 @@ def submit_feedback(
             rating=feedback_data.rating,
             feedback_text=feedback_data.feedback_text,
             improvement_suggestions=feedback_data.improvement_suggestions,
-            category=feedback_data.category
+            category=feedback_data.category,
+            created_at=datetime.utcnow()
         )
         
         db.add(new_feedback)
-        db.commit()
-        db.refresh(new_feedback)
+        # The rollup row changes in the same transaction as the feedback
+        await record_feedback(db, new_feedback.category, new_feedback.created_at, new_feedback.rating)
+        await db.commit()
+        await db.refresh(new_feedback)
         return new_feedback
         
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not submit feedback"
         )
 
-@router.get("/feedback", response_model=List[FeedbackResponse])
-def get_user_feedback(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/feedback", response_model=FeedbackPage)
+async def get_user_feedback(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Get the current user's feedback, newest first, one page at a time."""
+    query = (
+        select(Feedback)
+        .where(Feedback.user_id == current_user.id)
+        .order_by(Feedback.created_at.desc(), Feedback.id.desc())
+        .limit(limit + 1)  # One extra row tells whether there is another page
+    )
+    if cursor:
+        created_at, feedback_id = decode_cursor(cursor)
+        query = query.where(or_(
+            Feedback.created_at < created_at,
+            and_(Feedback.created_at == created_at, Feedback.id < feedback_id)
+        ))
+    
+    feedback_list = (await db.scalars(query)).all()
+    items = feedback_list[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(feedback_list) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+def rollup_response(category: Optional[str], day: Optional[date], count: int, rating_sum: int) -> dict:
+    return {
+        "category": category or None,
+        "day": day,
+        "feedback_count": count,
+        "rating_sum": rating_sum,
+        "average_rating": rating_sum / count if count else 0.0
+    }
+
+async def get_feedback_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """The current user, if listed in FEEDBACK_ADMIN_EMAILS; 403 otherwise."""
+    admins = {email.lower() for email in settings.FEEDBACK_ADMIN_EMAILS}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only course staff can view feedback summaries"
+        )
+    return current_user
+
+@router.get("/feedback/summary", response_model=FeedbackSummary)
+async def get_feedback_summary(
+    days: int = Query(30, ge=1, le=366),
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_feedback_admin)
 ):
-    """Get all feedback submitted by the current user."""
-    feedback_list = db.query(Feedback).filter(Feedback.user_id == current_user.id).all()
-    return feedback_list 
\ No newline at end of file
+    """Feedback counts and average ratings per category and per day, read from the rollups."""
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
+    query = select(FeedbackRollup).where(FeedbackRollup.day >= start, FeedbackRollup.day <= end)
+    if category is not None:
+        query = query.where(FeedbackRollup.category == category)
+    rollups = (await db.scalars(query)).all()
+    
+    by_category, by_day = {}, {}
+    for rollup in rollups:
+        for totals, key in ((by_category, rollup.category), (by_day, rollup.day)):
+            count, rating_sum = totals.get(key, (0, 0))
+            totals[key] = (count + rollup.feedback_count, rating_sum + rollup.rating_sum)
+    
+    total_count = sum(count for count, _ in by_category.values())
+    total_sum = sum(rating_sum for _, rating_sum in by_category.values())
+    return {
+        "start": start,
+        "end": end,
+        "feedback_count": total_count,
+        "average_rating": total_sum / total_count if total_count else 0.0,
+        "by_category": [
+            rollup_response(key, None, *totals) for key, totals in sorted(by_category.items())
+        ],
+        "by_day": [
+            rollup_response(category, key, *totals) for key, totals in sorted(by_day.items())
+        ]
+    }
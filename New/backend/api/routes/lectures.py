@@ -1,51 +1,168 @@
 # File: backend/api/routes/lectures.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import hashlib
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.config import settings
 from app.dependencies import get_db
-from database.models.lecture import Lecture
-from api.schemas.responses import LectureCreate, Lecture as LectureSchema
+from database.models import IngestionJob, Lecture
+from database.session import AsyncSessionLocal
+from api.schemas.responses import (
+    IngestionJob as IngestionJobSchema,
+    LectureCreate,
+    LecturePage,
+    LectureSummary,
+    Lecture as LectureSchema
+)
+from rag.ingestion import IngestionWorker
 from rag.processor import RAGProcessor
 
 router = APIRouter()
 rag_processor = RAGProcessor()
+# Chunks and embeds new lectures in the background; started with the app
+ingestion_worker = IngestionWorker(
+    rag_processor,
+    AsyncSessionLocal,
+    workers=settings.INGEST_WORKERS,
+    batch_size=settings.INGEST_EMBED_BATCH_SIZE,
+    poll_seconds=settings.INGEST_POLL_SECONDS,
+    stale_seconds=settings.INGEST_STALE_SECONDS,
+    max_attempts=settings.INGEST_MAX_ATTEMPTS
+)
 
-@router.post("/", response_model=LectureSchema)
+async def queue_lectures(db: AsyncSession, lectures: List[LectureCreate]) -> List[IngestionJob]:
+    """Save lectures with an ingestion job each, in one transaction, and wake the workers"""
+    db_lectures = [Lecture(**lecture.dict()) for lecture in lectures]
+    db.add_all(db_lectures)
+    await db.flush()  # Assigns lecture ids
+    
+    jobs = [IngestionJob(lecture_id=db_lecture.id, created_at=datetime.utcnow()) for db_lecture in db_lectures]
+    db.add_all(jobs)
+    await db.commit()
+    for job in jobs:
+        await db.refresh(job)
+    
+    ingestion_worker.notify()
+    return jobs
+
+@router.post("/", response_model=IngestionJobSchema, status_code=202)
 async def create_lecture(
     lecture: LectureCreate,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Create new lecture"""
-    db_lecture = Lecture(**lecture.dict())
-    db.add(db_lecture)
-    db.commit()
-    db.refresh(db_lecture)
-    
-    # Process lecture for RAG
-    await rag_processor.process_lecture(
-        db_lecture.id,
-        db_lecture.content
-    )
-    
-    return db_lecture
+    """Create new lecture; it becomes searchable once its ingestion job succeeds"""
+    job, = await queue_lectures(db, [lecture])
+    response.headers["Location"] = str(request.url_for("get_ingestion_job", job_id=job.id))
+    return job
+
+@router.post("/bulk", response_model=List[IngestionJobSchema], status_code=202)
+async def create_lectures(
+    lectures: List[LectureCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create several lectures at once, with an ingestion job for each"""
+    if not lectures:
+        raise HTTPException(status_code=400, detail="No lectures given")
+    return await queue_lectures(db, lectures)
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobSchema)
+async def get_ingestion_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Status of an ingestion job, with chunks embedded out of total"""
+    job = await db.get(IngestionJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
 
-@router.get("/", response_model=List[LectureSchema])
+# Columns of a lecture listing; the content column is never read
+SUMMARY_COLUMNS = (
+    Lecture.id,
+    Lecture.title,
+    Lecture.created_at,
+    Lecture.updated_at,
+    Lecture.content_size,
+    Lecture.content_hash
+)
+
+def make_etag(rows) -> str:
+    """Weak ETag over the version columns (id, updated_at, content hash) of `rows`"""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(f"{row.id}|{row.updated_at.isoformat() if row.updated_at else ''}|{row.content_hash or ''};".encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names `etag`"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+@router.get("/", response_model=LecturePage)
 async def get_lectures(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all lectures"""
-    lectures = db.query(Lecture).offset(skip).limit(limit).all()
-    return lectures
+    """List lectures by id without their content, one page at a time"""
+    # One extra row tells whether there is another page
+    query = select(*SUMMARY_COLUMNS).order_by(Lecture.id).limit(limit + 1)
+    if cursor:
+        try:
+            query = query.where(Lecture.id > int(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = (await db.execute(query)).all()
+    etag = make_etag(rows)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    items = rows[:limit]
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"  # Revalidate, usually getting a 304
+    return {
+        "items": [LectureSummary.model_validate(row) for row in items],
+        "next_cursor": str(items[-1].id) if len(rows) > limit else None
+    }
 
 @router.get("/{lecture_id}", response_model=LectureSchema)
 async def get_lecture(
     lecture_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get specific lecture"""
-    lecture = db.query(Lecture).filter(Lecture.id == lecture_id).first()
+    """Get specific lecture, with its content"""
+    # Check the version first, so a cached lecture never loads its content
+    version = (await db.execute(
+        select(Lecture.id, Lecture.updated_at, Lecture.content_hash).where(Lecture.id == lecture_id)
+    )).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Lecture not found")
+    etag = make_etag([version])
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    lecture = await db.get(Lecture, lecture_id)
     if lecture is None:
         raise HTTPException(status_code=404, detail="Lecture not found")
-    return lecture
\ No newline at end of file
+    # From the row just loaded, in case it changed since the version check
+    response.headers["ETag"] = make_etag([lecture])
+    response.headers["Cache-Control"] = "no-cache"
+    return lecture
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from api.deps import get_db, get_current_user
-from database.models import User, StudentProfile
+from api.auth import get_current_user
+from api.auth_cache import CurrentUser
+from database.session import get_db
+from database.models import StudentProfile
 from typing import Optional
 from pydantic import BaseModel
 
@@ -44,14 +47,14 @@ class StudentProfileResponse(BaseModel):
         from_attributes = True
 
 @router.post("/profile", response_model=StudentProfileResponse, status_code=status.HTTP_201_CREATED)
-def create_profile(
+async def create_profile(
     profile_data: StudentProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Create a new student profile for the authenticated user."""
     # Check if profile already exists
-    existing_profile = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
+    existing_profile = await db.scalar(select(StudentProfile).where(StudentProfile.user_id == current_user.id))
     if existing_profile:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -72,24 +75,24 @@ def create_profile(
         )
         
         db.add(new_profile)
-        db.commit()
-        db.refresh(new_profile)
+        await db.commit()
+        await db.refresh(new_profile)
         return new_profile
         
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not create profile"
         )
 
 @router.get("/profile", response_model=StudentProfileResponse)
-def get_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_profile(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get the current user's profile."""
-    profile = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
+    profile = await db.scalar(select(StudentProfile).where(StudentProfile.user_id == current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,13 +101,13 @@ def get_profile(
     return profile
 
 @router.put("/profile", response_model=StudentProfileResponse)
-def update_profile(
+async def update_profile(
     profile_data: StudentProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Update the current user's profile."""
-    profile = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
+    profile = await db.scalar(select(StudentProfile).where(StudentProfile.user_id == current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,11 +120,11 @@ def update_profile(
         setattr(profile, key, value)
     
     try:
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
         return profile
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not update profile"
@@ -1,10 +1,16 @@
 # File: backend/api/routes/qa.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_db
+from api.admission import PRIORITY_AUDIO, PRIORITY_TEXT, Slot, admission, admit, hold_for_stream
+from api.uploads import speech_to_text, read_audio_upload, queue_full_error
+from audio.stt_pool import TranscriptionQueueFull
 from qa.pipeline import QAPipeline
+import json
 import logging
 
 # Set up logging
@@ -27,7 +33,8 @@ class QuestionResponse(BaseModel):
 @router.post("/ask", response_model=QuestionResponse)
 async def ask_question(
     request: QuestionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    slot: Slot = Depends(admit(PRIORITY_TEXT))
 ):
     """Process a question and return an answer with audio"""
     logger.info(f"Received question: {request.question}")
@@ -52,6 +59,107 @@ async def ask_question(
             detail=f"Error processing question: {str(e)}"
         )
 
+def event_stream_response(events, slot: Optional[Slot] = None) -> StreamingResponse:
+    """
+    Server-Sent Events response from an async iterator of (event, data)
+    pairs. An admission `slot` is held until the stream ends.
+    """
+    background = None
+    if slot is not None:
+        events = hold_for_stream(slot, events)
+        # Also covers a client that leaves before the stream starts
+        background = BackgroundTask(slot.release)
+
+    async def event_stream():
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Don't let a reverse proxy buffer the stream
+        },
+        background=background
+    )
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest, slot: Slot = Depends(admit(PRIORITY_TEXT))):
+    """
+    Answer a question as Server-Sent Events: a `sources` event, `token` events
+    as the answer is generated, then `done` with confidence score and audio
+    URL (or `error`).
+    """
+    logger.info(f"Received streaming question: {request.question}")
+    return event_stream_response(qa_pipeline.stream_answer(request.question), slot)
+
+@router.post("/ask-audio", response_model=QuestionResponse)
+async def ask_audio_question(
+    request: Request,
+    audio: UploadFile = File(...),
+    stream: bool = False,
+    slot: Slot = Depends(admit(PRIORITY_AUDIO))
+):
+    """
+    Answer a spoken question in one round trip: speech to text, retrieval,
+    answer and audio all run server side. Returns the same body as /ask,
+    with `question` holding the transcript. With `stream=true` the answer
+    comes as Server-Sent Events like /ask/stream, preceded by a
+    `transcript` event.
+    """
+    logger.info(f"Received audio question: {audio.filename}")
+    data = await read_audio_upload(audio)
+
+    try:
+        question, speculation = await qa_pipeline.transcribe_question(speech_to_text, data)
+    except TranscriptionQueueFull as e:
+        raise queue_full_error(e.retry_after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error transcribing audio question: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing audio: {str(e)}"
+        )
+
+    if not question.strip():
+        if speculation is not None:
+            speculation.cancel()
+        raise HTTPException(status_code=400, detail="No speech detected in the recording")
+    logger.info(f"Transcribed audio question: {question}")
+
+    if stream:
+        async def events():
+            yield "transcript", {"text": question}
+            async for event in qa_pipeline.stream_answer(question, speculation=speculation):
+                yield event
+
+        return event_stream_response(events(), slot)
+
+    try:
+        response = await qa_pipeline.get_answer(question, speculation=speculation)
+        return {
+            "question": question,
+            "answer": response["answer"],
+            "confidence_score": response.get("confidence_score", 0.0),
+            "sources": response.get("sources", []),
+            "audio_url": response.get("audio_url")
+        }
+
+    except Exception as e:
+        logger.error(f"Error processing audio question: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing question: {str(e)}"
+        )
+
+@router.get("/admission/stats")
+async def admission_stats():
+    """Slots in use, queue depth and rejections of QA and audio admission control"""
+    return admission.stats()
+
 @router.get("/health")
 async def health_check():
     """Check if the QA system is operational"""
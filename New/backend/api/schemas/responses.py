@@ -18,6 +18,38 @@ class Lecture(LectureBase):
     class Config:
         orm_mode = True
 
+class LectureSummary(BaseModel):
+    """A lecture without its content, for listings"""
+    id: int
+    title: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    content_size: Optional[int] = None  # Bytes of UTF-8 content
+    content_hash: Optional[str] = None  # SHA-256 of the content
+
+    class Config:
+        from_attributes = True
+
+class LecturePage(BaseModel):
+    items: List[LectureSummary]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page; None on the last
+
+class IngestionJob(BaseModel):
+    """Progress of chunking and embedding one lecture"""
+    id: str
+    lecture_id: int
+    status: str  # queued, running, succeeded or failed
+    chunks_done: int
+    chunks_total: Optional[int] = None  # Known once the lecture is chunked
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class QuestionResponse(BaseModel):
     question: str
     answer: str
@@ -0,0 +1,122 @@
+# File: backend/api/uploads.py
+"""
+Audio uploads shared by the audio and QA routes: the speech to text
+instance (and its worker pool), validation of uploaded recordings, the
+errors they map to, and the middleware applying the upload limits.
+
+Route handlers only run once the whole multipart body has been received
+and parsed (Starlette spools file parts over 1 MB to a temporary file), so
+checks in the handler come too late to save that work. AudioUploadLimit
+answers upload routes first:
+- 413 when Content-Length is over the limit, or once a body sent without
+  one has streamed past it;
+- 503 with Retry-After when the transcription queue is already full.
+"""
+import logging
+from typing import Iterable
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from audio.speech_to_text import SpeechToText
+
+logger = logging.getLogger(__name__)
+
+speech_to_text = SpeechToText()
+
+# Containers faster-whisper (PyAV) decodes from memory
+SUPPORTED_AUDIO_FORMATS = ('.wav', '.webm', '.ogg', '.opus', '.mp3', '.m4a')
+
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def upload_too_large_error(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Audio file too large (limit {max_bytes // (1024 * 1024)} MB)"
+    )
+
+
+def queue_full_error(retry_after: int) -> HTTPException:
+    """503 telling the client when to retry"""
+    return HTTPException(
+        status_code=503,
+        detail="Speech to text is busy, please retry shortly",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+async def read_audio_upload(audio: UploadFile) -> bytes:
+    """
+    Validate an uploaded recording and read it into memory. Raises 400 for
+    unsupported or empty files and 413 when it is over STT_MAX_UPLOAD_BYTES.
+
+    By the time this runs the multipart body has already been received and
+    parsed; AudioUploadLimit (below) rejects oversized uploads and uploads
+    arriving while transcription is backed up before that.
+    """
+    if not audio.filename.endswith(SUPPORTED_AUDIO_FORMATS):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported audio format. Please use WAV, WEBM, OGG, OPUS, MP3, or M4A files."
+        )
+
+    # The multipart parser may have spooled a large part to a temporary
+    # file; the recording is read back once and decoded in memory by the
+    # transcription worker, without a copy under data/audio
+    max_bytes = settings.STT_MAX_UPLOAD_BYTES
+    data = await audio.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise upload_too_large_error(max_bytes)
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty audio file")
+    return data
+
+
+class AudioUploadLimit:
+    """ASGI middleware enforcing the upload size and queue limits on `paths`"""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], max_bytes: int, pool):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+        self.pool = pool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes + MULTIPART_OVERHEAD
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            error = upload_too_large_error(self.max_bytes)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        if self.pool.is_full():
+            self.pool.rejected += 1
+            error = queue_full_error(self.pool.retry_after())
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code, headers=error.headers)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            # Covers chunked uploads and a Content-Length that understates the body
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    logger.info(f"Rejected audio upload to {scope['path']} over {limit} bytes")
+                    raise upload_too_large_error(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -3,6 +3,7 @@ from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
 from pathlib import Path
+from typing import List
 
 # Load .env file
 load_dotenv()
@@ -21,10 +22,96 @@ class Settings(BaseSettings):
     VECTOR_STORE_PATH: str = str(BASE_DIR / "data/vector_store")
     AUDIO_TEMP_DIR: str = str(BASE_DIR / "data/audio/temp")
     AUDIO_RESPONSE_DIR: str = str(BASE_DIR / "data/audio/responses")
+    CACHE_DIR: str = str(BASE_DIR / "data/cache")
+
+    # Vector store backend: "chroma" or "numpy" (see rag/vector_store.py)
+    VECTOR_STORE_BACKEND: str = "chroma"
+
+    # Hybrid retrieval: fuse BM25 and vector rankings (see rag/lexical.py)
+    HYBRID_RETRIEVAL_ENABLED: bool = True
+    HYBRID_CANDIDATES: int = 10  # Results taken from each ranking before fusion
+    # Answer questions naming rare identifier-like terms (e.g. "Lectures32",
+    # "getNextNode") from the lexical index alone, without an embedding round-trip
+    HYBRID_LEXICAL_SHORTCUT: bool = True
+    HYBRID_SHORTCUT_MAX_DOC_FRACTION: float = 0.02  # Terms in more chunks than this only boost
+
+    # Background lecture ingestion (see rag/ingestion.py)
+    INGEST_WORKERS: int = 2  # Lectures chunked and embedded at once per process
+    INGEST_EMBED_BATCH_SIZE: int = 64  # Chunks per embedding request; progress is reported per batch
+    INGEST_POLL_SECONDS: float = 2.0  # How often idle workers look for jobs queued by other processes
+    INGEST_STALE_SECONDS: float = 300.0  # A running job without a heartbeat this long is retried
+    INGEST_MAX_ATTEMPTS: int = 3
+
+    # Near-duplicate chunk elimination at ingest time (see rag/dedup.py)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.85  # Estimated Jaccard similarity of word 5-grams
+
+    # FAQ answers served without retrieval or generation (see qa/faq.py)
+    FAQ_ENABLED: bool = True
+    FAQ_PATH: str = str(BASE_DIR / "data/faq.json")
+    FAQ_SIMILARITY_THRESHOLD: float = 0.92  # Cosine similarity to an example question
+    FAQ_CANDIDATE_MIN_OVERLAP: float = 0.5  # Share of an example's terms a shortcut question needs to be embedded
+
+    # Semantic answer cache (see qa/cache.py)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # Cosine similarity needed for a hit
+    ANSWER_CACHE_MAX_ENTRIES: int = 500
+    ANSWER_CACHE_TTL_SECONDS: int = 24 * 3600
+
+    # Password hashing (see api/auth.py). Raising the cost rehashes stored
+    # passwords at the new cost as users log in.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4  # Threads hashing and verifying passwords
+
+    # Admission control for the QA and audio routes (see api/admission.py)
+    QA_MAX_IN_FLIGHT: int = 32  # Requests running across the app
+    QA_MAX_QUEUE: int = 64  # Requests waiting before new ones get 503
+    QA_USER_MAX_IN_FLIGHT: int = 2  # Per user (JWT subject or client address)
+    QA_USER_MAX_QUEUE: int = 2  # Waiting per user before their requests get 429
+    QA_MAX_QUEUE_WAIT_SECONDS: float = 10.0  # Longer waits get 503
+
+    # Verified tokens and resolved users for get_current_user (see api/auth_cache.py)
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Accounts allowed to read class-wide feedback summaries (see api/routes/feedback.py),
+    # e.g. FEEDBACK_ADMIN_EMAILS='["teacher@college.edu"]'. Empty means nobody.
+    FEEDBACK_ADMIN_EMAILS: List[str] = []
+
+    # Embedding cache for lecture chunks (see rag/embedding_cache.py)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100_000
+
+    # ElevenLabs TTS client (see audio/text_to_speech.py). Point the base URL at
+    # scripts/elevenlabs_stub.py to test without the real API.
+    ELEVENLABS_BASE_URL: str = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io")
+    TTS_MAX_CONCURRENCY: int = 8  # Synthesis requests in flight across the app
+    TTS_POOL_SIZE: int = 16  # Keep-alive connections to the TTS API
+    TTS_KEEPALIVE_SECONDS: float = 60.0
+    TTS_TIMEOUT_SECONDS: float = 30.0
+
+    # Content-addressed cache of synthesized speech (see audio/tts_cache.py)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MAX_BYTES: int = 500 * 1024 * 1024  # LRU eviction above this
+
+    # Pipelined TTS for streamed answers: each sentence is spoken while later
+    # ones are still generating (see audio/sentences.py)
+    TTS_PIPELINED: bool = True
+    TTS_PIPELINE_CONCURRENCY: int = 2  # Sentence TTS requests in flight per answer
+
+    # Speech to text worker processes (see audio/stt_pool.py). Each holds its own
+    # Whisper model, so size this to the cores available.
+    STT_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)
+    STT_MAX_QUEUE: int = 8  # Waiting jobs before requests get 503 + Retry-After
+    STT_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024  # Larger recordings get 413
+    STT_STREAM_MAX_SECONDS: float = 120.0  # Longest live stream, in audio and in connection time
+    # Start retrieval from a greedy draft transcript while the final one decodes
+    STT_SPECULATIVE_RETRIEVAL: bool = True
+    STT_DRAFT_MIN_CONFIDENCE: float = 0.6  # Mean token probability of the draft
 
     class Config:
         env_file = ".env"
         case_sensitive = True
         extra = "allow"  # Allow extra fields
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -1,10 +1,4 @@
 # File: backend/app/dependencies.py
-from typing import Generator
-from database.session import SessionLocal
+from database.session import get_db
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+__all__ = ["get_db"]
@@ -1,11 +1,18 @@
 # File: backend/app/main.py
+import asyncio
 import sys
 from pathlib import Path
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from api.routes import audio, qa, lectures, auth, feedback, profile
+from audio.text_to_speech import TextToSpeech
+from app import metrics
+from database.session import close_db, run_wal_checkpoints
+from api.auth import password_executor
+from api.uploads import AudioUploadLimit, speech_to_text
+from app.config import settings
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent.parent
@@ -31,6 +38,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized audio uploads, or uploads that would only queue, before the body is parsed
+app.add_middleware(
+    AudioUploadLimit,
+    paths=["/api/audio/speech-to-text", "/api/qa/ask-audio"],
+    max_bytes=settings.STT_MAX_UPLOAD_BYTES,
+    pool=speech_to_text.pool
+)
+
 # Set up audio directories
 AUDIO_DIR = Path("data/audio")
 RESPONSES_DIR = AUDIO_DIR / "responses"
@@ -62,18 +77,48 @@ async def root():
         "status": "ok"
     }
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Per-stage latency histograms and counters in the Prometheus text format"""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+async def prerender_faq():
+    # Embed the example questions first so paraphrases match from the first request
+    await qa.qa_pipeline.faq.embed_examples()
+    try:
+        rendered = await qa.qa_pipeline.faq.prerender()
+        logger.info(f"Pre-rendered audio for {rendered} FAQ answers")
+    except Exception as e:
+        logger.error(f"Error pre-rendering FAQ audio: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     # Log application startup and directory setup
     logger.info("Creating required directories...")
     logger.info(f"Audio responses directory: {RESPONSES_DIR}")
     logger.info(f"Temporary audio directory: {TEMP_DIR}")
+    # Start the speech to text workers so the first request doesn't load a model
+    asyncio.create_task(speech_to_text.pool.warm_up())
+    # Embed FAQ examples and render answer audio in the background so FAQ hits make no outbound calls
+    if qa.qa_pipeline.faq is not None:
+        asyncio.create_task(prerender_faq())
+    # Keep the SQLite WAL short (no-op for other databases)
+    app.state.wal_checkpoints = asyncio.create_task(run_wal_checkpoints())
+    # Chunk and embed lectures queued by the lectures API, including jobs left over from a restart
+    lectures.ingestion_worker.start()
     logger.info("Application startup complete")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     # Cleanup on shutdown
     logger.info("Application shutting down...")
+    await TextToSpeech.close()
+    speech_to_text.pool.shutdown()
+    password_executor.shutdown(wait=False)
+    app.state.wal_checkpoints.cancel()
+    await lectures.ingestion_worker.stop()
+    await close_db()
     try:
         # Cleanup temporary files
         for file in TEMP_DIR.glob("*.*"):
@@ -0,0 +1,91 @@
+# File: backend/app/metrics.py
+"""
+Prometheus metrics for the QA pipeline, served at /metrics.
+
+Stage timings share one histogram, labelled by stage, so their latency
+distributions can be compared side by side. The labelled children are
+bound here once, so recording a sample is a single `observe`.
+"""
+import functools
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+STAGE_SECONDS = Histogram(
+    "virtual_teacher_stage_seconds",
+    "Time spent in each stage of answering a question",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+STT_SECONDS = STAGE_SECONDS.labels("stt")
+EMBED_SECONDS = STAGE_SECONDS.labels("embed_query")
+RETRIEVAL_SECONDS = STAGE_SECONDS.labels("retrieval")
+VECTOR_SEARCH_SECONDS = STAGE_SECONDS.labels("vector_search")
+LLM_FIRST_TOKEN_SECONDS = STAGE_SECONDS.labels("llm_first_token")
+LLM_SECONDS = STAGE_SECONDS.labels("llm_total")
+TTS_SECONDS = STAGE_SECONDS.labels("tts")
+ANSWER_SECONDS = STAGE_SECONDS.labels("answer")
+
+LLM_COMPLETION_TOKENS = Histogram(
+    "virtual_teacher_llm_completion_tokens",
+    "Tokens generated per answer",
+    buckets=(16, 32, 64, 128, 256, 512, 1024)
+)
+
+CACHE_LOOKUPS = Counter(
+    "virtual_teacher_cache_lookups_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"]
+)
+
+TTS_AUDIO_BYTES = Counter("virtual_teacher_tts_audio_bytes_total", "Bytes of speech audio synthesized")
+STT_AUDIO_BYTES = Counter("virtual_teacher_stt_audio_bytes_total", "Bytes of uploaded audio transcribed")
+
+STT_QUEUE_WAIT_SECONDS = Histogram(
+    "virtual_teacher_stt_queue_wait_seconds",
+    "Time transcription jobs waited for a worker",
+    buckets=LATENCY_BUCKETS
+)
+# Read from the transcription pool at scrape time
+STT_QUEUE_DEPTH = Gauge("virtual_teacher_stt_queue_depth", "Transcription jobs waiting for a worker")
+STT_IN_FLIGHT = Gauge("virtual_teacher_stt_in_flight", "Transcription jobs running or waiting")
+
+ADMISSION_QUEUE_SECONDS = Histogram(
+    "virtual_teacher_admission_queue_seconds",
+    "Time QA and audio requests waited for an admission slot",
+    ["priority"],
+    buckets=(0.0, 0.005) + LATENCY_BUCKETS
+)
+ADMISSION_REJECTIONS = Counter(
+    "virtual_teacher_admission_rejections_total",
+    "Requests turned away by admission control",
+    ["reason"]
+)
+# Read from the admission controller at scrape time
+ADMISSION_IN_FLIGHT = Gauge("virtual_teacher_admission_in_flight", "QA and audio requests holding a slot")
+ADMISSION_QUEUE_DEPTH = Gauge("virtual_teacher_admission_queue_depth", "QA and audio requests waiting for a slot")
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def timed(histogram):
+    """Decorator recording how long an async function takes in `histogram`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def render():
+    """(body, content type) of the current metrics in the Prometheus text format"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,103 @@
+# File: backend/audio/sentences.py
+import re
+from typing import List
+
+CODE_FENCE = "```"
+CODE_PLACEHOLDER = "I've included a code example in my response which you can see below."
+
+# Words that end in a period without ending the sentence ("Dr. Soule", "e.g. a heap")
+ABBREVIATIONS = frozenset(["dr", "mr", "mrs", "ms", "prof", "e.g", "i.e", "etc", "vs", "fig", "no"])
+
+BOUNDARY_PATTERN = re.compile(r"(?<=[.!?:])[\"')\]]*\s+|\n\s*\n")
+
+
+class SentenceSegmenter:
+    """
+    Cuts streamed LLM text into speech-safe sentences.
+
+    Text is fed in as it arrives; `feed` returns the sentences completed so
+    far and `flush` returns whatever is left at the end. Fenced code blocks
+    are skipped as they stream in and each is replaced by a single spoken
+    placeholder, matching the full-answer speech text. Sentences shorter than
+    `min_chars` are joined with the next one so TTS isn't called for
+    fragments like "Sure!".
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._pending = ""
+        self._in_code = False
+
+    def _clean(self, text: str) -> str:
+        # Inline code is read as plain words
+        return " ".join(text.replace("`", "").split())
+
+    def _emit(self, text: str, force: bool = False) -> List[str]:
+        text = self._clean(text)
+        if not text:
+            return []
+        self._pending = f"{self._pending} {text}".strip()
+        if force or len(self._pending) >= self.min_chars:
+            sentence, self._pending = self._pending, ""
+            return [sentence]
+        return []
+
+    def _split_prose(self, final: bool) -> List[str]:
+        """Emit complete sentences from the prose buffer, keeping the unfinished tail"""
+        sentences = []
+        start = 0
+        for match in BOUNDARY_PATTERN.finditer(self._buffer):
+            candidate = self._buffer[start:match.start()]
+            last_word = candidate.rstrip(".").rsplit(None, 1)[-1].lower() if candidate.strip() else ""
+            if candidate.rstrip().endswith(".") and last_word in ABBREVIATIONS:
+                continue
+            sentences.extend(self._emit(candidate))
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        if final:
+            sentences.extend(self._emit(self._buffer, force=True))
+            self._buffer = ""
+        return sentences
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        while True:
+            fence = self._buffer.find(CODE_FENCE)
+            if self._in_code:
+                if fence == -1:
+                    # Keep a possible partial closing fence
+                    self._buffer = self._buffer[-(len(CODE_FENCE) - 1):]
+                    return sentences
+                self._buffer = self._buffer[fence + len(CODE_FENCE):]
+                self._in_code = False
+                continue
+
+            if fence == -1:
+                # Hold back trailing backticks that may start a fence
+                held = len(self._buffer) - len(self._buffer.rstrip("`"))
+                tail = self._buffer[len(self._buffer) - held:]
+                self._buffer = self._buffer[:len(self._buffer) - held]
+                sentences.extend(self._split_prose(final=False))
+                self._buffer += tail
+                return sentences
+
+            # Prose before the fence ends there; the code itself is not spoken
+            self._buffer, remainder = self._buffer[:fence], self._buffer[fence + len(CODE_FENCE):]
+            sentences.extend(self._split_prose(final=False))
+            sentences.extend(self._emit(f"{self._buffer} {CODE_PLACEHOLDER}", force=True))
+            self._buffer = remainder
+            self._in_code = True
+
+    def flush(self) -> List[str]:
+        """Return the remaining text once the stream has ended"""
+        if self._in_code:
+            self._buffer = ""
+            self._in_code = False
+        sentences = self._split_prose(final=True)
+        if self._pending:
+            sentences.append(self._pending)
+            self._pending = ""
+        return sentences
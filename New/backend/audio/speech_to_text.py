@@ -1,43 +1,61 @@
 # File: backend/audio/speech_to_text.py
-from faster_whisper import WhisperModel
 import logging
 from pathlib import Path
 
+from app import metrics
+from app.config import settings
+from audio.stt_pool import TranscriptionPool, TranscriptionQueueFull
+
 logger = logging.getLogger(__name__)
 
 class SpeechToText:
     def __init__(self):
         try:
-            # Optimized model for speed and accuracy
-            self.model = WhisperModel(
-                "base.en",          # Switch to base.en for better balance
-                device="cpu",       # Ensure it runs efficiently on CPU
-                compute_type="int8" # Optimize for CPU with int8 precision
+            # Transcription runs in worker processes, each with a warm model, so
+            # the CPU-bound decode never blocks the event loop
+            self.pool = TranscriptionPool(
+                workers=settings.STT_WORKERS,
+                max_queue=settings.STT_MAX_QUEUE,
+                model_name="base.en",   # Switch to base.en for better balance
+                device="cpu",           # Ensure it runs efficiently on CPU
+                compute_type="int8"     # Optimize for CPU with int8 precision
             )
-            logger.info("Speech to text model initialized successfully")
+            metrics.STT_QUEUE_DEPTH.set_function(lambda: self.pool.queue_depth)
+            metrics.STT_IN_FLIGHT.set_function(lambda: self.pool.pending)
+            logger.info("Speech to text pool initialized successfully")
         except Exception as e:
-            logger.error(f"Error initializing speech to text model: {str(e)}")
+            logger.error(f"Error initializing speech to text pool: {str(e)}")
             raise
 
+    @metrics.timed(metrics.STT_SECONDS)
     async def convert(self, audio_file: Path) -> str:
         """Convert speech to text"""
         try:
             logger.info(f"Processing audio file: {audio_file}")
+            text = await self.pool.transcribe(str(audio_file))
+            logger.info(f"Successfully transcribed audio to: {text[:50]}...")
+            return text
 
-            # Transcribe audio with faster parameters
-            segments, _ = self.model.transcribe(
-                str(audio_file),
-                language="en",
-                word_timestamps=False,
-                vad_filter=True  # Use voice activity detection for cleaner results
-            )
-
-            # Join segments into a single text output
-            text = " ".join([segment.text.strip() for segment in segments])
+        except TranscriptionQueueFull:
+            logger.warning(f"Speech to text queue full, rejecting {audio_file}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in speech to text conversion: {str(e)}")
+            raise
 
+    @metrics.timed(metrics.STT_SECONDS)
+    async def convert_bytes(self, data: bytes) -> str:
+        """Convert an uploaded recording to text without writing it to disk"""
+        metrics.STT_AUDIO_BYTES.inc(len(data))
+        try:
+            logger.info(f"Processing {len(data)} bytes of audio")
+            text = await self.pool.transcribe_bytes(data)
             logger.info(f"Successfully transcribed audio to: {text[:50]}...")
             return text
 
+        except TranscriptionQueueFull:
+            logger.warning("Speech to text queue full, rejecting upload")
+            raise
         except Exception as e:
             logger.error(f"Error in speech to text conversion: {str(e)}")
             raise
@@ -0,0 +1,181 @@
+# File: backend/audio/streaming_stt.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from audio.stt_pool import TranscriptionPool, TranscriptionQueueFull
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 480  # 30 ms
+BYTES_PER_SAMPLE = 2
+
+
+class EnergyVAD:
+    """
+    Frame-level voice activity detection on RMS energy.
+
+    The noise floor adapts to the room during non-speech frames, so speech is
+    anything `ratio` times louder than the background (and above `min_rms`).
+    """
+
+    def __init__(self, ratio: float = 3.0, min_rms: float = 0.01, adapt: float = 0.05):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.adapt = adapt
+        self.noise_floor: Optional[float] = None
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(frame * frame))) if frame.size else 0.0
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        speech = rms > max(self.min_rms, self.noise_floor * self.ratio)
+        if not speech:
+            self.noise_floor += self.adapt * (rms - self.noise_floor)
+        return speech
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of a live 16 kHz mono PCM16 stream.
+
+    Incoming audio is cut into utterances by `EnergyVAD`: an utterance
+    starts at the first speech frame (with a little pre-roll) and ends after
+    `silence_ms` of silence or `max_segment_seconds` of audio. While an
+    utterance is in progress it is re-decoded every `partial_interval`
+    seconds with a fast greedy pass whenever a worker is idle; partials are
+    best effort and are skipped under load. When an utterance ends it is
+    decoded once more with beam search and sent as final, so the final
+    transcript is ready shortly after the speaker stops.
+
+    Messages passed to `send`:
+        {"type": "partial", "text": <transcript so far, including the partial utterance>}
+        {"type": "final", "text": <transcript so far>, "done": <True after finish()>}
+        {"type": "error", "message": ..., "retry_after": <seconds, when the pool is full>}
+    """
+
+    def __init__(
+        self,
+        pool: TranscriptionPool,
+        send: Callable[[Dict], Awaitable[None]],
+        partial_interval: float = 1.0,
+        silence_ms: int = 600,
+        max_segment_seconds: float = 20.0,
+        preroll_ms: int = 300
+    ):
+        self.pool = pool
+        self.send = send
+        self.vad = EnergyVAD()
+        self.partial_samples = int(partial_interval * SAMPLE_RATE)
+        self.silence_frames = max(1, silence_ms * SAMPLE_RATE // 1000 // FRAME_SAMPLES)
+        self.max_segment_samples = int(max_segment_seconds * SAMPLE_RATE)
+        self.preroll_frames = max(1, preroll_ms * SAMPLE_RATE // 1000 // FRAME_SAMPLES)
+
+        self._pending = b""  # Bytes not yet forming a whole frame
+        self._preroll: List[bytes] = []
+        self._segment: Optional[bytearray] = None
+        self._segment_id = 0
+        self._silent_frames = 0
+        self._samples_at_last_partial = 0
+        self._partial_task: Optional[asyncio.Task] = None
+
+        # Finals are produced in utterance order by chaining each on the previous one
+        self._finals: List[str] = []
+        self._last_final: Optional[asyncio.Task] = None
+        self.failed = False
+
+    def _transcript(self, *extra: str) -> str:
+        return " ".join(t for t in (*self._finals, *extra) if t)
+
+    def feed(self, pcm: bytes) -> None:
+        """Add audio; schedules partial and final decodes as utterances progress"""
+        data = self._pending + pcm
+        usable = len(data) - len(data) % (FRAME_SAMPLES * BYTES_PER_SAMPLE)
+        self._pending = data[usable:]
+
+        for start in range(0, usable, FRAME_SAMPLES * BYTES_PER_SAMPLE):
+            frame_bytes = data[start:start + FRAME_SAMPLES * BYTES_PER_SAMPLE]
+            frame = np.frombuffer(frame_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            speech = self.vad.is_speech(frame)
+
+            if self._segment is None:
+                self._preroll = (self._preroll + [frame_bytes])[-self.preroll_frames:]
+                if speech:
+                    self._segment = bytearray(b"".join(self._preroll))
+                    self._preroll = []
+                    self._silent_frames = 0
+                    self._samples_at_last_partial = 0
+                continue
+
+            self._segment.extend(frame_bytes)
+            self._silent_frames = 0 if speech else self._silent_frames + 1
+            samples = len(self._segment) // BYTES_PER_SAMPLE
+            if self._silent_frames >= self.silence_frames or samples >= self.max_segment_samples:
+                self._end_segment()
+            elif samples - self._samples_at_last_partial >= self.partial_samples:
+                self._maybe_partial()
+
+    def _maybe_partial(self) -> None:
+        if self._partial_task is not None and not self._partial_task.done():
+            return
+        if not self.pool.has_idle_worker():
+            return
+        self._samples_at_last_partial = len(self._segment) // BYTES_PER_SAMPLE
+        self._partial_task = asyncio.create_task(self._partial(self._segment_id, bytes(self._segment)))
+
+    async def _partial(self, segment_id: int, pcm: bytes) -> None:
+        try:
+            text = await self.pool.transcribe_pcm(pcm, beam_size=1)
+        except TranscriptionQueueFull:
+            return
+        except Exception as e:
+            logger.error(f"Error in partial transcription: {str(e)}")
+            return
+        # Drop partials that arrive after their utterance was finalized
+        if segment_id == self._segment_id and not self.failed:
+            await self.send({"type": "partial", "text": self._transcript(text)})
+
+    def _end_segment(self) -> None:
+        pcm = bytes(self._segment)
+        self._segment = None
+        self._segment_id += 1
+        self._last_final = asyncio.create_task(self._final(pcm, self._last_final))
+
+    async def _final(self, pcm: bytes, previous: Optional[asyncio.Task], done: bool = False) -> None:
+        text = ""
+        error: Optional[Dict] = None
+        try:
+            text = await self.pool.transcribe_pcm(pcm)
+        except TranscriptionQueueFull as e:
+            error = {"type": "error", "message": "Speech to text is busy", "retry_after": e.retry_after}
+        except Exception as e:
+            logger.error(f"Error in final transcription: {str(e)}")
+            error = {"type": "error", "message": "Transcription failed"}
+
+        if previous is not None:
+            await previous
+        if self.failed:
+            return
+        if error is not None:
+            self.failed = True
+            await self.send(error)
+            return
+        self._finals.append(text.strip())
+        await self.send({"type": "final", "text": self._transcript(), "done": done})
+
+    async def finish(self) -> str:
+        """End of stream: finalize the current utterance and return the full transcript"""
+        pcm = bytes(self._segment) if self._segment is not None else b""
+        self._segment = None
+        self._segment_id += 1
+        if pcm:
+            await self._final(pcm, self._last_final, done=True)
+        else:
+            if self._last_final is not None:
+                await self._last_final
+            if not self.failed:
+                await self.send({"type": "final", "text": self._transcript(), "done": True})
+        return self._transcript()
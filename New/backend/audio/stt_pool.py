@@ -0,0 +1,248 @@
+# File: backend/audio/stt_pool.py
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+# Set in each worker process by _init_worker
+_model = None
+
+
+def _init_worker(model_name: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    """Load the Whisper model once per worker process so every job finds it warm"""
+    global _model
+    from faster_whisper import WhisperModel
+
+    _model = WhisperModel(model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _transcribe(audio_path: str) -> Tuple[str, float, float]:
+    """Worker: transcribe one file; returns (text, started_at, finished_at)"""
+    started_at = time.time()
+    segments, _ = _model.transcribe(
+        audio_path,
+        language="en",
+        word_timestamps=False,
+        vad_filter=True  # Use voice activity detection for cleaner results
+    )
+    # Join segments into a single text output
+    text = " ".join([segment.text.strip() for segment in segments])
+    return text, started_at, time.time()
+
+
+def _decode_bytes(data: bytes):
+    """Float32 mono PCM at 16 kHz, straight from the uploaded bytes"""
+    import io
+    from faster_whisper import decode_audio
+
+    try:
+        return decode_audio(io.BytesIO(data), sampling_rate=16000)
+    except Exception as e:
+        raise ValueError(f"Could not decode audio: {str(e)}")
+
+
+def _transcribe_bytes(data: bytes) -> Tuple[str, float, float]:
+    """Worker: decode an uploaded recording (wav, webm/opus, mp3, ...) in memory and transcribe it"""
+    started_at = time.time()
+    audio = _decode_bytes(data)
+    segments, _ = _model.transcribe(
+        audio,
+        language="en",
+        word_timestamps=False,
+        vad_filter=True  # Use voice activity detection for cleaner results
+    )
+    text = " ".join([segment.text.strip() for segment in segments])
+    return text, started_at, time.time()
+
+
+def _draft_bytes(data: bytes) -> Tuple[Tuple[str, float], float, float]:
+    """
+    Worker: fast greedy transcription of an uploaded recording.
+    Returns ((text, confidence), started_at, finished_at), where confidence
+    is the mean token probability weighted by segment length.
+    """
+    started_at = time.time()
+    audio = _decode_bytes(data)
+    segments, _ = _model.transcribe(
+        audio,
+        language="en",
+        beam_size=1,
+        word_timestamps=False,
+        vad_filter=True
+    )
+    segments = list(segments)
+    text = " ".join([segment.text.strip() for segment in segments])
+    weights = [max(segment.end - segment.start, 0.01) for segment in segments]
+    confidence = sum(
+        math.exp(segment.avg_logprob) * (1.0 - segment.no_speech_prob) * weight
+        for segment, weight in zip(segments, weights)
+    ) / sum(weights) if segments else 0.0
+    return (text, confidence), started_at, time.time()
+
+
+def _transcribe_pcm(pcm: bytes, beam_size: int) -> Tuple[str, float, float]:
+    """Worker: transcribe 16 kHz mono 16-bit PCM that was already segmented by VAD"""
+    import numpy as np
+
+    started_at = time.time()
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    segments, _ = _model.transcribe(
+        audio,
+        language="en",
+        beam_size=beam_size,
+        word_timestamps=False,
+        condition_on_previous_text=False
+    )
+    text = " ".join([segment.text.strip() for segment in segments])
+    return text, started_at, time.time()
+
+
+class TranscriptionQueueFull(Exception):
+    """Raised when the transcription queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Transcription queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TranscriptionPool:
+    """
+    Runs faster-whisper transcription in a pool of worker processes.
+
+    Each worker loads its own `WhisperModel` at start-up and keeps it for
+    every job, so the event loop never runs the CPU-bound decode. At most
+    `workers` jobs run at once and at most `max_queue` more wait; beyond that
+    `transcribe` fails fast with `TranscriptionQueueFull`, carrying a
+    Retry-After estimate based on recent transcription times.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        model_name: str = "base.en",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: Optional[int] = None
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        cpu_threads = cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+        # Spawned rather than forked: the server process has running threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, device, compute_type, cpu_threads)
+        )
+
+        # Jobs submitted and not yet finished (running or waiting)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        # Recent queue waits and transcription times, in seconds
+        self._waits: deque = deque(maxlen=200)
+        self._durations: deque = deque(maxlen=200)
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker"""
+        return max(0, self.pending - self.workers)
+
+    def is_full(self) -> bool:
+        return self.pending >= self.workers + self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up"""
+        avg = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        return max(1, math.ceil(avg * (self.queue_depth + 1) / self.workers))
+
+    async def warm_up(self) -> None:
+        """Start every worker process (and load its model) before the first request"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+        logger.info(f"Speech to text pool ready with {self.workers} workers")
+
+    @property
+    def idle_workers(self) -> int:
+        return max(0, self.workers - self.pending)
+
+    async def _run(self, fn, *args) -> Any:
+        if self.is_full():
+            self.rejected += 1
+            raise TranscriptionQueueFull(self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        self.pending += 1
+        try:
+            result, started_at, finished_at = await loop.run_in_executor(self._executor, fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        wait = max(0.0, started_at - submitted_at)
+        self._waits.append(wait)
+        metrics.STT_QUEUE_WAIT_SECONDS.observe(wait)
+        self._durations.append(finished_at - started_at)
+        return result
+
+    async def transcribe(self, audio_path: str) -> str:
+        """Transcribe an audio file"""
+        return await self._run(_transcribe, audio_path)
+
+    async def transcribe_bytes(self, data: bytes) -> str:
+        """Transcribe an encoded recording held in memory; raises ValueError if it can't be decoded"""
+        return await self._run(_transcribe_bytes, data)
+
+    async def transcribe_draft(self, data: bytes) -> Tuple[str, float]:
+        """Quick greedy transcript of an encoded recording and its confidence (0-1)"""
+        return await self._run(_draft_bytes, data)
+
+    async def transcribe_pcm(self, pcm: bytes, beam_size: int = 5) -> str:
+        """Transcribe raw 16 kHz mono 16-bit PCM (a speech segment from a live stream)"""
+        return await self._run(_transcribe_pcm, pcm, beam_size)
+
+    def has_idle_worker(self) -> bool:
+        return self.idle_workers > 0
+
+    def stats(self) -> Dict:
+        def percentile(values, q):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.pending,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "wait_ms_p50": percentile(self._waits, 0.5) * 1000,
+            "wait_ms_p95": percentile(self._waits, 0.95) * 1000,
+            "transcribe_ms_p50": percentile(self._durations, 0.5) * 1000,
+            "transcribe_ms_p95": percentile(self._durations, 0.95) * 1000,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,12 +1,17 @@
 # File: backend/audio/text_to_speech.py
-import requests
+import asyncio
+import aiohttp
 from pathlib import Path
 import uuid
 import logging
 import time
 import os
 from datetime import datetime
+from typing import Dict, Optional
 from dotenv import load_dotenv
+from app import metrics
+from app.config import settings
+from audio.tts_cache import FILE_PREFIX, TTSCache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,7 +24,21 @@ logger = logging.getLogger(__name__)
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
 
+# Voice settings sent with every request (part of the audio cache key)
+VOICE_SETTINGS = {
+    "stability": 0.4,         # Lower for faster output
+    "similarity_boost": 0.7,  # Balance quality and speed
+    "style": 0.5
+}
+
 class TextToSpeech:
+    # One HTTP connection pool and request limit shared by every instance
+    _session: Optional[aiohttp.ClientSession] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    # Audio cache and in-progress syntheses, also shared
+    _cache: Optional[TTSCache] = None
+    _inflight: Dict[str, asyncio.Future] = {}
+
     def __init__(self):
         """Initialize TextToSpeech with proper directory structure"""
         self.audio_dir = Path("data/audio")
@@ -29,6 +48,10 @@ class TextToSpeech:
         # Create necessary directories
         for directory in [self.audio_dir, self.responses_dir, self.temp_dir]:
             directory.mkdir(parents=True, exist_ok=True)
+
+        if settings.TTS_CACHE_ENABLED and TextToSpeech._cache is None:
+            TextToSpeech._cache = TTSCache(self.responses_dir, settings.TTS_CACHE_MAX_BYTES)
+        self.cache = TextToSpeech._cache if settings.TTS_CACHE_ENABLED else None
             
         logger.info("TextToSpeech initialized with directories setup")
 
@@ -38,29 +61,73 @@ class TextToSpeech:
         unique_id = str(uuid.uuid4())[:8]
         return f"response_{timestamp}_{unique_id}.mp3"
 
+    @classmethod
+    async def _get_session(cls) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created on first use inside the server's event loop"""
+        if cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.TTS_POOL_SIZE,
+                keepalive_timeout=settings.TTS_KEEPALIVE_SECONDS
+            )
+            cls._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.TTS_TIMEOUT_SECONDS)
+            )
+            cls._semaphore = asyncio.Semaphore(settings.TTS_MAX_CONCURRENCY)
+        return cls._session
+
+    @classmethod
+    async def close(cls):
+        """Close the shared HTTP session (on application shutdown)"""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+        cls._semaphore = None
+
+    @metrics.timed(metrics.TTS_SECONDS)
     async def convert(self, text: str) -> Path:
-        """Convert text to speech using ElevenLabs API"""
+        """Convert text to speech using ElevenLabs API, reusing cached audio for identical speech"""
+        if self.cache is None:
+            return await self._synthesize(text, self.responses_dir / self._generate_unique_filename())
+
+        key = self.cache.key(VOICE_ID, VOICE_SETTINGS, text)
+        cached = self.cache.get(key, text)
+        metrics.cache_lookup("tts", cached is not None)
+        if cached is not None:
+            logger.info(f"Serving cached audio: {cached.name}")
+            return cached
+
+        # Concurrent requests for the same speech share one synthesis
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._synthesize_cached(key, text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _synthesize_cached(self, key: str, text: str) -> Path:
+        start = time.perf_counter()
+        await self._synthesize(text, self.cache.path_for(key))
+        return self.cache.add(key, time.perf_counter() - start)
+
+    async def _synthesize(self, text: str, file_path: Path) -> Path:
+        """Request speech for `text` and stream it to `file_path`"""
         logger.info("Converting text to speech using ElevenLabs API...")
 
         if not ELEVENLABS_API_KEY or not VOICE_ID:
             logger.error("ElevenLabs API key or Voice ID is missing.")
             raise ValueError("ElevenLabs API key or Voice ID is missing.")
 
-        # Generate unique filename
-        filename = self._generate_unique_filename()
-        file_path = self.responses_dir / filename
+        # Written under a temporary name so a partial file is never served
+        part_path = file_path.with_suffix(".part")
 
         # ElevenLabs API endpoint
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}/stream"
+        url = f"{settings.ELEVENLABS_BASE_URL.rstrip('/')}/v1/text-to-speech/{VOICE_ID}/stream"
 
         # Request payload with optimized settings
         payload = {
             "text": text,
-            "voice_settings": {
-                "stability": 0.4,         # Lower for faster output
-                "similarity_boost": 0.7,  # Balance quality and speed
-                "style": 0.5
-            }
+            "voice_settings": VOICE_SETTINGS
         }
 
         # Request headers
@@ -70,24 +137,36 @@ class TextToSpeech:
         }
 
         # API request with faster streaming
+        session = await self._get_session()
+        loop = asyncio.get_running_loop()
         try:
-            with requests.post(url, json=payload, headers=headers, stream=True) as response:
-                if response.status_code == 200:
-                    with open(file_path, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=4096):
-                            if chunk:
-                                f.write(chunk)
-
-                    logger.info(f"Successfully created audio file: {filename}")
-                    return file_path
-
-                else:
-                    logger.error(f"Failed to generate speech. Status: {response.status_code}, Error: {response.text}")
-                    raise Exception(f"Failed to generate speech: {response.text}")
-
-        except requests.exceptions.RequestException as e:
+            async with self._semaphore:
+                async with session.post(url, json=payload, headers=headers) as response:
+                    if response.status != 200:
+                        error = await response.text()
+                        logger.error(f"Failed to generate speech. Status: {response.status}, Error: {error}")
+                        raise Exception(f"Failed to generate speech: {error}")
+
+                    # Audio is written as it streams in; disk writes run in the
+                    # default executor so they don't block the event loop
+                    f = await loop.run_in_executor(None, open, part_path, "wb")
+                    try:
+                        async for chunk in response.content.iter_chunked(16384):
+                            await loop.run_in_executor(None, f.write, chunk)
+                            metrics.TTS_AUDIO_BYTES.inc(len(chunk))
+                    finally:
+                        await loop.run_in_executor(None, f.close)
+
+            os.replace(part_path, file_path)
+            logger.info(f"Successfully created audio file: {file_path.name}")
+            return file_path
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"API request failed: {str(e)}")
             raise Exception(f"API request failed: {str(e)}")
+        finally:
+            if part_path.exists():
+                part_path.unlink()
 
     async def cleanup_old_files(self, max_age_hours: int = 1):
         """Clean up old audio files from temp and responses directories"""
@@ -101,8 +180,13 @@ class TextToSpeech:
                     file.unlink()
                     logger.info(f"Cleaned up temp file: {file}")
             
-            # Clean responses directory
+            # Clean responses directory; cached audio is bounded by its byte
+            # quota instead of by age
+            if self.cache is not None:
+                self.cache.evict()
             for file in self.responses_dir.glob("*.mp3"):
+                if self.cache is not None and file.name.startswith(FILE_PREFIX):
+                    continue
                 if (current_time - file.stat().st_mtime) > max_age:
                     file.unlink()
                     logger.info(f"Cleaned up response file: {file}")
@@ -0,0 +1,126 @@
+# File: backend/audio/tts_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "tts_"
+
+
+def normalize_speech_text(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share audio"""
+    return " ".join(text.split())
+
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesized speech.
+
+    Each mp3 is stored as `tts_<hash>.mp3`, where the hash covers the voice
+    id, voice settings and normalized text, so identical speech is only
+    synthesized once. Files live in the responses directory and keep their
+    public URLs. A hit touches the file's mtime, and when the directory goes
+    over `max_bytes` the least recently used files are removed.
+
+    Hit/miss counters are per process; `stats()` turns them into the
+    characters (ElevenLabs bills per character) and seconds of synthesis
+    that hits saved.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.characters_saved = 0
+        self.synthesized = 0
+        self._synthesis_seconds = 0.0
+        self._total_bytes = sum(f.stat().st_size for f in self._files())
+
+    def _files(self):
+        return self.directory.glob(f"{FILE_PREFIX}*.mp3")
+
+    def key(self, voice_id: str, voice_settings: Dict, text: str) -> str:
+        material = json.dumps(
+            {"voice_id": voice_id, "voice_settings": voice_settings, "text": normalize_speech_text(text)},
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{FILE_PREFIX}{key[:40]}.mp3"
+
+    def get(self, key: str, text: str) -> Optional[Path]:
+        """Path of the cached audio for `key`, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            # Refresh recency for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.characters_saved += len(normalize_speech_text(text))
+        return path
+
+    def add(self, key: str, synthesis_seconds: float) -> Path:
+        """Account for audio just written to `path_for(key)` and enforce the quota"""
+        path = self.path_for(key)
+        with self._lock:
+            self._total_bytes += path.stat().st_size
+            self.synthesized += 1
+            self._synthesis_seconds += synthesis_seconds
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Remove least recently used files until the cache fits its quota; returns files removed"""
+        with self._lock:
+            entries = []
+            for f in self._files():
+                try:
+                    stat = f.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, f))
+            entries.sort()
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, f in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    f.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self._total_bytes = total
+
+        if removed:
+            logger.info(f"TTS cache evicted {removed} files, {total / 1_048_576:.1f} MB in use")
+        return removed
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        avg_synthesis = self._synthesis_seconds / self.synthesized if self.synthesized else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "characters_saved": self.characters_saved,
+            "avg_synthesis_seconds": avg_synthesis,
+            "estimated_seconds_saved": avg_synthesis * self.hits,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,11 +1,25 @@
 # File: backend/database/__init__.py
-from .session import SessionLocal, engine, get_db, init_db, test_db_connection
+from .session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    async_read_engine,
+    close_db,
+    engine,
+    get_db,
+    init_db,
+    test_db_connection
+)
 from .models.lecture import Base, Lecture
 
 # Export these for easy access from other modules
 __all__ = [
     'SessionLocal',
+    'AsyncSessionLocal',
     'engine',
+    'async_engine',
+    'async_read_engine',
+    'close_db',
     'get_db',
     'init_db',
     'test_db_connection',
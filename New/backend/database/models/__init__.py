@@ -4,6 +4,8 @@ from .lecture import Lecture
 from .user import User
 from .student_profile import StudentProfile
 from .feedback import Feedback
+from .feedback_rollup import FeedbackRollup
+from .ingestion_job import IngestionJob
 
 # Export these for easy access
 __all__ = [
@@ -11,5 +13,7 @@ __all__ = [
     'Lecture',
     'User',
     'StudentProfile',
-    'Feedback'
+    'Feedback',
+    'FeedbackRollup',
+    'IngestionJob'
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text, Index
 from datetime import datetime
 import uuid
 from .base import Base
@@ -20,5 +20,11 @@ class Feedback(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination, newest first: a student's history and the whole table
+        Index("ix_feedback_user_created", "user_id", "created_at", "id"),
+        Index("ix_feedback_created", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Feedback {self.id} from user {self.user_id}>" 
\ No newline at end of file
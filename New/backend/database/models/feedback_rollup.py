@@ -0,0 +1,21 @@
+# File: backend/database/models/feedback_rollup.py
+from sqlalchemy import Column, String, Integer, Date
+from .base import Base
+
+class FeedbackRollup(Base):
+    """
+    Feedback count and rating sum per category and day, kept up to date in
+    the same transaction as each submission, so aggregates never scan
+    the feedback table.
+    """
+    __tablename__ = "feedback_rollups"
+    
+    # Feedback without a category is counted under ""
+    category = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    
+    feedback_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<FeedbackRollup {self.category or '-'} {self.day}: {self.feedback_count}>"
@@ -0,0 +1,39 @@
+# File: backend/database/models/ingestion_job.py
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text, Index
+from datetime import datetime
+import uuid
+from .base import Base
+
+class IngestionJob(Base):
+    """A lecture waiting for, or going through, chunking and embedding (see rag/ingestion.py)"""
+    __tablename__ = "ingestion_jobs"
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    lecture_id = Column(Integer, ForeignKey("lectures.id"), nullable=False, index=True)
+    status = Column(String(16), nullable=False, default=QUEUED)
+    
+    # Progress: chunks embedded out of the lecture's total (known once chunked)
+    chunks_total = Column(Integer, nullable=True)
+    chunks_done = Column(Integer, nullable=False, default=0)
+    
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    # Refreshed while running; a running job that stops refreshing is taken over
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Workers claim the oldest job in a status
+        Index("ix_ingestion_jobs_status_created", "status", "created_at"),
+    )
+    
+    def __repr__(self):
+        return f"<IngestionJob {self.id} lecture {self.lecture_id}: {self.status}>"
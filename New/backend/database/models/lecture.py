@@ -1,6 +1,8 @@
 # File: backend/database/models/lecture.py
 from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.orm import validates
 from datetime import datetime
+import hashlib
 from .base import Base
 
 class Lecture(Base):
@@ -9,8 +11,23 @@ class Lecture(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True)  # Added length constraint
     content = Column(Text, nullable=False)
+    # Kept in step with content, so listings and ETags never read the body
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the UTF-8 content
+    content_size = Column(Integer, nullable=True)  # Bytes of UTF-8 content
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("content")
+    def _track_content(self, key, content):
+        self.content_hash, self.content_size = content_digest(content)
+        return content
+
     def __repr__(self):
-        return f"<Lecture(id={self.id}, title='{self.title}')>"
\ No newline at end of file
+        return f"<Lecture(id={self.id}, title='{self.title}')>"
+
+def content_digest(content):
+    """(SHA-256 hex, size in bytes) of lecture content"""
+    if content is None:
+        return None, None
+    data = content.encode("utf-8")
+    return hashlib.sha256(data).hexdigest(), len(data)
@@ -0,0 +1,105 @@
+# File: backend/database/rollups.py
+"""
+Incrementally maintained feedback aggregates (the feedback_rollups table).
+
+Each submission adds to its (category, day) row with one upsert in the
+submission's own transaction, so the rollups always agree with the
+feedback table and dashboards read them instead of scanning it.
+"""
+import logging
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import Feedback, FeedbackRollup
+
+logger = logging.getLogger(__name__)
+
+# Dialects with an atomic "insert or add to the existing row"
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def rollup_category(category: Optional[str]) -> str:
+    return category or ""
+
+
+def _upsert(dialect: str, category: str, day: date, rating: int):
+    """Statement adding one rating to a rollup row, creating it if needed"""
+    table = FeedbackRollup.__table__
+    values = {"category": category, "day": day, "feedback_count": 1, "rating_sum": rating}
+    if dialect in _UPSERT_INSERTS:
+        stmt = _UPSERT_INSERTS[dialect](table).values(**values)
+        return stmt.on_conflict_do_update(
+            index_elements=["category", "day"],
+            set_={
+                "feedback_count": table.c.feedback_count + 1,
+                "rating_sum": table.c.rating_sum + rating,
+            }
+        )
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table).values(**values)
+        return stmt.on_duplicate_key_update(
+            feedback_count=table.c.feedback_count + 1,
+            rating_sum=table.c.rating_sum + rating
+        )
+    return None
+
+
+async def record_feedback(db: AsyncSession, category: Optional[str], created_at: datetime, rating: int) -> None:
+    """Add a submission to its rollup row; runs in the caller's transaction"""
+    category = rollup_category(category)
+    day = created_at.date()
+    dialect = db.get_bind().dialect.name
+    stmt = _upsert(dialect, category, day, rating)
+    if stmt is not None:
+        await db.execute(stmt)
+        return
+
+    # Other databases: add to the row, or create it if nothing was updated
+    result = await db.execute(
+        update(FeedbackRollup)
+        .where(FeedbackRollup.category == category, FeedbackRollup.day == day)
+        .values(
+            feedback_count=FeedbackRollup.feedback_count + 1,
+            rating_sum=FeedbackRollup.rating_sum + rating
+        )
+    )
+    if result.rowcount == 0:
+        await db.execute(insert(FeedbackRollup).values(
+            category=category, day=day, feedback_count=1, rating_sum=rating
+        ))
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup row from the feedback table (one scan); returns the row count"""
+    day = func.date(Feedback.created_at)
+    rows = db.execute(
+        select(
+            func.coalesce(Feedback.category, ""),
+            day,
+            func.count(),
+            func.sum(Feedback.rating)
+        ).group_by(func.coalesce(Feedback.category, ""), day)
+    ).all()
+
+    db.execute(delete(FeedbackRollup))
+    db.add_all([
+        FeedbackRollup(
+            category=category,
+            day=date.fromisoformat(str(row_day)[:10]),
+            feedback_count=count,
+            rating_sum=int(rating_sum or 0)
+        )
+        for category, row_day, count, rating_sum in rows
+        if row_day is not None
+    ])
+    db.commit()
+    logger.info(f"Rebuilt {len(rows)} feedback rollup rows")
+    return len(rows)
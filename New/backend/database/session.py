@@ -1,9 +1,17 @@
 # File: backend/database/session.py
+import asyncio
+import logging
+from typing import AsyncGenerator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+from .sqlite import CHECKPOINT_SECONDS, checkpoint, create_sqlite_engines, install_pragmas
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +25,27 @@ DATABASE_URL = os.getenv(
     default=f"sqlite:///{BASE_DIR}/virtual_teacher.db"
 )
 
+# Async drivers for the sync URLs above, used by the API's async sessions
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """The same database URL with an asyncio driver"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", default=to_async_url(DATABASE_URL))
+
+# SQLite storage profile: "production" (WAL, tuned pragmas, single writer plus a
+# read pool; see database/sqlite.py) or "default" (one plain pool)
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+SQLITE_PRODUCTION = DATABASE_URL.startswith("sqlite") and DB_PROFILE == "production"
+
 # Create the SQLite database engine
 try:
     engine = create_engine(
@@ -28,23 +57,75 @@ except Exception as e:
     print(f"Error creating database engine: {e}")
     raise
 
-# Create the SessionLocal class
+if SQLITE_PRODUCTION:
+    install_pragmas(engine)
+
+# Create the SessionLocal class (scripts and other synchronous code)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
-def get_db():
+# Async engines for the API, so queries don't block the event loop.
+# `async_engine` takes writes; `async_read_engine` is the same engine unless
+# the SQLite production profile splits reads onto their own pool.
+try:
+    if SQLITE_PRODUCTION:
+        async_engine, async_read_engine, AsyncSessionLocal = create_sqlite_engines(ASYNC_DATABASE_URL)
+    else:
+        # aiosqlite defaults to NullPool, which opens a connection (and its
+        # thread) per session; a queue pool keeps them open like the sync engine's
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_pre_ping=True
+        )
+        async_read_engine = async_engine
+
+        # Objects stay usable after commit; reloading them would need another await
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+except Exception as e:
+    print(f"Error creating async database engine: {e}")
+    raise
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency function to get database session.
+    Dependency function to get an async database session.
     Use this in FastAPI route dependencies.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+async def run_wal_checkpoints():
+    """Checkpoint the SQLite WAL periodically so it doesn't grow while readers are busy"""
+    if not SQLITE_PRODUCTION:
+        return
+    while True:
+        await asyncio.sleep(CHECKPOINT_SECONDS)
+        try:
+            busy, wal_pages, checkpointed = await checkpoint(async_engine)
+            logger.debug(f"WAL checkpoint: {checkpointed}/{wal_pages} pages (busy={busy})")
+        except Exception as e:
+            logger.error(f"Error checkpointing WAL: {e}")
+
+async def close_db():
+    """Checkpoint and truncate the WAL, then close every async connection"""
+    if SQLITE_PRODUCTION:
+        try:
+            await checkpoint(async_engine, "TRUNCATE")
+        except Exception as e:
+            logger.error(f"Error checkpointing WAL on shutdown: {e}")
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
 
 def init_db():
     """
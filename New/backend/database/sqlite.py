@@ -0,0 +1,147 @@
+# File: backend/database/sqlite.py
+"""
+Production storage profile for SQLite.
+
+- Every connection gets WAL journaling and tuned pragmas when it opens.
+  Readers then never wait for the writer, and commits skip the fsync
+  that rollback journaling needs.
+- Writes go through a single connection, so writers queue in the pool
+  instead of retrying on SQLITE_BUSY.
+- Reads use a pool of query-only connections.
+- `ReadWriteSession` sends each statement to the right engine.
+
+Connections are held per transaction, not per statement:
+- A session keeps its read connection from its first query until it
+  commits, rolls back or closes, which for a route's session is the end
+  of the request. The read pool keeps SQLITE_READ_POOL_SIZE connections
+  open and opens up to SQLITE_READ_POOL_OVERFLOW more under load; the
+  total should cover QA_MAX_IN_FLIGHT (api/admission.py) plus the other
+  routes running at once, or sessions wait up to SQLITE_POOL_TIMEOUT for a
+  connection. Code that reads and then awaits something slow should
+  commit first to hand its connection back (see get_current_user).
+- A transaction that has written holds the only writer until it commits,
+  and every other write in the process waits for it. Commit right after
+  writing; never await network calls or other slow work in between.
+- Only writes through these engines share the single writer. Synchronous
+  sessions (database.SessionLocal, used by scripts) open their own
+  connections and take SQLite's write lock directly, waiting up to
+  SQLITE_BUSY_TIMEOUT_MS for it.
+"""
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "16384"))             # Page cache per connection
+MMAP_BYTES = int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+READ_POOL_OVERFLOW = int(os.getenv("SQLITE_READ_POOL_OVERFLOW", "40"))  # QA_MAX_IN_FLIGHT plus headroom
+POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+CHECKPOINT_SECONDS = float(os.getenv("SQLITE_CHECKPOINT_SECONDS", "60"))
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """Pragmas run on each new connection"""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",  # Durable at checkpoints; safe from corruption in WAL mode
+        f"PRAGMA cache_size=-{CACHE_KB}",
+        f"PRAGMA mmap_size={MMAP_BYTES}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def install_pragmas(engine: Engine, read_only: bool = False) -> None:
+    """Run the profile's pragmas on every connection `engine` opens"""
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+class ReadWriteSession(Session):
+    """
+    Session that reads through the read pool and writes through the single
+    writer connection. Once a transaction has written, its remaining
+    statements also use the writer so they see their own changes.
+    """
+
+    def __init__(self, *args, writer: Engine, reader: Engine, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase) or self.info.get("writing"):
+            self.info["writing"] = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(ReadWriteSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    # The next transaction starts on the read pool again
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def create_sqlite_engines(async_url: str) -> Tuple[AsyncEngine, AsyncEngine, async_sessionmaker]:
+    """(writer, reader, session factory) for an aiosqlite URL"""
+    writer = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,  # One writer; other writes wait for it in the pool
+        pool_timeout=POOL_TIMEOUT
+    )
+    reader = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=READ_POOL_SIZE,
+        # Opened on demand and closed when returned; query-only connections are cheap
+        max_overflow=READ_POOL_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT
+    )
+    install_pragmas(writer.sync_engine)
+    install_pragmas(reader.sync_engine, read_only=True)
+
+    session_factory = async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=ReadWriteSession,
+        writer=writer.sync_engine,
+        reader=reader.sync_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+    return writer, reader, session_factory
+
+
+async def checkpoint(writer: AsyncEngine, mode: str = "PASSIVE") -> Optional[Tuple[int, int, int]]:
+    """
+    Copy committed WAL pages back into the database file. PASSIVE never
+    waits for readers; TRUNCATE (used at shutdown) also empties the WAL
+    file. Returns SQLite's (busy, wal pages, checkpointed pages).
+    """
+    async with writer.connect() as conn:
+        result = await conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")
+        row = result.first()
+    return tuple(row) if row is not None else None
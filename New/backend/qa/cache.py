@@ -0,0 +1,254 @@
+# File: backend/qa/cache.py
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from rag.lecture_versions import LectureVersions
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+class SemanticAnswerCache:
+    """
+    Cache of generated answers keyed on the question embedding.
+
+    A lookup returns a stored answer when a previous question's embedding is
+    within `similarity_threshold` (cosine) of the new one. Entries are evicted
+    least-recently-used once `max_entries` is reached, expire after
+    `ttl_seconds`, and are dropped as soon as any lecture they were built from
+    is re-ingested (tracked through `LectureVersions`). Entries are persisted
+    one row each in a SQLite file, with their last use, so the cache and its
+    LRU order survive restarts and each change writes only the rows it touches.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 500,
+        ttl_seconds: int = 24 * 3600,
+        lecture_versions: Optional[LectureVersions] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lecture_versions = lecture_versions or LectureVersions()
+
+        # key -> entry, ordered from least to most recently used
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # Normalized embedding matrix, rebuilt lazily after changes
+        self._keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                entry TEXT NOT NULL,
+                embedding BLOB,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        try:
+            rows = self._conn.execute(
+                "SELECT key, entry, embedding FROM answers ORDER BY last_used ASC"
+            ).fetchall()
+            for key, data, blob in rows:
+                entry = json.loads(data)
+                entry["embedding"] = np.frombuffer(blob, dtype=np.float32).tolist() if blob else None
+                self._entries[key] = entry
+            self._purge()
+            logger.info(f"Loaded {len(self._entries)} cached answers from {self.path}")
+        except (sqlite3.Error, ValueError, KeyError) as e:
+            logger.error(f"Error loading answer cache, starting empty: {str(e)}")
+            self._entries.clear()
+
+    def _write(self, sql: str, params: Iterable) -> None:
+        """Run one statement per parameter tuple in a single transaction"""
+        try:
+            with self._lock:
+                self._conn.executemany(sql, params)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error saving answer cache: {str(e)}")
+
+    def _save_entry(self, key: str) -> None:
+        entry = self._entries[key]
+        embedding = entry["embedding"]
+        data = {k: v for k, v in entry.items() if k != "embedding"}
+        self._write(
+            "INSERT OR REPLACE INTO answers (key, entry, embedding, last_used) VALUES (?, ?, ?, ?)",
+            [(
+                key,
+                json.dumps(data),
+                np.asarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None,
+                time.time()
+            )]
+        )
+
+    def _delete(self, keys: List[str]) -> None:
+        if keys:
+            self._write("DELETE FROM answers WHERE key = ?", [(key,) for key in keys])
+
+    # ------------------------------------------------------------------ #
+    # Eviction
+    # ------------------------------------------------------------------ #
+
+    def _is_valid(self, entry: Dict, now: float, versions: Dict[str, int]) -> bool:
+        if now - entry["created_at"] > self.ttl_seconds:
+            return False
+        return self.lecture_versions.is_current(entry["lecture_versions"], versions)
+
+    def _purge(self) -> None:
+        """Drop expired and invalidated entries"""
+        now = time.time()
+        versions = self.lecture_versions.current()
+        stale = [k for k, e in self._entries.items() if not self._is_valid(e, now, versions)]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._matrix = None
+            self._delete(stale)
+            logger.info(f"Evicted {len(stale)} stale cached answers")
+
+    def _evict_lru(self) -> None:
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            evicted.append(key)
+            self._matrix = None
+        self._delete(evicted)
+
+    # ------------------------------------------------------------------ #
+    # Lookup / insert
+    # ------------------------------------------------------------------ #
+
+    def _build_matrix(self) -> None:
+        self._keys = [k for k, e in self._entries.items() if e.get("embedding")]
+        if not self._keys:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            return
+        matrix = np.array([self._entries[k]["embedding"] for k in self._keys], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._matrix = matrix / np.maximum(norms, 1e-12)
+
+    def _touch(self, key: str) -> Dict:
+        entry = self._entries[key]
+        self._entries.move_to_end(key)
+        self._write("UPDATE answers SET last_used = ? WHERE key = ?", [(time.time(), key)])
+        self.hits += 1
+        return entry["result"]
+
+    def lookup_exact(self, question: str) -> Optional[Dict]:
+        """Return a cached result for the same normalized question text"""
+        normalized = normalize_question(question)
+        now = time.time()
+        versions = self.lecture_versions.current()
+        for key, entry in reversed(self._entries.items()):
+            if entry["normalized_question"] == normalized and self._is_valid(entry, now, versions):
+                logger.info("Answer cache hit (exact question match)")
+                return self._touch(key)
+        return None
+
+    def lookup(self, question: str, embedding: List[float]) -> Optional[Dict]:
+        """Return a cached result for a semantically equivalent question"""
+        self._purge()
+
+        if self._matrix is None:
+            self._build_matrix()
+
+        if self._matrix.shape[0] == 0:
+            self.misses += 1
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        scores = self._matrix @ query
+        best = int(np.argmax(scores))
+
+        if scores[best] < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        key = self._keys[best]
+        logger.info(
+            f"Answer cache hit (similarity {scores[best]:.3f}) for '{question}' "
+            f"-> '{self._entries[key]['question']}'"
+        )
+        return self._touch(key)
+
+    def put(
+        self,
+        question: str,
+        embedding: Optional[List[float]],
+        result: Dict,
+        lecture_ids: List,
+    ) -> None:
+        """Store a generated result along with the lectures it was built from"""
+        key = str(uuid.uuid4())
+        self._entries[key] = {
+            "key": key,
+            "question": question,
+            "normalized_question": normalize_question(question),
+            "embedding": list(map(float, embedding)) if embedding is not None else None,
+            "result": result,
+            "lecture_versions": self.lecture_versions.snapshot(lecture_ids),
+            "created_at": time.time(),
+        }
+        self._matrix = None
+        self._save_entry(key)
+        self._evict_lru()
+
+    def update_result(self, result: Dict, **changes) -> None:
+        """Update fields of a cached result in place (e.g. a regenerated audio_url)"""
+        result.update(changes)
+        for key, entry in self._entries.items():
+            if entry["result"] is result:
+                self._save_entry(key)
+                return
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._matrix = None
+        self._write("DELETE FROM answers", [()])
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
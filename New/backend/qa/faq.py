@@ -0,0 +1,189 @@
+# File: backend/qa/faq.py
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag.lexical import tokenize
+
+from .cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+
+class FAQTable:
+    """
+    Canned answers for common questions, loaded from a JSON data file.
+
+    The file lists intents, each with example questions and an answer:
+
+        {"intents": [{"id": "name", "questions": ["What is your name?"], "answer": "..."}]}
+
+    A question matches an intent when its normalized text equals one of
+    the examples. Failing that, it matches when its embedding is within
+    `similarity_threshold` (cosine) of one. The examples are embedded by
+    `embed_examples` when the table loads or reloads, and answer audio is
+    rendered ahead of time by `prerender`, so a hit needs no outbound calls;
+    answers added by a reload are rendered on their first hit. The file is
+    reloaded whenever it changes on disk.
+
+    `has_candidate` tells, without embedding, whether a question shares
+    enough terms with an example for a semantic match to be worth checking.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embeddings: Optional[Embeddings],
+        text_to_speech,
+        similarity_threshold: float = 0.92,
+        candidate_min_overlap: float = 0.5
+    ):
+        self.path = Path(path)
+        self.embeddings = embeddings
+        self.text_to_speech = text_to_speech
+        self.similarity_threshold = similarity_threshold
+        self.candidate_min_overlap = candidate_min_overlap
+        self._stamp: Optional[tuple] = None
+
+        self.intents: List[Dict] = []
+        self._exact: Dict[str, Dict] = {}
+        # Example questions, their content terms and their normalized embeddings;
+        # the embeddings are filled in by `embed_examples` after each (re)load
+        self._examples: List[tuple] = []
+        self._terms: List[set] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._embedding: Optional[asyncio.Task] = None
+        # Rendered audio URL per answer text; kept across reloads for unchanged answers
+        self._audio_urls: Dict[str, str] = {}
+        self._reload()
+
+    def _reload(self) -> None:
+        """Reload the table if the data file changed"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._stamp is not None:
+                logger.warning(f"FAQ file {self.path} was removed")
+            self.intents, self._exact, self._examples, self._terms, self._matrix, self._stamp = [], {}, [], [], None, None
+            return
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                intents = json.load(f)["intents"]
+            exact = {}
+            examples = []
+            for intent in intents:
+                for question in intent["questions"]:
+                    exact[normalize_question(question)] = intent
+                    examples.append((question, intent))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Keep serving the previous table until the file is fixed
+            logger.error(f"Error loading FAQ table: {str(e)}")
+            return
+
+        self.intents, self._exact, self._examples, self._matrix = intents, exact, examples, None
+        self._terms = [set(tokenize(question)) for question, _ in examples]
+        self._stamp = stamp
+        logger.info(f"Loaded {len(intents)} FAQ intents from {self.path}")
+
+        # Embed the new examples off the request path; at import there is no
+        # loop yet and startup calls `embed_examples` itself
+        try:
+            self._embedding = asyncio.get_running_loop().create_task(self.embed_examples())
+        except RuntimeError:
+            pass
+
+    async def embed_examples(self) -> None:
+        """Embed the example questions so semantic lookups only compare stored vectors"""
+        examples = self._examples
+        if not examples or self.embeddings is None or self._matrix is not None:
+            return
+        try:
+            # The embeddings are cached, so re-embedding after a reload only embeds new examples
+            vectors = await self.embeddings.aembed_documents([q for q, _ in examples])
+        except Exception as e:
+            logger.error(f"Error embedding FAQ examples: {str(e)}")
+            return
+        if examples is not self._examples:
+            # Reloaded meanwhile; the reload embeds its own examples
+            return
+        matrix = np.array(vectors, dtype=np.float32)
+        self._matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    async def _audio_url(self, answer: str) -> Optional[str]:
+        """URL of the rendered answer audio, rendering it if it is missing"""
+        url = self._audio_urls.get(answer)
+        if url and (self.text_to_speech.responses_dir / url.rsplit("/", 1)[-1]).exists():
+            return url
+        try:
+            audio_file = await self.text_to_speech.convert(answer)
+        except Exception as e:
+            logger.error(f"Error rendering FAQ audio: {str(e)}")
+            return None
+        url = f"/api/audio/responses/{audio_file.name}"
+        self._audio_urls[answer] = url
+        return url
+
+    async def _result(self, question: str, intent: Dict) -> Dict:
+        return {
+            "question": question,
+            "answer": intent["answer"],
+            "confidence_score": 1.0,
+            "sources": ["Predefined Response"],
+            "audio_url": await self._audio_url(intent["answer"]),
+        }
+
+    async def match_exact(self, question: str) -> Optional[Dict]:
+        """Result for a question whose normalized text is one of the examples"""
+        self._reload()
+        intent = self._exact.get(normalize_question(question))
+        if intent is None:
+            return None
+        logger.info(f"Matched FAQ intent '{intent.get('id')}' (exact)")
+        return await self._result(question, intent)
+
+    def has_candidate(self, question: str) -> bool:
+        """Whether the question contains most of the content terms of some example"""
+        self._reload()
+        terms = set(tokenize(question))
+        # Examples made only of stopwords ("Who are you?") are left to the exact match
+        return any(
+            example and len(terms & example) >= self.candidate_min_overlap * len(example)
+            for example in self._terms
+        )
+
+    async def match_similar(self, question: str, embedding: List[float]) -> Optional[Dict]:
+        """
+        Result for a question semantically equivalent to one of the examples.
+        Until the examples are embedded this matches nothing.
+        """
+        self._reload()
+        if self._matrix is None:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        scores = self._matrix @ (query / max(float(np.linalg.norm(query)), 1e-12))
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        example, intent = self._examples[best]
+        logger.info(f"Matched FAQ intent '{intent.get('id')}' (similarity {scores[best]:.3f} to '{example}')")
+        return await self._result(question, intent)
+
+    async def prerender(self) -> int:
+        """Render audio for every answer that doesn't have it yet; returns how many were rendered"""
+        self._reload()
+        before = set(self._audio_urls.values())
+        for answer in {intent["answer"] for intent in self.intents}:
+            await self._audio_url(answer)
+        return len(set(self._audio_urls.values()) - before)
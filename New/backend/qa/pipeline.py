@@ -1,15 +1,23 @@
 # File: backend/qa/pipeline.py
-from typing import Dict, Optional, List, Tuple
+from typing import AsyncIterator, Dict, Optional, List, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from app import metrics
 from app.config import settings
 from rag.processor import RAGProcessor
 from audio.text_to_speech import TextToSpeech
+from audio.sentences import SentenceSegmenter, CODE_PLACEHOLDER
 from pathlib import Path
+import asyncio
 import logging
 import os
 import re
+import time
 from .prompts import ANSWER_TEMPLATE
+from .cache import SemanticAnswerCache
+from .faq import FAQTable
+from .speculation import SpeculativeRetrieval, transcribe_speculatively
+from rag.dedup import source_references
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -41,6 +49,28 @@ class QAPipeline:
                 streaming=True
             )
 
+            # Canned answers with pre-rendered audio, reloaded when the file changes
+            self.faq = None
+            if settings.FAQ_ENABLED:
+                self.faq = FAQTable(
+                    settings.FAQ_PATH,
+                    self.rag_processor.embeddings,
+                    self.text_to_speech,
+                    similarity_threshold=settings.FAQ_SIMILARITY_THRESHOLD,
+                    candidate_min_overlap=settings.FAQ_CANDIDATE_MIN_OVERLAP
+                )
+
+            # Semantic cache of previously generated answers
+            self.answer_cache = None
+            if settings.ANSWER_CACHE_ENABLED:
+                self.answer_cache = SemanticAnswerCache(
+                    path=os.path.join(settings.CACHE_DIR, "answer_cache.db"),
+                    similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+                    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+                    lecture_versions=self.rag_processor.lecture_versions
+                )
+
             logger.info("QA Pipeline initialized successfully")
             
         except Exception as e:
@@ -61,87 +91,161 @@ class QAPipeline:
         # Replace code blocks with a placeholder for speech
         speech_text = re.sub(
             pattern, 
-            "I've included a code example in my response which you can see below.", 
+            CODE_PLACEHOLDER,
             text, 
             flags=re.DOTALL
         )
         
         return speech_text, code_blocks
 
-    async def get_answer(self, question: str) -> Dict:
-        """Process question and generate answer using predefined responses, RAG, and OpenAI."""
-        logger.info(f"Processing question: {question}")
+    async def _answer_from_cache(self, question: str, cached: Dict) -> Dict:
+        """Build a response from a cached result, regenerating audio if it was cleaned up"""
+        audio_url = cached.get("audio_url")
+        audio_name = audio_url.rsplit("/", 1)[-1] if audio_url else None
 
-        try:
-            # ✅ Step 1: Check for predefined responses
-            predefined_responses = {
-                "what is your name?": "I am the virtual model of Dr. Terry Soule, a Professor of Computer Science at the University of Idaho, where I also hold adjunct positions in Neuroscience and in Bioinformatics and Computational Biology. While my 3D visual model is still in development, I'm here to assist you verbally with computer science-related topics.",
-                "what do you do?": "I am the virtual model of Dr. Terry Soule, here to assist you with computer science-related topics. My 3D visual model is in progress, but right now, I am here to help you verbally.",
-                "tell me about yourself?": "I am the virtual model of Dr. Terry Soule, here to assist you with computer science-related topics. My 3D visual model is in progress, but right now, I am here to help you verbally."
-            }
+        if not audio_name or not (self.text_to_speech.responses_dir / audio_name).exists():
+            speech_text, _ = self._extract_code_blocks(cached["answer"])
+            try:
+                audio_file = await self.text_to_speech.convert(speech_text)
+                audio_url = f"/api/audio/responses/{audio_file.name}"
+                self.answer_cache.update_result(cached, audio_url=audio_url)
+            except Exception as audio_error:
+                logger.error(f"Error regenerating audio for cached answer: {audio_error}")
+                audio_url = None
 
-            # 🔑 Normalize question for comparison (lowercase, trimmed)
-            normalized_question = question.lower().strip()
-
-            # 👉 If the question matches, return the predefined response immediately
-            for key, response in predefined_responses.items():
-                if key in normalized_question:
-                    logger.info(f"Matched predefined question: '{key}'")
-
-                    # 🎙️ Convert custom answer to speech
-                    try:
-                        audio_file = await self.text_to_speech.convert(response)
-                        audio_url = f"/api/audio/responses/{audio_file.name}"
-                        logger.info(f"Generated custom audio response: {audio_url}")
-                    except Exception as audio_error:
-                        logger.error(f"Error generating audio for custom response: {audio_error}")
-                        audio_url = None
-
-                    # 🚀 Return custom response
-                    return {
-                        "question": question,
-                        "answer": response,
-                        "confidence_score": 1.0,
-                        "sources": ["Predefined Response"],
-                        "audio_url": audio_url
-                    }
-
-            # 🟢 Step 2: Proceed with RAG if not a custom question
-            context_docs = await self.rag_processor.find_relevant_context(question)
-            
-            if not context_docs:
-                logger.warning("No relevant context found in knowledge base")
-                return {
-                    "question": question,
-                    "answer": "I don't have enough information in my knowledge base to answer this question. Please make sure your question is related to Computer Science, as that's my area of expertise.",
-                    "confidence_score": 0.0,
-                    "sources": [],
-                    "audio_url": None
-                }
+        return {**cached, "question": question, "audio_url": audio_url}
 
-            # Join context
-            context = "\n".join([doc["content"] for doc in context_docs])
-            
-            # Use the updated system message from prompts.py
-            system_message = """You are a helpful Computer Science teaching assistant named Dr. Terry Soule. 
+    async def _prepare(
+        self,
+        question: str,
+        speculation: Optional[SpeculativeRetrieval] = None
+    ) -> Tuple[Optional[Dict], List[Dict], Optional[List[float]]]:
+        """
+        Run everything that comes before the LLM call.
+
+        Returns (result, context_docs, query_embedding). `result` is set when
+        the question is answered without generation (predefined or cached
+        answer, or no relevant context). A `speculation` started from a draft
+        transcript of the same question is reused instead.
+        """
+        if speculation is not None:
+            prepared = await speculation.take(question)
+            if prepared is not None:
+                return prepared
+
+        # ✅ Step 1: Check the FAQ table for the same question text
+        if self.faq is not None:
+            faq_result = await self.faq.match_exact(question)
+            if faq_result is not None:
+                metrics.cache_lookup("faq", True)
+                return faq_result, [], None
+
+        # 🟢 Step 2: Check the answer cache for the same question text
+        query_embedding = None
+        if self.answer_cache is not None:
+            cached = self.answer_cache.lookup_exact(question)
+            if cached is not None:
+                metrics.cache_lookup("answer", True)
+                return await self._answer_from_cache(question, cached), [], None
+
+        # 🟢 Step 3: Questions naming exact terms are served from the lexical index
+        # without vector search
+        context_docs = self.rag_processor.lexical_shortcut(question)
+
+        # 🟢 Step 4: Embed the question unless the shortcut took it and no FAQ
+        # example shares its terms, then check for a paraphrase of a predefined
+        # question (these take precedence over any retrieval) and the semantic
+        # answer cache
+        if context_docs is None or (self.faq is not None and self.faq.has_candidate(question)):
+            query_embedding = await self.rag_processor.embed_query(question)
+            if self.faq is not None:
+                faq_result = await self.faq.match_similar(question, query_embedding)
+                if faq_result is not None:
+                    metrics.cache_lookup("faq", True)
+                    return faq_result, [], None
+                metrics.cache_lookup("faq", False)
+            if self.answer_cache is not None:
+                cached = self.answer_cache.lookup(question, query_embedding)
+                if cached is not None:
+                    metrics.cache_lookup("answer", True)
+                    return await self._answer_from_cache(question, cached), [], None
+                # Only counted once both answer cache lookups ran; shortcut
+                # questions without a FAQ candidate skip the semantic one
+                metrics.cache_lookup("answer", False)
+
+        if context_docs is None:
+            context_docs = await self.rag_processor.find_relevant_context(
+                question,
+                query_embedding=query_embedding
+            )
+
+        if not context_docs:
+            logger.warning("No relevant context found in knowledge base")
+            return {
+                "question": question,
+                "answer": "I don't have enough information in my knowledge base to answer this question. Please make sure your question is related to Computer Science, as that's my area of expertise.",
+                "confidence_score": 0.0,
+                "sources": [],
+                "audio_url": None
+            }, [], None
+
+        return None, context_docs, query_embedding
+
+    def _build_messages(self, question: str, context_docs: List[Dict]) -> list:
+        """Prompt messages for answering `question` from the retrieved context"""
+        # Join context
+        context = "\n".join([doc["content"] for doc in context_docs])
+
+        # Use the updated system message from prompts.py
+        system_message = """You are a helpful Computer Science teaching assistant named Dr. Terry Soule. 
 ONLY answer questions related to Computer Science. If the question is about another field or topic that is not related to Computer Science, politely decline to answer.
 When providing code examples, focus on EXPLAINING the purpose and logic rather than just showing code. Break down complex code into understandable components and emphasize the thought process rather than syntax.
 Avoid presenting large blocks of code without explanation and explain code in natural language that doesn't "sound like code".
 When including code samples, use triple backticks and specify the language (e.g. ```java)."""
-            
-            # Create messages using LangChain schema
-            messages = [
-                SystemMessage(content=system_message),
-                HumanMessage(content=f"Using this context:\n{context}\n\nAnswer this question: {question}")
-            ]
 
-            # Generate LLM response
-            response = await self.llm.agenerate([messages])
-            answer = response.generations[0][0].text
-            
+        # Create messages using LangChain schema
+        return [
+            SystemMessage(content=system_message),
+            HumanMessage(content=f"Using this context:\n{context}\n\nAnswer this question: {question}")
+        ]
+
+    async def _generate(self, question: str, context_docs: List[Dict]) -> AsyncIterator[str]:
+        """Stream the LLM answer, recording time to first token, total time and token count"""
+        started = time.perf_counter()
+        tokens = 0
+        async for chunk in self.llm.astream(self._build_messages(question, context_docs)):
+            if not chunk.content:
+                continue
+            if not tokens:
+                metrics.LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started)
+            # OpenAI streams one token per chunk
+            tokens += 1
+            yield chunk.content
+        metrics.LLM_SECONDS.observe(time.perf_counter() - started)
+        metrics.LLM_COMPLETION_TOKENS.observe(tokens)
+
+    def _sources(self, context_docs: List[Dict]) -> List[str]:
+        """Sources of the retrieved chunks, including lectures near-duplicates were collapsed from"""
+        return [source for doc in context_docs for _, source in source_references(doc["metadata"])]
+
+    async def _finish_answer(
+        self,
+        question: str,
+        answer: str,
+        context_docs: List[Dict],
+        query_embedding: Optional[List[float]],
+        audio_segments: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Generate audio for a completed answer, build the result and cache it.
+        When the answer was already spoken sentence by sentence,
+        `audio_segments` holds those URLs and no full-answer audio is made.
+        """
+        audio_url = None
+        if audio_segments is None:
             # Extract code blocks and prepare speech-friendly version
             speech_text, code_blocks = self._extract_code_blocks(answer)
-            
+
             # Generate audio for the speech-friendly version (without code blocks)
             try:
                 audio_file = await self.text_to_speech.convert(speech_text)
@@ -149,19 +253,60 @@ When including code samples, use triple backticks and specify the language (e.g.
                 logger.info(f"Generated audio response: {audio_file}")
             except Exception as audio_error:
                 logger.error(f"Error generating audio: {audio_error}")
-                audio_url = None
 
-            # Prepare final result - use the original answer with code blocks
-            result = {
-                "question": question,
-                "answer": answer,  # Keep code blocks in the text response
-                "sources": [doc["metadata"].get("source", "unknown") for doc in context_docs],
-                "confidence_score": self._calculate_confidence(context_docs, answer),
-                "audio_url": audio_url  # Audio URL for the speech-friendly version
-            }
-            
-            logger.info(f"Successfully generated answer with audio URL: {audio_url}")
-            return result
+        # Prepare final result - use the original answer with code blocks
+        result = {
+            "question": question,
+            "answer": answer,  # Keep code blocks in the text response
+            "sources": self._sources(context_docs),
+            "confidence_score": self._calculate_confidence(context_docs, answer),
+            "audio_url": audio_url  # Audio URL for the speech-friendly version
+        }
+        if audio_segments is not None:
+            result["audio_segments"] = audio_segments
+
+        # Cache the answer against the lectures it was built from
+        if self.answer_cache is not None:
+            lecture_ids = {i for doc in context_docs for i, _ in source_references(doc["metadata"])}
+            self.answer_cache.put(
+                question,
+                query_embedding,
+                dict(result),
+                [i for i in lecture_ids if i is not None]
+            )
+
+        logger.info(f"Successfully generated answer with audio URL: {audio_url or audio_segments}")
+        return result
+
+    async def transcribe_question(self, speech_to_text, data: bytes) -> Tuple[str, Optional[SpeculativeRetrieval]]:
+        """
+        Transcribe a recorded question. Retrieval may already be under way
+        from a confident draft transcript; pass the returned speculation to
+        `get_answer` or `stream_answer` to use it.
+        """
+        if not settings.STT_SPECULATIVE_RETRIEVAL:
+            return await speech_to_text.convert_bytes(data), None
+        return await transcribe_speculatively(
+            speech_to_text,
+            data,
+            self._prepare,
+            settings.STT_DRAFT_MIN_CONFIDENCE
+        )
+
+    @metrics.timed(metrics.ANSWER_SECONDS)
+    async def get_answer(self, question: str, speculation: Optional[SpeculativeRetrieval] = None) -> Dict:
+        """Process question and generate answer using predefined responses, RAG, and OpenAI."""
+        logger.info(f"Processing question: {question}")
+
+        try:
+            result, context_docs, query_embedding = await self._prepare(question, speculation)
+            if result is not None:
+                return result
+
+            # Generate LLM response
+            answer = "".join([part async for part in self._generate(question, context_docs)])
+
+            return await self._finish_answer(question, answer, context_docs, query_embedding)
 
         except Exception as e:
             logger.error(f"Error in get_answer: {str(e)}", exc_info=True)
@@ -173,6 +318,117 @@ When including code samples, use triple backticks and specify the language (e.g.
                 "audio_url": None
             }
 
+    async def _speak_sentence(self, sentence: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """
+        Audio URL for one sentence of a streamed answer, or None if TTS
+        failed. `semaphore` belongs to the answer, bounding its own TTS calls.
+        """
+        async with semaphore:
+            try:
+                audio_file = await self.text_to_speech.convert(sentence)
+                return f"/api/audio/responses/{audio_file.name}"
+            except Exception as audio_error:
+                logger.error(f"Error generating sentence audio: {audio_error}")
+                return None
+
+    async def stream_answer(
+        self,
+        question: str,
+        speculation: Optional[SpeculativeRetrieval] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Answer a question as a stream of (event, data) pairs:
+        "sources" once, "token" for each piece of the answer as the LLM
+        produces it, then "done" with the confidence score and audio URL
+        (or "error" if something failed).
+
+        With TTS_PIPELINED, finished sentences are sent to TTS while the rest
+        of the answer generates, and an "audio" event with the segment's
+        index and URL follows (in order) as each one is ready. "done" then
+        lists all segment URLs instead of a single audio URL.
+        """
+        logger.info(f"Streaming answer to question: {question}")
+        started = time.perf_counter()
+        segmenter = SentenceSegmenter() if settings.TTS_PIPELINED else None
+        # Per answer: concurrent answers don't wait on each other's sentences
+        tts_semaphore = asyncio.Semaphore(settings.TTS_PIPELINE_CONCURRENCY)
+        segments: List[asyncio.Task] = []
+        segment_urls: List[str] = []
+
+        def log_latency(name: str):
+            logger.info(f"Time to first {name}: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        def audio_event(index: int) -> Tuple[str, Dict]:
+            url = segments[index].result()
+            if url is not None:
+                if not segment_urls:
+                    log_latency("audio")
+                segment_urls.append(url)
+            return "audio", {"index": index, "url": url}
+
+        try:
+            result, context_docs, query_embedding = await self._prepare(question, speculation)
+            if result is not None:
+                yield "sources", {"sources": result.get("sources", [])}
+                log_latency("token")
+                yield "token", {"text": result["answer"]}
+                yield "done", {
+                    "confidence_score": result.get("confidence_score", 0.0),
+                    "audio_url": result.get("audio_url")
+                }
+                metrics.ANSWER_SECONDS.observe(time.perf_counter() - started)
+                return
+
+            yield "sources", {"sources": self._sources(context_docs)}
+
+            parts = []
+            next_segment = 0
+            async for text in self._generate(question, context_docs):
+                if not parts:
+                    log_latency("token")
+                parts.append(text)
+                yield "token", {"text": text}
+
+                if segmenter is not None:
+                    for sentence in segmenter.feed(text):
+                        segments.append(asyncio.create_task(self._speak_sentence(sentence, tts_semaphore)))
+                    # Send finished segments in order without waiting on the others
+                    while next_segment < len(segments) and segments[next_segment].done():
+                        yield audio_event(next_segment)
+                        next_segment += 1
+
+            if segmenter is not None:
+                for sentence in segmenter.flush():
+                    segments.append(asyncio.create_task(self._speak_sentence(sentence, tts_semaphore)))
+                for index in range(next_segment, len(segments)):
+                    await segments[index]
+                    yield audio_event(index)
+
+            result = await self._finish_answer(
+                question,
+                "".join(parts),
+                context_docs,
+                query_embedding,
+                audio_segments=segment_urls if segmenter is not None else None
+            )
+            metrics.ANSWER_SECONDS.observe(time.perf_counter() - started)
+            logger.info(f"Streamed answer in {(time.perf_counter() - started) * 1000:.0f} ms")
+            yield "done", {
+                "confidence_score": result["confidence_score"],
+                "audio_url": result["audio_url"],
+                "audio_segments": result.get("audio_segments")
+            }
+
+        except Exception as e:
+            logger.error(f"Error in stream_answer: {str(e)}", exc_info=True)
+            yield "error", {
+                "message": "I encountered an error while processing your question. Please try again with a Computer Science related question."
+            }
+        finally:
+            # The client may have disconnected mid-answer
+            for task in segments:
+                task.cancel()
+
     def _calculate_confidence(self, context_docs: list, answer: str) -> float:
         """Calculate a confidence score based on context and answer."""
         if not context_docs:
@@ -0,0 +1,95 @@
+# File: backend/qa/speculation.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from audio.speech_to_text import SpeechToText
+from .cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+Prepared = Tuple[Optional[Dict], List[Dict], Optional[List[float]]]
+
+
+def _ignore_result(task: asyncio.Task) -> None:
+    # Retrieve the outcome of abandoned tasks so asyncio doesn't log it as lost
+    if not task.cancelled():
+        task.exception()
+
+
+class SpeculativeRetrieval:
+    """
+    Retrieval started from a draft transcript while the final transcript is
+    still being decoded.
+
+    `prepare` (the pipeline's pre-generation step) runs on the draft right
+    away. If the final transcript is the same question after normalization,
+    `take` returns that work. Otherwise the speculative task is cancelled and
+    the caller retrieves again from the final text.
+    """
+
+    def __init__(self, draft: str, prepare: Callable[[str], Awaitable[Prepared]]):
+        self.draft = draft
+        self._task = asyncio.create_task(prepare(draft))
+        self._task.add_done_callback(_ignore_result)
+
+    async def take(self, question: str) -> Optional[Prepared]:
+        """The prepared result for `question`, or None if the draft was a different question"""
+        if normalize_question(question) != normalize_question(self.draft):
+            logger.info(f"Draft transcript '{self.draft}' differs from final, discarding speculative retrieval")
+            self.cancel()
+            return None
+        try:
+            result, context_docs, query_embedding = await self._task
+        except Exception as e:
+            logger.error(f"Error in speculative retrieval: {str(e)}")
+            return None
+        if result is not None:
+            result = {**result, "question": question}
+        logger.info("Using retrieval started from the draft transcript")
+        return result, context_docs, query_embedding
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+
+async def transcribe_speculatively(
+    speech_to_text: SpeechToText,
+    data: bytes,
+    prepare: Callable[[str], Awaitable[Prepared]],
+    min_confidence: float
+) -> Tuple[str, Optional[SpeculativeRetrieval]]:
+    """
+    Transcribe a recorded question, starting retrieval early when possible.
+
+    The final beam-search transcription and a greedy draft run side by side
+    in the worker pool. When the draft finishes first with at least
+    `min_confidence`, retrieval starts on it while the final transcript is
+    still decoding. Drafts are best effort: they are skipped when the pool
+    has no second idle worker.
+    """
+    pool = speech_to_text.pool
+    speculate = pool.idle_workers >= 2
+    final = asyncio.create_task(speech_to_text.convert_bytes(data))
+    if not speculate:
+        return await final, None
+
+    draft = asyncio.create_task(pool.transcribe_draft(data))
+    draft.add_done_callback(_ignore_result)
+    await asyncio.wait({final, draft}, return_when=asyncio.FIRST_COMPLETED)
+
+    speculation = None
+    if draft.done() and not final.done() and draft.exception() is None:
+        text, confidence = draft.result()
+        if text.strip() and confidence >= min_confidence:
+            logger.info(f"Speculating on draft transcript (confidence {confidence:.2f}): {text[:50]}...")
+            speculation = SpeculativeRetrieval(text, prepare)
+        else:
+            logger.info(f"Draft transcript not confident enough to speculate ({confidence:.2f})")
+
+    try:
+        return await final, speculation
+    except Exception:
+        if speculation is not None:
+            speculation.cancel()
+        raise
@@ -0,0 +1,96 @@
+# File: backend/rag/batch_embedder.py
+import asyncio
+import logging
+import random
+import time
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 / rate-limit errors from the OpenAI client"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(error).__name__ == "RateLimitError"
+
+
+class AsyncBatchEmbedder:
+    """
+    Embeds large numbers of chunks with batched async requests.
+
+    At most `max_concurrency` batches are in flight at once. Batches that hit
+    a rate limit (429) are retried with exponential backoff and jitter. When
+    the embeddings are a `CachedEmbeddings`, cached chunks are served locally
+    and only the misses are sent to the API.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        self.cache = embeddings if hasattr(embeddings, "get_cached") else None
+        self.embeddings = self.cache.underlying if self.cache else embeddings
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Counters for throughput reporting
+        self.api_calls = 0
+        self.embedded = 0
+        self.cache_hits = 0
+        self.rate_limited = 0
+        self.api_seconds = 0.0
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    vectors = await self.embeddings.aembed_documents(texts)
+                    self.api_calls += 1
+                    self.embedded += len(texts)
+                    return vectors
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+                    self.rate_limited += 1
+                finally:
+                    self.api_seconds += time.perf_counter() - start
+
+            # Back off outside the semaphore so other batches can proceed
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            logger.warning(f"Rate limited, retrying batch of {len(texts)} in {delay:.1f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, preserving order"""
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        if self.cache is not None:
+            vectors = self.cache.get_cached(texts)
+            self.cache_hits += sum(1 for v in vectors if v is not None)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        results = await asyncio.gather(*(self._embed_batch([texts[i] for i in batch]) for batch in batches))
+
+        for batch, batch_vectors in zip(batches, results):
+            for i, vector in zip(batch, batch_vectors):
+                vectors[i] = vector
+            if self.cache is not None:
+                self.cache.put([texts[i] for i in batch], batch_vectors)
+        return vectors
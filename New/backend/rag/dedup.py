@@ -0,0 +1,157 @@
+# File: backend/rag/dedup.py
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = 5) -> List[str]:
+    """Overlapping word n-grams of the normalized text"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def source_references(metadata: Dict) -> List[Tuple[int, str]]:
+    """(lecture_id, source) for a chunk and every near-duplicate collapsed into it"""
+    refs = [(metadata.get("lecture_id"), metadata.get("source", "unknown"))]
+    lecture_ids = [i for i in str(metadata.get("duplicate_lecture_ids", "")).split(",") if i]
+    sources = [s for s in str(metadata.get("duplicate_sources", "")).split(",") if s]
+    refs.extend((int(i), s) for i, s in zip(lecture_ids, sources))
+    return refs
+
+
+@dataclass
+class DedupReport:
+    chunks_in: int = 0
+    chunks_out: int = 0
+    clusters: int = 0
+
+    @property
+    def removed(self) -> int:
+        return self.chunks_in - self.chunks_out
+
+    def __str__(self) -> str:
+        saved = 100.0 * self.removed / self.chunks_in if self.chunks_in else 0.0
+        return (
+            f"{self.chunks_in} chunks -> {self.chunks_out} stored "
+            f"({self.removed} near-duplicates in {self.clusters} clusters, index {saved:.1f}% smaller)"
+        )
+
+
+class ChunkDeduplicator:
+    """
+    Collapses near-duplicate chunks using MinHash signatures and LSH banding.
+
+    Chunks whose estimated Jaccard similarity (over word 5-gram shingles) is at
+    least `threshold` are merged into the first chunk of their cluster. That
+    canonical chunk keeps its own metadata and lists the other lectures it
+    stands in for in `duplicate_lecture_ids` / `duplicate_sources`
+    (comma-separated, so they fit Chroma's scalar metadata).
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        grams = shingles(text)
+        if not grams:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams],
+            dtype=np.uint64
+        )
+        # Overflow wraps modulo 2**64, which is fine for hashing purposes
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def session(self) -> "DedupSession":
+        """Start an incremental deduplication pass (e.g. over a streamed ingest)"""
+        return DedupSession(self)
+
+    def deduplicate(self, chunks: List[Dict]) -> Tuple[List[Dict], DedupReport]:
+        """Return the chunks to store (input order preserved) and a report"""
+        session = self.session()
+        kept = session.add(chunks)
+        if session.report.removed:
+            logger.info(f"Deduplication: {session.report}")
+        return kept, session.report
+
+
+class DedupSession:
+    """
+    One deduplication pass. `add` can be called repeatedly; each call returns
+    the chunks that are new canonicals. Duplicates found later are recorded on
+    the metadata of the canonical chunk objects returned earlier, so those
+    must not be written anywhere until the pass is finished.
+    """
+
+    def __init__(self, deduplicator: ChunkDeduplicator):
+        self.deduplicator = deduplicator
+        self.report = DedupReport()
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+        self._canonicals: List[Dict] = []
+
+    def _band_keys(self, sig: np.ndarray):
+        rows = self.deduplicator.rows
+        for band in range(self.deduplicator.bands):
+            yield band, sig[band * rows:(band + 1) * rows].tobytes()
+
+    def _find_match(self, sig: np.ndarray):
+        for key in self._band_keys(sig):
+            for candidate in self._buckets.get(key, []):
+                if float(np.mean(self._signatures[candidate] == sig)) >= self.deduplicator.threshold:
+                    return candidate
+        return None
+
+    def add(self, chunks: List[Dict]) -> List[Dict]:
+        kept = []
+        for chunk in chunks:
+            self.report.chunks_in += 1
+            sig = self.deduplicator.signature(chunk["text"])
+            match = self._find_match(sig)
+
+            if match is None:
+                canonical = {**chunk, "metadata": dict(chunk["metadata"])}
+                index = len(self._canonicals)
+                self._canonicals.append(canonical)
+                self._signatures.append(sig)
+                for key in self._band_keys(sig):
+                    self._buckets.setdefault(key, []).append(index)
+                kept.append(canonical)
+                self.report.chunks_out += 1
+                continue
+
+            # Record the duplicate's lecture on the canonical chunk
+            metadata = self._canonicals[match]["metadata"]
+            other = chunk["metadata"]
+            refs = source_references(metadata)
+            ref = (other.get("lecture_id"), other.get("source", "unknown"))
+            if "duplicate_count" not in metadata:
+                self.report.clusters += 1
+            metadata["duplicate_count"] = metadata.get("duplicate_count", 0) + 1
+            if ref not in refs:
+                refs.append(ref)
+                metadata["duplicate_lecture_ids"] = ",".join(str(r[0]) for r in refs[1:])
+                metadata["duplicate_sources"] = ",".join(r[1] for r in refs[1:])
+        return kept
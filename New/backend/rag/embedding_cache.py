@@ -0,0 +1,160 @@
+# File: backend/rag/embedding_cache.py
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed, persistent cache in front of an embeddings model.
+
+    Document vectors are stored in a SQLite file keyed by a hash of
+    (model name, chunk text), so re-ingesting unchanged lecture chunks reuses
+    the stored vectors instead of calling the embeddings API. The cache is
+    bounded to `max_entries` rows; the least recently used rows are evicted
+    first. Query embeddings are passed straight through.
+    """
+
+    def __init__(self, underlying: Embeddings, path: str, max_entries: int = 100_000):
+        self.underlying = underlying
+        self.model_name = getattr(underlying, "model", None) or type(underlying).__name__
+        self.max_entries = max_entries
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given keys and mark them as used"""
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def _put_many(self, items: Dict[str, List[float]]) -> None:
+        """Store new vectors and evict the least recently used rows over the limit"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                [
+                    (key, self.model_name, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ]
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                logger.info(f"Evicted {count - self.max_entries} embeddings from cache")
+            self._conn.commit()
+
+    def _split(self, texts: List[str]):
+        """Return (keys, cached vectors, texts still needing an embedding)"""
+        keys = [self._key(text) for text in texts]
+        cached = self._get_many(keys)
+        missing_texts = [t for t, k in zip(texts, keys) if k not in cached]
+        self.misses += len(missing_texts)
+        self.hits += len(texts) - len(missing_texts)
+        return keys, cached, list(dict.fromkeys(missing_texts))
+
+    def _merge(self, keys: List[str], cached: Dict[str, List[float]], missing: List[str],
+               new_vectors: List[List[float]]) -> List[List[float]]:
+        fresh = {self._key(text): vector for text, vector in zip(missing, new_vectors)}
+        self._put_many(fresh)
+        cached.update(fresh)
+        if missing:
+            logger.info(f"Embedded {len(missing)} new chunks ({len(keys) - len(missing)} served from cache)")
+        return [cached[key] for key in keys]
+
+    def get_cached(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for `texts`, None where a text still needs embedding"""
+        keys = [self._key(text) for text in texts]
+        cached = self._get_many(keys)
+        vectors = [cached.get(key) for key in keys]
+        missing = sum(1 for vector in vectors if vector is None)
+        self.misses += missing
+        self.hits += len(texts) - missing
+        return vectors
+
+    def put(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Store vectors that were embedded outside of this wrapper"""
+        self._put_many({self._key(text): vector for text, vector in zip(texts, vectors)})
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split(texts)
+        new_vectors = self.underlying.embed_documents(missing) if missing else []
+        return self._merge(keys, cached, missing, new_vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split(texts)
+        new_vectors = await self.underlying.aembed_documents(missing) if missing else []
+        return self._merge(keys, cached, missing, new_vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.underlying.aembed_query(text)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,193 @@
+# File: backend/rag/indexer.py
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from database.models.lecture import Lecture
+from rag.processor import RAGProcessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexReport:
+    """Summary of what an indexing run changed"""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    chunks_upserted: int = 0
+    chunks_deleted: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.updated)} updated, "
+            f"{len(self.removed)} removed, {len(self.unchanged)} unchanged; "
+            f"{self.chunks_upserted} chunks upserted, {self.chunks_deleted} chunks deleted"
+        )
+
+
+class LectureIndexer:
+    """
+    Incremental, idempotent indexer for the lecture files in `data/lectures`.
+
+    A JSON manifest records, per lecture file, its lecture id, the hash of the
+    indexed content and the hash of every stored chunk (keyed by the
+    deterministic chunk id from `RAGProcessor.chunk_lecture`). Each run diffs
+    the directory against the manifest and only touches what changed:
+
+    - new or modified files upsert the chunks that are new and delete the
+      chunks that disappeared;
+    - files that are gone have all their chunks deleted by `lecture_id`;
+    - the `lectures` table is updated in a single transaction.
+
+    Running it twice on an unchanged tree writes nothing.
+    """
+
+    def __init__(self, processor: RAGProcessor, manifest_path: Optional[str] = None):
+        self.processor = processor
+        self.manifest_path = Path(
+            manifest_path or os.path.join(
+                settings.VECTOR_STORE_PATH,
+                f"lecture_manifest.{settings.VECTOR_STORE_BACKEND}.json"
+            )
+        )
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"lectures": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self) -> None:
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def is_unchanged(self, filename: str, content_hash: str) -> bool:
+        entry = self.manifest["lectures"].get(filename)
+        return bool(entry) and entry["content_hash"] == content_hash
+
+    def record(self, filename: str, lecture_id: int, content_hash: str, chunks: List[Dict]) -> None:
+        """Record a lecture indexed outside index_directory (call save() afterwards)"""
+        self.manifest["lectures"][filename] = {
+            "lecture_id": lecture_id,
+            "content_hash": content_hash,
+            "chunks": {chunk["id"]: chunk["hash"] for chunk in chunks},
+        }
+
+    def save(self) -> None:
+        self._save_manifest()
+
+    def get_or_create_lecture(self, db: Session, filename: str, lecture_id: Optional[int], content: str) -> Lecture:
+        """Find the lecture row for a file, creating it if needed (flushed, not committed)"""
+        lecture = None
+        if lecture_id is not None:
+            lecture = db.query(Lecture).filter(Lecture.id == lecture_id).first()
+        if lecture is None:
+            lecture = db.query(Lecture).filter(Lecture.title == filename).first()
+
+        if lecture is None:
+            lecture = Lecture(title=filename, content=content)
+            db.add(lecture)
+            db.flush()
+        elif lecture.content != content:
+            lecture.content = content
+        return lecture
+
+    def index_directory(
+        self,
+        lectures_dir: Path,
+        db: Session,
+        prepare: Optional[Callable[[str, str], str]] = None
+    ) -> IndexReport:
+        """
+        Bring the vector store and `lectures` table in line with `lectures_dir`.
+
+        `prepare(filename, content)` may rewrite the text that gets indexed;
+        the raw file content is what is stored in the database.
+        """
+        report = IndexReport()
+        entries = self.manifest["lectures"]
+        files = {path.name: path for path in sorted(Path(lectures_dir).glob("*.txt"))}
+
+        try:
+            for filename, path in files.items():
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                indexed_content = prepare(filename, content) if prepare else content
+                content_hash = self.content_hash(indexed_content)
+
+                entry = entries.get(filename)
+                if entry and entry["content_hash"] == content_hash:
+                    report.unchanged.append(filename)
+                    continue
+
+                lecture = self.get_or_create_lecture(db, filename, entry and entry["lecture_id"], content)
+                chunks = self.processor.chunk_lecture(lecture.id, indexed_content, title=filename)
+                new_chunks = {chunk["id"]: chunk for chunk in chunks}
+
+                if entry and entry["lecture_id"] == lecture.id:
+                    old_ids = set(entry["chunks"])
+                    stale_ids = sorted(old_ids - set(new_chunks))
+                    self.processor.delete_chunks(lecture.id, stale_ids)
+                    to_upsert = [c for cid, c in new_chunks.items() if cid not in old_ids]
+                    report.chunks_deleted += len(stale_ids)
+                    report.updated.append(filename)
+                else:
+                    # Not tracked yet (or its row was recreated): clear anything
+                    # previously stored under either id
+                    if entry:
+                        self.processor.delete_lecture(entry["lecture_id"])
+                    self.processor.delete_lecture(lecture.id)
+                    to_upsert = chunks
+                    report.added.append(filename)
+
+                self.processor.upsert_chunks(lecture.id, to_upsert)
+                report.chunks_upserted += len(to_upsert)
+
+                entries[filename] = {
+                    "lecture_id": lecture.id,
+                    "content_hash": content_hash,
+                    "chunks": {cid: chunk["hash"] for cid, chunk in new_chunks.items()},
+                }
+
+            for filename in sorted(set(entries) - set(files)):
+                entry = entries.pop(filename)
+                self.processor.delete_lecture(entry["lecture_id"])
+                report.chunks_deleted += len(entry["chunks"])
+                db.query(Lecture).filter(Lecture.id == entry["lecture_id"]).delete()
+                report.removed.append(filename)
+
+            if not report.changed:
+                logger.info("Lecture index is up to date, nothing to do")
+                return report
+
+            db.commit()
+            self._save_manifest()
+            logger.info(f"Lecture index updated: {report}")
+            return report
+
+        except Exception as e:
+            db.rollback()
+            # Re-read the manifest so a failed run doesn't leave partial state in memory
+            self.manifest = self._load_manifest()
+            logger.error(f"Error indexing lectures: {str(e)}")
+            raise
@@ -0,0 +1,214 @@
+# File: backend/rag/ingestion.py
+"""
+Background lecture ingestion backed by the ingestion_jobs table.
+
+Routes commit a lecture together with a queued job and return at once.
+Each server process runs `workers` loops that claim the oldest queued job
+with a conditional UPDATE, so several processes can share the table
+without taking the same job twice. A job is chunked, embedded in batches
+(recording chunks embedded out of total and a heartbeat after each), and
+then written to the vector store and lexical index.
+
+Jobs survive restarts: a running job whose heartbeat is older than
+`stale_seconds` is claimed again, and failed attempts are retried up to
+`max_attempts` before the job is marked failed.
+
+Job bookkeeping goes through the app's async sessions, so its writes share
+the single SQLite writer with the API (see database/sqlite.py); chunking,
+embedding and the store writes run in worker threads.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database.models import IngestionJob, Lecture
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionInterrupted(Exception):
+    """Raised inside a job when the worker is shutting down"""
+
+
+class IngestionWorker:
+    """Runs queued ingestion jobs with bounded concurrency (see module docstring)"""
+
+    def __init__(
+        self,
+        processor,
+        session_factory: async_sessionmaker,
+        workers: int = 2,
+        batch_size: int = 64,
+        poll_seconds: float = 2.0,
+        stale_seconds: float = 300.0,
+        max_attempts: int = 3,
+        stop_timeout: float = 30.0
+    ):
+        self.processor = processor
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.stop_timeout = stop_timeout
+
+        # The vector store and lexical index take one writer at a time;
+        # embedding, the slow part, runs concurrently
+        self._store_lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Created in start(), on the event loop
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker loops on the running event loop"""
+        self._stopping.clear()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.workers)]
+        logger.info(f"Ingestion worker started with {self.workers} workers")
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was queued in this process"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        """
+        Stop claiming jobs. A job in progress is put back in the queue at its
+        next batch; if that takes longer than `stop_timeout`, or the process
+        exits first, it is retried once stale.
+        """
+        self._stopping.set()
+        self.notify()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.stop_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_next()
+            except Exception as e:
+                logger.error(f"Error in ingestion worker: {str(e)}")
+                ran = False
+            if ran or self._stopping.is_set():
+                continue
+            # Idle: wait for a local job or poll for jobs queued by other processes
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim(self, db: AsyncSession) -> Optional[IngestionJob]:
+        """Take the oldest runnable job, or None; safe against other workers and processes"""
+        while True:
+            now = datetime.utcnow()
+            stale_before = now - timedelta(seconds=self.stale_seconds)
+            job = await db.scalar(
+                select(IngestionJob)
+                .where(or_(
+                    IngestionJob.status == IngestionJob.QUEUED,
+                    and_(IngestionJob.status == IngestionJob.RUNNING, IngestionJob.heartbeat_at < stale_before)
+                ))
+                .order_by(IngestionJob.created_at)
+                .limit(1)
+            )
+            if job is None:
+                await db.rollback()  # Hand the read connection back while idle
+                return None
+
+            # Only wins if no other worker changed the job since it was read
+            unchanged = and_(
+                IngestionJob.id == job.id,
+                IngestionJob.status == job.status,
+                IngestionJob.attempts == job.attempts
+            )
+            if job.attempts >= self.max_attempts:
+                await db.execute(update(IngestionJob).where(unchanged).values(
+                    status=IngestionJob.FAILED,
+                    error=job.error or f"Gave up after {job.attempts} attempts",
+                    finished_at=now
+                ))
+                await db.commit()
+                continue
+
+            claimed = await db.execute(update(IngestionJob).where(unchanged).values(
+                status=IngestionJob.RUNNING,
+                attempts=IngestionJob.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+                chunks_done=0
+            ))
+            await db.commit()
+            if claimed.rowcount == 1:
+                await db.refresh(job)
+                return job
+
+    def _store(self, lecture_id: int, chunks: List, embeddings: List) -> None:
+        with self._store_lock:
+            # Both steps bump the lecture version, invalidating cached answers
+            self.processor.delete_lecture(lecture_id)
+            self.processor.upsert_chunks(lecture_id, chunks, embeddings)
+
+    async def run_next(self) -> bool:
+        """Claim and run one job; returns whether there was one"""
+        async with self.session_factory() as db:
+            job = await self._claim(db)
+            if job is None:
+                return False
+            job_id, lecture_id, attempts = job.id, job.lecture_id, job.attempts
+            loop = asyncio.get_running_loop()
+
+            async def set_job(**values):
+                await db.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(**values))
+                await db.commit()
+
+            def progress(done: int, total: int):
+                # Called between batches from the embedding thread
+                if self._stopping.is_set():
+                    raise IngestionInterrupted()
+                asyncio.run_coroutine_threadsafe(
+                    set_job(chunks_done=done, chunks_total=total, heartbeat_at=datetime.utcnow()),
+                    loop
+                ).result()
+
+            try:
+                lecture = await db.get(Lecture, lecture_id)
+                if lecture is None:
+                    raise ValueError(f"Lecture {lecture_id} not found")
+                content, title = lecture.content, lecture.title
+
+                chunks = await asyncio.to_thread(self.processor.chunk_lecture, lecture_id, content, title)
+                await set_job(chunks_done=0, chunks_total=len(chunks), heartbeat_at=datetime.utcnow())
+                embeddings = await asyncio.to_thread(self.processor.embed_chunks, chunks, self.batch_size, progress)
+                await asyncio.to_thread(self._store, lecture_id, chunks, embeddings)
+
+                await set_job(status=IngestionJob.SUCCEEDED, error=None, finished_at=datetime.utcnow())
+                logger.info(f"Ingested lecture {lecture_id} with {len(chunks)} chunks (job {job_id})")
+
+            except IngestionInterrupted:
+                await db.rollback()
+                await set_job(status=IngestionJob.QUEUED, attempts=IngestionJob.attempts - 1, heartbeat_at=None)
+                logger.info(f"Ingestion job {job_id} put back in the queue at shutdown")
+
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Error ingesting lecture {lecture_id} (job {job_id}): {str(e)}")
+                retry = attempts < self.max_attempts
+                await set_job(
+                    status=IngestionJob.QUEUED if retry else IngestionJob.FAILED,
+                    error=str(e),
+                    heartbeat_at=None,
+                    finished_at=None if retry else datetime.utcnow()
+                )
+            return True
@@ -0,0 +1,106 @@
+# File: backend/rag/lecture_versions.py
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: bumps are only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LectureVersions:
+    """
+    On-disk registry of lecture ingest versions.
+
+    Every time a lecture is (re-)ingested into the vector store its version is
+    bumped. Anything derived from lecture content (e.g. cached answers) records
+    the versions it was built from and is considered stale once they change.
+    The registry is a small JSON file so separate processes (API server,
+    reindex scripts) see each other's updates; bumps take an exclusive lock
+    on a `.lock` file next to it so concurrent bumps are never lost.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.path.join(settings.VECTOR_STORE_PATH, "lecture_versions.json"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path.with_suffix(".lock")
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._stamp: Optional[tuple] = None
+        self._reload()
+
+    def _reload(self) -> None:
+        """Reload the registry from disk if another process changed it"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._versions, self._stamp = {}, None
+            return
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._versions = {str(k): int(v) for k, v in json.load(f).items()}
+            self._stamp = stamp
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading lecture versions: {str(e)}")
+
+    def get(self, lecture_id) -> int:
+        """Current version of a lecture (0 if it was never ingested)"""
+        self._reload()
+        return self._versions.get(str(lecture_id), 0)
+
+    def snapshot(self, lecture_ids: Iterable) -> Dict[str, int]:
+        """Current versions for a set of lectures"""
+        self._reload()
+        return {str(i): self._versions.get(str(i), 0) for i in lecture_ids}
+
+    def current(self) -> Dict[str, int]:
+        """All lecture versions, freshly reloaded"""
+        self._reload()
+        return dict(self._versions)
+
+    def is_current(self, snapshot: Dict[str, int], versions: Optional[Dict[str, int]] = None) -> bool:
+        """Check whether a snapshot taken earlier still matches the registry"""
+        if versions is None:
+            versions = self.current()
+        return all(versions.get(k, 0) == v for k, v in snapshot.items())
+
+    def bump(self, lecture_id) -> int:
+        """Mark a lecture as changed and return its new version"""
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Reload unconditionally so another process's bump isn't overwritten
+                self._stamp = None
+                self._reload()
+                key = str(lecture_id)
+                # Use a timestamp so versions stay monotonic even if the file is lost
+                version = max(self._versions.get(key, 0) + 1, time.time_ns() // 1000)
+                self._versions[key] = version
+
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._versions, f)
+                os.replace(tmp_path, self.path)
+                stat = self.path.stat()
+                self._stamp = (stat.st_mtime_ns, stat.st_size)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        logger.info(f"Lecture {lecture_id} is now at version {version}")
+        return version
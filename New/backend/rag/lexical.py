@@ -0,0 +1,256 @@
+# File: backend/rag/lexical.py
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+CAMEL_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can could did do does for from had has have how i if in into is it its
+me my of on or our so than that the their them then there these they this to was we were what when
+where which who why will with would you your about tell explain describe please
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens without stopwords.
+
+    Identifiers are kept whole and also split into their parts, so
+    "getNextNode" matches "getNextNode", "next" and "node", and
+    "Lectures32" matches "lectures32" and "lectures".
+    """
+    tokens = []
+    for raw in TOKEN_PATTERN.findall(text):
+        word = raw.lower()
+        if word not in STOPWORDS:
+            tokens.append(word)
+        parts = [p.lower() for p in CAMEL_PATTERN.findall(raw.replace("_", " "))]
+        if len(parts) > 1:
+            tokens.extend(p for p in parts if p not in STOPWORDS and p != word)
+    return tokens
+
+
+IDENTIFIER_PATTERN = re.compile(r"[0-9_]|[a-z][A-Z]")
+
+
+def exact_terms(text: str) -> List[str]:
+    """
+    Identifier-like terms in a question: words with digits, underscores or
+    inner capitals ("Lectures32", "hash_map", "getNextNode"). Ordinary
+    capitalized words ("Python", "Big", "Java") are not exact terms; they
+    are left to the hybrid search.
+    """
+    return [word.lower() for word in TOKEN_PATTERN.findall(text) if IDENTIFIER_PATTERN.search(word)]
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over lecture chunks.
+
+    Built at ingest time next to the vector store and persisted as JSON. It
+    keeps each chunk's text and metadata so keyword searches need nothing but
+    local computation. Writers in any process (API workers, ingest and
+    reindex scripts) take an exclusive lock on a `.lock` file next to the
+    index and reload it before changing anything.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self.lock_path = self.path.with_suffix(".lock")
+        self._lock = threading.Lock()
+        self._stamp = None
+
+        self.docs: Dict[str, Dict] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._reload()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _reload(self) -> None:
+        """Reload the index if another process rewrote it"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.docs = data["docs"]
+            self.postings = data["postings"]
+            self._total_length = sum(doc["length"] for doc in self.docs.values())
+            self._stamp = stamp
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error loading lexical index: {str(e)}")
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive write access across threads and processes, with the current index loaded"""
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Reload unconditionally: the (mtime, size) stamp can miss a
+                # same-sized write made within the filesystem's time resolution
+                self._stamp = None
+                self._reload()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """Write the index (caller holds `_locked`)"""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs, "postings": self.postings}, f)
+        os.replace(tmp_path, self.path)
+        stat = self.path.stat()
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def _remove(self, chunk_id: str) -> None:
+        doc = self.docs.pop(chunk_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc["length"]
+        for term in doc["terms"]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def add(self, chunks: List[Dict]) -> None:
+        """Index chunks (dicts with id, text and metadata), replacing same ids"""
+        with self._locked():
+            for chunk in chunks:
+                self._remove(chunk["id"])
+                metadata = chunk["metadata"]
+                counts = Counter(tokenize(f"{metadata.get('title', '')}\n{chunk['text']}"))
+                length = sum(counts.values())
+                self.docs[chunk["id"]] = {
+                    "content": chunk["text"],
+                    "metadata": metadata,
+                    "length": length,
+                    "terms": list(counts),
+                }
+                self._total_length += length
+                for term, tf in counts.items():
+                    self.postings.setdefault(term, {})[chunk["id"]] = tf
+            self.save()
+
+    def delete(self, chunk_ids: List[str]) -> None:
+        with self._locked():
+            for chunk_id in chunk_ids:
+                self._remove(chunk_id)
+            self.save()
+
+    def delete_lecture(self, lecture_id: int) -> None:
+        with self._locked():
+            for chunk_id in [i for i, d in self.docs.items() if d["metadata"].get("lecture_id") == lecture_id]:
+                self._remove(chunk_id)
+            self.save()
+
+    # ------------------------------------------------------------------ #
+    # Search
+    # ------------------------------------------------------------------ #
+
+    def count(self) -> int:
+        self._reload()
+        return len(self.docs)
+
+    def documents(self) -> Dict[str, Dict]:
+        """Indexed chunks by id (content, metadata, length, terms)"""
+        self._reload()
+        return self.docs
+
+    def document_frequency(self, term: str) -> int:
+        self._reload()
+        return len(self.postings.get(term, {}))
+
+    def rare_terms(self, terms: List[str], max_doc_fraction: float) -> List[str]:
+        """
+        The `terms` that are indexed and appear in at most `max_doc_fraction`
+        of the chunks (at least one chunk), i.e. that pick out a few chunks
+        on their own
+        """
+        self._reload()
+        limit = max(1, int(max_doc_fraction * len(self.docs)))
+        return [t for t in terms if 0 < len(self.postings.get(t, {})) <= limit]
+
+    def search(self, query: str, k: int = 3, required_terms: Optional[List[str]] = None) -> List[Dict]:
+        """Top-k chunks by BM25; optionally only chunks containing all `required_terms`"""
+        self._reload()
+        n_docs = len(self.docs)
+        if n_docs == 0:
+            return []
+        avg_length = self._total_length / n_docs
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                length_norm = 1 - self.b + self.b * self.docs[chunk_id]["length"] / avg_length
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+
+        if required_terms:
+            for term in required_terms:
+                scores = {i: s for i, s in scores.items() if i in self.postings.get(term, {})}
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {
+                "id": chunk_id,
+                "content": self.docs[chunk_id]["content"],
+                "metadata": self.docs[chunk_id]["metadata"],
+                "score": score,
+            }
+            for chunk_id, score in ranked
+        ]
+
+
+def reciprocal_rank_fusion(rankings: List[List[Dict]], k: int, rrf_k: int = 60) -> List[Dict]:
+    """Fuse ranked result lists by summing 1 / (rrf_k + rank) per chunk id"""
+    fused: Dict[str, float] = {}
+    docs: Dict[str, Dict] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc["id"]] = fused.get(doc["id"], 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(doc["id"], doc)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [{**docs[chunk_id], "score": score} for chunk_id, score in ranked]
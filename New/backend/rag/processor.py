@@ -2,12 +2,64 @@
 import logging
 from langchain_openai import OpenAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
+from app import metrics
 from app.config import settings
+from rag.lecture_versions import LectureVersions
+from rag.embedding_cache import CachedEmbeddings
+from rag.vector_store import create_vector_store
+from rag.lexical import LexicalIndex, exact_terms, reciprocal_rank_fusion
+from rag.dedup import ChunkDeduplicator, source_references
+from typing import Callable, Dict, List, Optional
+import hashlib
 import os
+import time
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+def make_text_splitter() -> RecursiveCharacterTextSplitter:
+    """The splitter used for all lecture content"""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        length_function=len,
+    )
+
+def chunk_hash(text: str) -> str:
+    """Content hash of a chunk"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def build_chunk_records(lecture_id: int, texts: List[str], title: Optional[str] = None) -> List[Dict]:
+    """
+    Turn split chunk texts into records with deterministic ids.
+
+    The id depends only on the lecture, the chunk text and how many
+    identical chunks precede it, so unchanged chunks keep their id when
+    the lecture is re-ingested.
+    """
+    seen: Dict[str, int] = {}
+    records = []
+    for i, text in enumerate(texts):
+        text_hash = chunk_hash(text)
+        occurrence = seen.get(text_hash, 0)
+        seen[text_hash] = occurrence + 1
+        metadata = {
+            "lecture_id": lecture_id,
+            "chunk_id": i,
+            "source": f"lecture_{lecture_id}"
+        }
+        if title:
+            metadata["title"] = title
+        records.append({
+            "id": f"{lecture_id}:{text_hash[:24]}:{occurrence}",
+            "hash": text_hash,
+            "text": text,
+            "metadata": metadata
+        })
+    return records
+
 class RAGProcessor:
     def __init__(self):
         logger.info("Initializing RAG Processor...")
@@ -15,21 +67,39 @@ class RAGProcessor:
             self.embeddings = OpenAIEmbeddings(
                 openai_api_key=settings.OPENAI_API_KEY
             )
+
+            # Reuse stored vectors for chunks that were embedded before
+            if settings.EMBEDDING_CACHE_ENABLED:
+                self.embeddings = CachedEmbeddings(
+                    self.embeddings,
+                    path=os.path.join(settings.CACHE_DIR, "embeddings.sqlite3"),
+                    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+                )
             
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                length_function=len,
+            self.text_splitter = make_text_splitter()
+
+            # Collapses near-duplicate chunks before they are embedded
+            self.deduplicator = (
+                ChunkDeduplicator(threshold=settings.DEDUP_THRESHOLD) if settings.DEDUP_ENABLED else None
             )
             
             # Make sure the vector store directory exists
             os.makedirs(settings.VECTOR_STORE_PATH, exist_ok=True)
             
-            # Initialize vector store
-            self.vector_store = Chroma(
-                persist_directory=settings.VECTOR_STORE_PATH,
-                embedding_function=self.embeddings
-            )
+            # Initialize vector store (Chroma or in-process NumPy, see VECTOR_STORE_BACKEND)
+            self.vector_store = create_vector_store(self.embeddings)
+
+            # BM25 index kept in step with the vector store
+            self.lexical_index = LexicalIndex(os.path.join(
+                settings.VECTOR_STORE_PATH,
+                f"lexical_index.{settings.VECTOR_STORE_BACKEND}.json"
+            ))
+            if not self.lexical_index.exists and self.vector_store.count() > 0:
+                logger.info("Building lexical index from existing vector store...")
+                self.lexical_index.add(self.vector_store.get_records())
+
+            # Ingest versions, used to invalidate anything derived from lecture content
+            self.lecture_versions = LectureVersions()
             
             logger.info("RAG Processor initialized successfully")
             
@@ -37,33 +107,149 @@ class RAGProcessor:
             logger.error(f"Error initializing RAG Processor: {str(e)}")
             raise
 
-    def process_lecture(self, lecture_id: int, content: str) -> None:
-        """Process lecture content and store in vector store"""
-        try:
-            # Split text into chunks
-            chunks = self.text_splitter.split_text(content)
-            
-            # Prepare documents
-            metadatas = [{
-                "lecture_id": lecture_id,
-                "chunk_id": i,
-                "source": f"lecture_{lecture_id}"
-            } for i in range(len(chunks))]
-            
-            # Add to vector store
+    def chunk_lecture(self, lecture_id: int, content: str, title: Optional[str] = None) -> List[Dict]:
+        """Split lecture content into chunk records with deterministic ids, minus near-duplicates"""
+        chunks = build_chunk_records(lecture_id, self.text_splitter.split_text(content), title)
+        if self.deduplicator is not None:
+            chunks, _ = self.deduplicator.deduplicate(chunks)
+        return chunks
+
+    def _lecture_titles(self, lecture_ids: set) -> Dict[int, str]:
+        """Titles of the given lectures, as recorded on their stored chunks"""
+        titles: Dict[int, str] = {}
+        for doc in self.lexical_index.documents().values():
+            lecture_id = doc["metadata"].get("lecture_id")
+            if lecture_id in lecture_ids and lecture_id not in titles and doc["metadata"].get("title"):
+                titles[lecture_id] = doc["metadata"]["title"]
+        return titles
+
+    def _rehome_shared_chunks(self, docs: Dict[str, Dict], removed_lecture_ids: set) -> None:
+        """
+        Before deleting chunks, move any that stand in for near-duplicates of
+        other lectures to the first of those lectures, so their content stays
+        searchable. The moved chunk takes that lecture's source and title and
+        keeps the remaining references in their recorded order.
+        """
+        moves = []
+        for doc in docs.values():
+            refs = [r for r in source_references(doc["metadata"])[1:] if r[0] not in removed_lecture_ids]
+            if refs:
+                moves.append((doc, refs))
+        if not moves:
+            return
+
+        titles = self._lecture_titles({refs[0][0] for _, refs in moves})
+        for doc, refs in moves:
+            new_lecture_id, new_source = refs[0]
+            chunk = build_chunk_records(new_lecture_id, [doc["content"]], titles.get(new_lecture_id))[0]
+            chunk["metadata"]["source"] = new_source
+            if refs[1:]:
+                chunk["metadata"]["duplicate_count"] = len(refs) - 1
+                chunk["metadata"]["duplicate_lecture_ids"] = ",".join(str(r[0]) for r in refs[1:])
+                chunk["metadata"]["duplicate_sources"] = ",".join(r[1] for r in refs[1:])
+            self.upsert_chunks(new_lecture_id, [chunk])
+            logger.info(f"Moved shared chunk of lecture {doc['metadata'].get('lecture_id')} to lecture {new_lecture_id}")
+
+    def _shared_docs(self, lecture_id: int, chunk_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Stored chunks of a lecture (optionally only `chunk_ids`) that carry duplicate references"""
+        return {
+            chunk_id: doc for chunk_id, doc in self.lexical_index.documents().items()
+            if doc["metadata"].get("lecture_id") == lecture_id
+            and doc["metadata"].get("duplicate_lecture_ids")
+            and (chunk_ids is None or chunk_id in chunk_ids)
+        }
+
+    def upsert_chunks(
+        self,
+        lecture_id: int,
+        chunks: List[Dict],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
+        """Insert or replace chunks (as returned by chunk_lecture) of one lecture"""
+        if chunks:
             self.vector_store.add_texts(
-                texts=chunks,
-                metadatas=metadatas
+                texts=[chunk["text"] for chunk in chunks],
+                metadatas=[chunk["metadata"] for chunk in chunks],
+                ids=[chunk["id"] for chunk in chunks],
+                embeddings=embeddings
             )
-            
-            # In newer versions of Chroma/LangChain, persist() is no longer needed
-            # It seems to auto-persist when using a persist_directory
-            try:
-                # Try to call persist if available
-                if hasattr(self.vector_store, 'persist'):
-                    self.vector_store.persist()
-            except Exception as e:
-                logger.info(f"Auto-persist assumed, no manual persist needed: {str(e)}")
+            self.lexical_index.add(chunks)
+        self.lecture_versions.bump(lecture_id)
+
+    def bulk_replace_lectures(
+        self,
+        chunks: List[Dict],
+        embeddings: List[List[float]],
+        batch_size: int = 1000
+    ) -> None:
+        """
+        Replace the stored chunks of every lecture in `chunks` using precomputed
+        embeddings, writing the vector store and lexical index in large batches.
+        """
+        lecture_ids = sorted({chunk["metadata"]["lecture_id"] for chunk in chunks})
+        shared = {}
+        for lecture_id in lecture_ids:
+            shared.update(self._shared_docs(lecture_id))
+            self.vector_store.delete_lecture(lecture_id)
+            self.lexical_index.delete_lecture(lecture_id)
+        # Chunks standing in for lectures outside this batch must survive the replace
+        self._rehome_shared_chunks(shared, set(lecture_ids))
+
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            self.vector_store.add_texts(
+                texts=[chunk["text"] for chunk in batch],
+                metadatas=[chunk["metadata"] for chunk in batch],
+                ids=[chunk["id"] for chunk in batch],
+                embeddings=embeddings[start:start + batch_size]
+            )
+        self.lexical_index.add(chunks)
+
+        for lecture_id in lecture_ids:
+            self.lecture_versions.bump(lecture_id)
+
+    def delete_chunks(self, lecture_id: int, chunk_ids: List[str]) -> None:
+        """Delete specific chunks of one lecture"""
+        if chunk_ids:
+            shared = self._shared_docs(lecture_id, set(chunk_ids))
+            self.vector_store.delete(chunk_ids)
+            self.lexical_index.delete(chunk_ids)
+            self._rehome_shared_chunks(shared, {lecture_id})
+        self.lecture_versions.bump(lecture_id)
+
+    def delete_lecture(self, lecture_id: int) -> None:
+        """Delete every chunk stored for a lecture"""
+        shared = self._shared_docs(lecture_id)
+        self.vector_store.delete_lecture(lecture_id)
+        self.lexical_index.delete_lecture(lecture_id)
+        self._rehome_shared_chunks(shared, {lecture_id})
+        self.lecture_versions.bump(lecture_id)
+
+    def embed_chunks(
+        self,
+        chunks: List[Dict],
+        batch_size: int = 64,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[List[float]]:
+        """Embed chunk texts in batches, calling progress(done, total) after each"""
+        embeddings: List[List[float]] = []
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            embeddings.extend(self.embeddings.embed_documents([chunk["text"] for chunk in batch]))
+            if progress is not None:
+                progress(len(embeddings), len(chunks))
+        return embeddings
+
+    def process_lecture(self, lecture_id: int, content: str, title: Optional[str] = None) -> None:
+        """Process lecture content and store in vector store, replacing any previous version"""
+        try:
+            # Split text into chunks
+            chunks = self.chunk_lecture(lecture_id, content, title)
+
+            # Drop whatever was stored for this lecture before, then add the new chunks.
+            # Both steps bump the lecture version, invalidating cached answers.
+            self.delete_lecture(lecture_id)
+            self.upsert_chunks(lecture_id, chunks)
             
             logger.info(f"Successfully processed lecture {lecture_id} with {len(chunks)} chunks")
             
@@ -71,26 +257,68 @@ class RAGProcessor:
             logger.error(f"Error processing lecture: {str(e)}")
             raise
 
-    async def find_relevant_context(self, question: str, num_chunks: int = 2):  # Reduced from 3
+    @metrics.timed(metrics.EMBED_SECONDS)
+    async def embed_query(self, question: str) -> List[float]:
+        """Embed a question so it can be reused for caching and retrieval"""
+        return await self.embeddings.aembed_query(question)
+
+    def lexical_shortcut(self, question: str, num_chunks: int = 2) -> Optional[List[Dict]]:
+        """
+        Answer retrieval from the BM25 index alone when the question names
+        identifier-like terms that only a few chunks contain. Returns None
+        when the question should go through the full hybrid search instead.
+        """
+        if not (settings.HYBRID_RETRIEVAL_ENABLED and settings.HYBRID_LEXICAL_SHORTCUT):
+            return None
+
+        started = time.perf_counter()
+        terms = self.lexical_index.rare_terms(exact_terms(question), settings.HYBRID_SHORTCUT_MAX_DOC_FRACTION)
+        if not terms:
+            return None
+
+        context_docs = self.lexical_index.search(question, k=num_chunks, required_terms=terms)
+        if not context_docs:
+            return None
+
+        # This is the question's retrieval; a declined shortcut is timed with find_relevant_context
+        metrics.RETRIEVAL_SECONDS.observe(time.perf_counter() - started)
+        logger.info(f"Lexical shortcut for exact terms {terms}: {len(context_docs)} chunks")
+        return context_docs
+
+    @metrics.timed(metrics.RETRIEVAL_SECONDS)
+    async def find_relevant_context(
+        self,
+        question: str,
+        num_chunks: int = 2,  # Reduced from 3
+        query_embedding: Optional[List[float]] = None
+    ):
         """Find relevant context for a question"""
         try:
             # Check if there's any data in the vector store
-            collection = self.vector_store._collection
-            if collection.count() == 0:
+            if self.vector_store.count() == 0:
                 logger.warning("Vector store is empty - no lectures loaded")
                 return []
 
-            # Perform similarity search with only the basic parameters
-            results = self.vector_store.similarity_search(
-                question,
-                k=num_chunks  # Reduced from 3 → 2 for faster lookup
-            )
+            if query_embedding is None:
+                query_embedding = await self.embed_query(question)
 
-            # Format results
-            context_docs = [{
-                "content": doc.page_content,
-                "metadata": doc.metadata
-            } for doc in results]
+            if not settings.HYBRID_RETRIEVAL_ENABLED:
+                with metrics.VECTOR_SEARCH_SECONDS.time():
+                    context_docs = self.vector_store.similarity_search_by_vector(
+                        query_embedding,
+                        k=num_chunks  # Reduced from 3 → 2 for faster lookup
+                    )
+            else:
+                # Fuse the vector and BM25 rankings
+                candidates = max(settings.HYBRID_CANDIDATES, num_chunks)
+                with metrics.VECTOR_SEARCH_SECONDS.time():
+                    vector_docs = self.vector_store.similarity_search_by_vector(query_embedding, k=candidates)
+                rankings = [vector_docs, self.lexical_index.search(question, k=candidates)]
+                # Exact terms too common for the shortcut still boost the chunks naming them
+                terms = [t for t in exact_terms(question) if self.lexical_index.document_frequency(t) > 0]
+                if terms:
+                    rankings.append(self.lexical_index.search(question, k=candidates, required_terms=terms))
+                context_docs = reciprocal_rank_fusion(rankings, k=num_chunks)
 
             logger.info(f"Found {len(context_docs)} relevant chunks for question")
             return context_docs
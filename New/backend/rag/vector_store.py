@@ -1,54 +1,181 @@
 # File: backend/rag/vector_store.py
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import List, Dict, Optional
-from langchain.vectorstores import Chroma
-from langchain.embeddings.base import Embeddings
+from pathlib import Path
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from app.config import settings
+import numpy as np
+import threading
 import logging
+import json
+import math
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
-class VectorStore:
+class VectorStore(ABC):
+    """
+    Interface for the vector stores behind RAGProcessor.
+
+    Search results are dicts with `content`, `metadata`, `id` and `score`
+    (higher is more similar). Writes are upserts keyed by chunk id.
+    """
+
     def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    @abstractmethod
+    def add_texts(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
+        """Insert or replace texts; embeddings are computed unless given"""
+        ...
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete chunks by id"""
+        ...
+
+    @abstractmethod
+    def delete_lecture(self, lecture_id: int) -> None:
+        """Delete every chunk whose metadata has this lecture_id"""
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_records(self) -> List[Dict]:
+        """Every stored chunk as a dict with id, text and metadata"""
+        ...
+
+    @abstractmethod
+    def similarity_search_by_vectors(
+        self,
+        query_embeddings: List[List[float]],
+        k: int = 3
+    ) -> List[List[Dict]]:
+        """Top-k results for a batch of query embeddings"""
+        ...
+
+    def similarity_search_by_vector(self, query_embedding: List[float], k: int = 3) -> List[Dict]:
+        return self.similarity_search_by_vectors([query_embedding], k=k)[0]
+
+    def similarity_search(self, query: str, k: int = 3) -> List[Dict]:
+        """Search for similar texts"""
+        return self.similarity_search_by_vector(self.embeddings.embed_query(query), k=k)
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class ChromaVectorStore(VectorStore):
+    """Chroma (SQLite + HNSW) backed store"""
+
+    def __init__(self, embeddings: Embeddings, persist_directory: Optional[str] = None):
         """Initialize vector store with embeddings"""
+        super().__init__(embeddings)
+        self.persist_directory = persist_directory or settings.VECTOR_STORE_PATH
         try:
-            self.embeddings = embeddings
             self.store = Chroma(
-                persist_directory=settings.VECTOR_STORE_PATH,
+                persist_directory=self.persist_directory,
                 embedding_function=embeddings
             )
-            logger.info("Vector store initialized successfully")
+            logger.info("Chroma vector store initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing vector store: {str(e)}")
             raise
 
+    def _persist(self) -> None:
+        # Newer Chroma versions persist automatically
+        if hasattr(self.store, "persist"):
+            try:
+                self.store.persist()
+            except Exception as e:
+                logger.info(f"Auto-persist assumed, no manual persist needed: {str(e)}")
+
     def add_texts(
-        self, 
-        texts: List[str], 
-        metadatas: Optional[List[Dict]] = None
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
     ) -> None:
         """Add texts to vector store"""
         try:
-            self.store.add_texts(texts, metadatas)
-            self.store.persist()
+            if embeddings is None:
+                self.store.add_texts(texts, metadatas, ids=ids)
+            else:
+                self.store._collection.upsert(
+                    ids=ids,
+                    embeddings=embeddings,
+                    documents=texts,
+                    metadatas=metadatas
+                )
+            self._persist()
             logger.info(f"Added {len(texts)} texts to vector store")
         except Exception as e:
             logger.error(f"Error adding texts to vector store: {str(e)}")
             raise
 
-    async def similarity_search(
-        self, 
-        query: str, 
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.store.delete(ids=ids)
+            self._persist()
+
+    def delete_lecture(self, lecture_id: int) -> None:
+        self.store._collection.delete(where={"lecture_id": lecture_id})
+        self._persist()
+
+    def count(self) -> int:
+        return self.store._collection.count()
+
+    def get_records(self) -> List[Dict]:
+        data = self.store._collection.get(include=["documents", "metadatas"])
+        return [
+            {"id": chunk_id, "text": text, "metadata": metadata or {}}
+            for chunk_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"])
+        ]
+
+    def similarity_search_by_vectors(
+        self,
+        query_embeddings: List[List[float]],
         k: int = 3
-    ) -> List[Dict]:
+    ) -> List[List[Dict]]:
         """Search for similar texts"""
         try:
-            docs = self.store.similarity_search(query, k=k)
+            results = self.store._collection.query(
+                query_embeddings=[list(map(float, e)) for e in query_embeddings],
+                n_results=k,
+                include=["documents", "metadatas", "distances"]
+            )
             return [
-                {
-                    "content": doc.page_content,
-                    "metadata": doc.metadata
-                }
-                for doc in docs
+                [
+                    {
+                        "id": doc_id,
+                        "content": content,
+                        "metadata": metadata or {},
+                        # Same relevance mapping LangChain uses for Chroma's L2 distance
+                        "score": 1.0 - distance / math.sqrt(2)
+                    }
+                    for doc_id, content, metadata, distance in zip(ids, documents, metadatas, distances)
+                ]
+                for ids, documents, metadatas, distances in zip(
+                    results["ids"], results["documents"], results["metadatas"], results["distances"]
+                )
             ]
         except Exception as e:
             logger.error(f"Error in similarity search: {str(e)}")
@@ -59,10 +186,246 @@ class VectorStore:
         try:
             self.store.delete_collection()
             self.store = Chroma(
-                persist_directory=settings.VECTOR_STORE_PATH,
+                persist_directory=self.persist_directory,
                 embedding_function=self.embeddings
             )
             logger.info("Vector store cleared successfully")
         except Exception as e:
             logger.error(f"Error clearing vector store: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact in-process search over a contiguous float32 matrix.
+
+    Rows are L2-normalized at write time so top-k is a single matrix-vector
+    (or matrix-matrix for batches) product. Vectors live in a memory-mapped
+    `.npy` file next to a JSON array of ids, texts and metadata. Every write
+    produces a new generation of both files and then flips `index.json`, so
+    readers in other processes (e.g. the API server while a reindex script
+    runs) pick up changes on their next query without ever seeing a partial
+    write. Writers in any process take an exclusive lock on `write.lock` and
+    reload before changing anything, so concurrent writes never overwrite
+    each other or reuse a generation number. The previous generation is kept
+    for readers that read `index.json` just before the flip.
+    """
+
+    def __init__(self, embeddings: Embeddings, directory: Optional[str] = None):
+        super().__init__(embeddings)
+        self.directory = Path(directory or os.path.join(settings.VECTOR_STORE_PATH, "numpy"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.lock_path = self.directory / "write.lock"
+        self._write_lock = threading.Lock()
+
+        self._stamp = None
+        self._generation = 0
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._records: List[Dict] = []
+        self._lecture_ids = np.zeros(0, dtype=np.int64)
+        self._row_by_id: Dict[str, int] = {}
+        self._reload()
+        logger.info(f"NumPy vector store initialized with {self.count()} vectors")
+
+    # ------------------------------------------------------------------ #
+    # Storage
+    # ------------------------------------------------------------------ #
+
+    def _reload(self) -> None:
+        """Map the current generation if another writer replaced it"""
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            generation = json.load(f)["generation"]
+        vectors_path = self.directory / f"vectors.{generation}.npy"
+        records_path = self.directory / f"records.{generation}.json"
+
+        matrix = np.load(vectors_path, mmap_mode="r")
+        with open(records_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        self._set_state(generation, matrix, records)
+        self._stamp = stamp
+
+    def _set_state(self, generation: int, matrix: np.ndarray, records: List[Dict]) -> None:
+        self._generation = generation
+        self._matrix = matrix
+        self._records = records
+        self._lecture_ids = np.array(
+            [r["metadata"].get("lecture_id", -1) for r in records], dtype=np.int64
+        )
+        self._row_by_id = {r["id"]: i for i, r in enumerate(records)}
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive write access across threads and processes, with current state loaded"""
+        with self._write_lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Reload unconditionally: the (mtime, size) stamp can miss a
+                # same-sized write made within the filesystem's time resolution
+                self._stamp = None
+                self._reload()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, matrix: np.ndarray, records: List[Dict]) -> None:
+        """Publish a new generation (caller holds `_locked`)"""
+        generation = self._generation + 1
+        vectors_path = self.directory / f"vectors.{generation}.npy"
+        records_path = self.directory / f"records.{generation}.json"
+
+        np.save(vectors_path, np.ascontiguousarray(matrix, dtype=np.float32))
+        with open(records_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation, "count": len(records)}, f)
+        os.replace(tmp_path, self.index_path)
+
+        self._stamp = None
+        self._reload()
+
+        # Keep the generation just replaced for readers still opening it;
+        # anything older is unreferenced. Best effort: a process may still
+        # have it mapped
+        for pattern in ("vectors.*.npy", "records.*.json"):
+            for path in self.directory.glob(pattern):
+                try:
+                    if int(path.name.split(".")[1]) < generation - 1:
+                        path.unlink()
+                except (ValueError, OSError):
+                    pass
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    # ------------------------------------------------------------------ #
+    # VectorStore interface
+    # ------------------------------------------------------------------ #
+
+    def add_texts(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
+        if not texts:
+            return
+        if embeddings is None:
+            embeddings = self.embeddings.embed_documents(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [f"chunk-{os.urandom(8).hex()}" for _ in texts]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._locked():
+            matrix = np.array(self._matrix, dtype=np.float32)  # copy out of the mmap
+            if matrix.size == 0:
+                matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            records = list(self._records)
+            row_by_id = dict(self._row_by_id)
+
+            new_rows = []
+            for vector, text, metadata, chunk_id in zip(vectors, texts, metadatas, ids):
+                record = {"id": chunk_id, "content": text, "metadata": metadata}
+                row = row_by_id.get(chunk_id)
+                if row is None:
+                    row_by_id[chunk_id] = len(records)
+                    records.append(record)
+                    new_rows.append(vector)
+                else:
+                    records[row] = record
+                    matrix[row] = vector
+            if new_rows:
+                matrix = np.vstack([matrix, np.stack(new_rows)])
+
+            self._write(matrix, records)
+        logger.info(f"Added {len(texts)} texts to vector store")
+
+    def _delete_rows(self, mask: np.ndarray) -> None:
+        """Drop the rows where mask is True (caller holds `_locked`)"""
+        if not mask.any():
+            return
+        keep = ~mask
+        matrix = np.asarray(self._matrix)[keep]
+        records = [r for r, k in zip(self._records, keep) if k]
+        self._write(matrix, records)
+
+    def delete(self, ids: List[str]) -> None:
+        with self._locked():
+            mask = np.zeros(len(self._records), dtype=bool)
+            for chunk_id in ids:
+                row = self._row_by_id.get(chunk_id)
+                if row is not None:
+                    mask[row] = True
+            self._delete_rows(mask)
+
+    def delete_lecture(self, lecture_id: int) -> None:
+        with self._locked():
+            self._delete_rows(self._lecture_ids == lecture_id)
+
+    def count(self) -> int:
+        self._reload()
+        return len(self._records)
+
+    def get_records(self) -> List[Dict]:
+        self._reload()
+        return [{"id": r["id"], "text": r["content"], "metadata": r["metadata"]} for r in self._records]
+
+    def similarity_search_by_vectors(
+        self,
+        query_embeddings: List[List[float]],
+        k: int = 3
+    ) -> List[List[Dict]]:
+        self._reload()
+        matrix, records = self._matrix, self._records
+        if len(records) == 0:
+            return [[] for _ in query_embeddings]
+
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        scores = queries @ matrix.T  # (batch, rows)
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        results = []
+        for row_scores, candidates in zip(scores, top):
+            ordered = candidates[np.argsort(-row_scores[candidates])]
+            results.append([
+                {
+                    "id": records[i]["id"],
+                    "content": records[i]["content"],
+                    "metadata": records[i]["metadata"],
+                    "score": float(row_scores[i])
+                }
+                for i in ordered
+            ])
+        return results
+
+    def clear(self) -> None:
+        with self._locked():
+            self._write(np.zeros((0, 0), dtype=np.float32), [])
+        logger.info("Vector store cleared successfully")
+
+
+def create_vector_store(embeddings: Embeddings, backend: Optional[str] = None) -> VectorStore:
+    """Build the vector store selected by VECTOR_STORE_BACKEND"""
+    backend = (backend or settings.VECTOR_STORE_BACKEND).lower()
+    if backend == "chroma":
+        return ChromaVectorStore(embeddings)
+    if backend == "numpy":
+        return NumpyVectorStore(embeddings)
+    raise ValueError(f"Unknown vector store backend: {backend}")
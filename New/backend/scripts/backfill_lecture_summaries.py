@@ -0,0 +1,81 @@
+# File: backend/scripts/backfill_lecture_summaries.py
+"""
+Bring an existing database up to date for the lecture summary listing:
+add the content_hash and content_size columns to lectures if they are
+missing, then fill them in for lectures that don't have them yet.
+
+New databases get the columns from init_db, and the Lecture model keeps
+them in step with content whenever it is set through the ORM. Run this
+once on a database created before them, or after changing content with
+bulk SQL updates (use --all to recompute every lecture).
+
+Usage:
+    python scripts/backfill_lecture_summaries.py
+    python scripts/backfill_lecture_summaries.py --all
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import inspect, select, text, update
+
+from database import SessionLocal, engine
+from database.models.lecture import Lecture, content_digest
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NEW_COLUMNS = {
+    "content_hash": "VARCHAR(64)",
+    "content_size": "INTEGER",
+}
+
+
+def add_missing_columns():
+    existing = {column["name"] for column in inspect(engine).get_columns(Lecture.__tablename__)}
+    with engine.begin() as conn:
+        for name, column_type in NEW_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {Lecture.__tablename__} ADD COLUMN {name} {column_type}"))
+                logger.info(f"Added lectures.{name}")
+
+
+def main(args):
+    add_missing_columns()
+
+    db = SessionLocal()
+    try:
+        query = select(Lecture.id)
+        if not args.all:
+            query = query.where(Lecture.content_hash.is_(None))
+        lecture_ids = db.scalars(query).all()
+
+        # One lecture's content in memory at a time; updated_at is left alone
+        for lecture_id in lecture_ids:
+            content = db.scalar(select(Lecture.content).where(Lecture.id == lecture_id))
+            content_hash, content_size = content_digest(content)
+            db.execute(
+                update(Lecture)
+                .where(Lecture.id == lecture_id)
+                .values(content_hash=content_hash, content_size=content_size, updated_at=Lecture.updated_at)
+            )
+        db.commit()
+        logger.info(f"Backfilled content hash and size of {len(lecture_ids)} lectures")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error backfilling lecture summaries: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="recompute every lecture, not just those missing a hash")
+    main(parser.parse_args())
@@ -0,0 +1,182 @@
+# File: backend/scripts/benchmark_login.py
+"""
+Login-storm benchmark: a class logging in at once while other students
+keep asking questions.
+
+Runs the same storm twice against a scratch SQLite database:
+
+  inline  bcrypt runs on the event loop (the old behaviour: every hash
+          blocks all other requests for its full duration)
+  pool    bcrypt runs in the bounded password-hashing thread pool
+          (api/auth.py)
+
+Logins go through the real /api/auth/token route. /api/qa/ask is the
+real authentication dependency followed by a sleep the length of an LLM
+call, so its latency shows how long the event loop kept it waiting. The
+report shows p50/p99 latency of both endpoints while the storm runs.
+
+Usage:
+    python scripts/benchmark_login.py
+    python scripts/benchmark_login.py --logins 300 --qa-clients 32 --rounds 12 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+
+class InlineExecutor(Executor):
+    """Runs each job in the calling thread, i.e. on the event loop"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def build_app(qa_latency: float):
+    from fastapi import Depends, FastAPI
+    from api.auth import get_current_user
+    from api.auth_cache import CurrentUser
+    from api.routes import auth
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+
+    @app.post("/api/qa/ask")
+    async def ask(current_user: CurrentUser = Depends(get_current_user)):
+        await asyncio.sleep(qa_latency)
+        return {"answer": "..."}
+
+    return app
+
+
+def seed(users: int, password: str) -> list:
+    from database.session import SessionLocal, init_db
+    from database.models import User
+    from api.auth import pwd_context
+
+    init_db()
+    # Every student shares a password, so seeding costs a single hash
+    password_hash = pwd_context.hash(password)
+    student_ids = [str(10 ** 8 + i) for i in range(users)]
+    db = SessionLocal()
+    try:
+        db.add_all([
+            User(email=f"user{sid}@example.edu", student_id=sid, college_id="BENCH", password_hash=password_hash)
+            for sid in student_ids
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return student_ids
+
+
+async def run_mode(app, mode: str, student_ids: list, args) -> dict:
+    import httpx
+    import api.auth
+
+    if mode == "inline":
+        api.auth.password_executor = InlineExecutor()
+    else:
+        api.auth.password_executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="password-hash")
+    latencies = {"login": [], "ask": []}
+    storm_done = asyncio.Event()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def login(student_id: str) -> str:
+            response = await client.post("/api/auth/token", data={"username": student_id, "password": args.password})
+            response.raise_for_status()
+            return response.json()["access_token"]
+
+        # QA clients log in before the storm starts
+        qa_ids, storm_ids = student_ids[:args.qa_clients], student_ids[args.qa_clients:]
+        tokens = [await login(sid) for sid in qa_ids]
+
+        async def ask_loop(token: str):
+            headers = {"Authorization": f"Bearer {token}"}
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                response = await client.post("/api/qa/ask", headers=headers)
+                response.raise_for_status()
+                latencies["ask"].append(time.perf_counter() - start)
+
+        async def storm():
+            async def timed_login(sid: str):
+                start = time.perf_counter()
+                await login(sid)
+                latencies["login"].append(time.perf_counter() - start)
+            try:
+                await asyncio.gather(*(timed_login(sid) for sid in storm_ids))
+            finally:
+                storm_done.set()
+
+        started = time.perf_counter()
+        await asyncio.gather(storm(), *(ask_loop(token) for token in tokens))
+        wall = time.perf_counter() - started
+
+    api.auth.password_executor.shutdown(wait=True)
+    return {"wall": wall, "latencies": latencies}
+
+
+def report(mode: str, result: dict) -> None:
+    def pct(values, q):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+
+    print(f"\n{mode}: storm took {result['wall']:.2f}s")
+    for kind, values in result["latencies"].items():
+        if values:
+            print(f"  {kind:<6} n={len(values):<5} p50 {statistics.median(values) * 1000:8.1f} ms   "
+                  f"p99 {pct(values, 0.99):8.1f} ms")
+
+
+async def main(args) -> None:
+    from database.session import close_db
+
+    student_ids = seed(args.qa_clients + args.logins, args.password)
+    app = build_app(args.qa_latency)
+    print(f"{args.logins} logins while {args.qa_clients} clients ask questions "
+          f"(QA latency {args.qa_latency * 1000:.0f} ms), bcrypt cost {args.rounds}, {args.workers} hashing threads")
+
+    results = {}
+    for mode in ("inline", "pool"):
+        results[mode] = await run_mode(app, mode, student_ids, args)
+        report(mode, results[mode])
+
+    inline_ask, pool_ask = results["inline"]["latencies"]["ask"], results["pool"]["latencies"]["ask"]
+    if inline_ask and pool_ask:
+        print(f"\nQA p50 during the storm: {statistics.median(inline_ask) * 1000:.0f} ms inline, "
+              f"{statistics.median(pool_ask) * 1000:.0f} ms with the pool")
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100, help="students logging in at once")
+    parser.add_argument("--qa-clients", type=int, default=16, help="students asking questions during the storm")
+    parser.add_argument("--qa-latency", type=float, default=0.1, help="seconds each QA request awaits")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=4, help="password hashing threads in pool mode")
+    parser.add_argument("--password", default="correct horse battery staple")
+    args = parser.parse_args()
+
+    # Point the backend at a scratch database before it is imported
+    scratch = Path(tempfile.mkdtemp())
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch / 'benchmark.db'}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["CACHE_DIR"] = str(scratch / "cache")
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    asyncio.run(main(args))
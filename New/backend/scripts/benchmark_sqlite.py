@@ -0,0 +1,181 @@
+# File: backend/scripts/benchmark_sqlite.py
+"""
+Concurrency benchmark of the SQLite storage profiles on the users,
+feedback and lectures tables.
+
+  default     rollback journal, no pragmas, one shared connection pool
+  production  WAL with tuned pragmas, a single writer connection and a pool
+              of read-only connections (database/sqlite.py)
+
+Each profile gets its own freshly seeded database file. Concurrent workers
+then run a mix of reads and writes:
+- reads: login lookups, a student's feedback, a page of lectures, one
+  lecture
+- writes: registrations, feedback submissions, lecture edits
+
+The report shows throughput, latency for reads and writes, and how many
+operations failed with "database is locked".
+
+Usage:
+    python scripts/benchmark_sqlite.py
+    python scripts/benchmark_sqlite.py --workers 64 --operations 5000 --write-ratio 0.3
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from database.models import Base, Feedback, Lecture, User
+from database.sqlite import checkpoint, create_sqlite_engines
+
+LECTURE_TEXT = "Binary search trees keep keys ordered so lookups take logarithmic time. " * 40
+
+
+def seed(path: Path, users: int, lectures: int) -> list:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": uid, "email": f"{uid}@example.edu", "student_id": str(10 ** 8 + i),
+             "college_id": "BENCH", "password_hash": "x", "is_active": True}
+            for i, uid in enumerate(user_ids)
+        ])
+        conn.execute(Lecture.__table__.insert(), [
+            {"title": f"Lecture {i}", "content": LECTURE_TEXT} for i in range(lectures)
+        ])
+        conn.execute(Feedback.__table__.insert(), [
+            {"id": str(uuid.uuid4()), "user_id": random.choice(user_ids), "rating": random.randint(1, 5),
+             "feedback_text": "Seeded feedback for the benchmark"}
+            for _ in range(users * 2)
+        ])
+    engine.dispose()
+    return user_ids
+
+
+def make_sessions(profile: str, path: Path, pool_size: int):
+    url = f"sqlite+aiosqlite:///{path}"
+    if profile == "production":
+        writer, reader, factory = create_sqlite_engines(url)
+        return factory, [writer, reader], writer
+    engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=0)
+    factory = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return factory, [engine], None
+
+
+async def operation(factory, kind: str, user_ids: list, lectures: int, rng: random.Random) -> None:
+    async with factory() as db:
+        if kind == "login":
+            await db.scalar(select(User).where(User.student_id == str(10 ** 8 + rng.randrange(len(user_ids)))))
+        elif kind == "feedback_list":
+            (await db.scalars(select(Feedback).where(Feedback.user_id == rng.choice(user_ids)))).all()
+        elif kind == "lecture_page":
+            (await db.scalars(select(Lecture).offset(rng.randrange(max(1, lectures - 10))).limit(10))).all()
+        elif kind == "lecture":
+            await db.get(Lecture, rng.randint(1, lectures))
+        elif kind == "register":
+            uid = uuid.uuid4().hex
+            db.add(User(email=f"{uid}@example.edu", student_id=uid[:12], college_id="BENCH", password_hash="x"))
+            await db.commit()
+        elif kind == "feedback":
+            db.add(Feedback(user_id=rng.choice(user_ids), rating=rng.randint(1, 5),
+                            feedback_text="Benchmark feedback submission"))
+            await db.commit()
+        else:  # lecture_edit
+            await db.execute(update(Lecture).where(Lecture.id == rng.randint(1, lectures))
+                             .values(content=LECTURE_TEXT + uuid.uuid4().hex))
+            await db.commit()
+
+
+async def run_profile(profile: str, args) -> dict:
+    path = Path(tempfile.mkdtemp()) / f"{profile}.db"
+    user_ids = seed(path, args.users, args.lectures)
+    factory, engines, writer = make_sessions(profile, path, args.pool_size)
+
+    reads = ["login", "feedback_list", "lecture_page", "lecture"]
+    writes = ["register", "feedback", "lecture_edit"]
+    rng = random.Random(7)
+    plan = [rng.choice(writes) if rng.random() < args.write_ratio else rng.choice(reads)
+            for _ in range(args.operations)]
+    queue = asyncio.Queue()
+    for kind in plan:
+        queue.put_nowait(kind)
+
+    latencies = {"read": [], "write": []}
+    locked = 0
+
+    async def worker(seed_value: int):
+        nonlocal locked
+        worker_rng = random.Random(seed_value)
+        while not queue.empty():
+            kind = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                await operation(factory, kind, user_ids, args.lectures, worker_rng)
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+                continue
+            latencies["write" if kind in writes else "read"].append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.workers)))
+    wall = time.perf_counter() - started
+
+    wal = path.with_name(path.name + "-wal")
+    wal_bytes = wal.stat().st_size if wal.exists() else None
+    if writer is not None:
+        await checkpoint(writer, "TRUNCATE")
+    for engine in engines:
+        await engine.dispose()
+    return {"wall": wall, "latencies": latencies, "locked": locked, "wal_bytes": wal_bytes}
+
+
+def report(profile: str, result: dict, operations: int) -> None:
+    def pct(values, q):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+
+    print(f"\n{profile}: {operations / result['wall']:.0f} ops/s ({result['wall']:.2f}s), "
+          f"{result['locked']} failed with 'database is locked'")
+    for kind, values in result["latencies"].items():
+        if values:
+            print(f"  {kind:<6} n={len(values):<6} p50 {statistics.median(values) * 1000:7.2f} ms   "
+                  f"p95 {pct(values, 0.95):7.2f} ms   p99 {pct(values, 0.99):7.2f} ms")
+    if result["wal_bytes"] is not None:
+        print(f"  WAL size before the final checkpoint: {result['wal_bytes'] / 1024:.0f} KB")
+
+
+async def main(args) -> None:
+    print(f"{args.operations} operations from {args.workers} workers, "
+          f"{args.write_ratio:.0%} writes, {args.users} users, {args.lectures} lectures")
+    results = {}
+    for profile in ("default", "production"):
+        results[profile] = await run_profile(profile, args)
+        report(profile, results[profile], args.operations)
+    print(f"\nproduction vs default throughput: {results['default']['wall'] / results['production']['wall']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--operations", type=int, default=3000)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--lectures", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=10, help="connections in the default profile's pool")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+# File: backend/scripts/benchmark_vector_stores.py
+"""
+Compare the Chroma and NumPy vector store backends on the lecture set.
+
+Usage:
+    python scripts/benchmark_vector_stores.py [--queries 200] [--k 2] [--synthetic]
+
+Chunk vectors come from the (cached) OpenAI embeddings, so after one ingest
+no API calls are made. --synthetic uses random vectors instead, which needs
+no API key. Queries are perturbed chunk vectors, so the benchmark itself
+never calls the embeddings API.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from rag.vector_store import ChromaVectorStore, NumpyVectorStore
+
+EMBEDDING_DIM = 1536
+
+
+def load_chunks():
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, length_function=len)
+    texts, metadatas, ids = [], [], []
+    for lecture_id, path in enumerate(sorted((backend_dir / "data" / "lectures").glob("*.txt")), start=1):
+        for i, chunk in enumerate(splitter.split_text(path.read_text(encoding="utf-8"))):
+            texts.append(chunk)
+            metadatas.append({"lecture_id": lecture_id, "chunk_id": i, "source": f"lecture_{lecture_id}"})
+            ids.append(f"{lecture_id}:{i}")
+    return texts, metadatas, ids
+
+
+def embed_chunks(texts, synthetic: bool):
+    if synthetic:
+        rng = np.random.default_rng(0)
+        return rng.standard_normal((len(texts), EMBEDDING_DIM)).astype(np.float32).tolist(), None
+    from rag.processor import RAGProcessor
+    embeddings = RAGProcessor().embeddings
+    return embeddings.embed_documents(texts), embeddings
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def bench_backend(name, factory, texts, metadatas, ids, vectors, queries, k):
+    start = time.perf_counter()
+    store = factory()
+    store.add_texts(texts, metadatas=metadatas, ids=ids, embeddings=vectors)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = factory()  # reopen from disk
+    open_s = time.perf_counter() - start
+
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(store.similarity_search_by_vector(query, k=k))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    store.similarity_search_by_vectors(queries, k=k)
+    batch_s = time.perf_counter() - start
+
+    print(f"\n{name}")
+    print(f"  build + persist:     {build_s * 1000:9.1f} ms")
+    print(f"  open from disk:      {open_s * 1000:9.1f} ms")
+    print(f"  query p50 / p95:     {percentile_ms(latencies, 50):9.3f} / {percentile_ms(latencies, 95):.3f} ms")
+    print(f"  batch of {len(queries):<4}       {batch_s * 1000:9.1f} ms "
+          f"({len(queries) / batch_s:,.0f} queries/s)")
+    return [[r["id"] for r in result] for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--synthetic", action="store_true", help="use random vectors instead of embeddings")
+    args = parser.parse_args()
+
+    texts, metadatas, ids = load_chunks()
+    vectors, embeddings = embed_chunks(texts, args.synthetic)
+    print(f"{len(texts)} chunks, {len(vectors[0])}-dimensional vectors, k={args.k}")
+
+    rng = np.random.default_rng(1)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    picks = rng.integers(0, len(matrix), size=args.queries)
+    noise = rng.standard_normal((args.queries, matrix.shape[1])).astype(np.float32) * 0.01
+    queries = (matrix[picks] + noise).tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        numpy_ids = bench_backend(
+            "numpy (exact, mmap)",
+            lambda: NumpyVectorStore(embeddings, directory=str(Path(tmp) / "numpy")),
+            texts, metadatas, ids, vectors, queries, args.k
+        )
+        chroma_ids = bench_backend(
+            "chroma (HNSW)",
+            lambda: ChromaVectorStore(embeddings, persist_directory=str(Path(tmp) / "chroma")),
+            texts, metadatas, ids, vectors, queries, args.k
+        )
+
+    overlap = np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(numpy_ids, chroma_ids)])
+    print(f"\nChroma recall@{args.k} against exact search: {overlap:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# File: backend/scripts/check_lexical_shortcut.py
+"""
+Regression check for the lexical shortcut (rag/lexical.py).
+
+Ordinary questions that merely capitalize a language or a name must go
+through the hybrid search; only rare identifier-like terms may skip it.
+Checks the term extraction and the rarity cutoff against a small
+throwaway index, and exits non-zero on any mismatch.
+
+Usage:
+    python scripts/check_lexical_shortcut.py
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from rag.lexical import LexicalIndex, exact_terms
+
+# question -> expected exact terms
+EXACT_TERMS = {
+    "How do I read a file in Python?": [],
+    "Explain Big O notation": [],
+    "What is the difference between Java and C++?": [],
+    "How does Dijkstra's algorithm work?": [],
+    "What does BST stand for?": [],
+    "What was covered in Lectures32?": ["lectures32"],
+    "When should I use a hash_map?": ["hash_map"],
+    "What does getNextNode return?": ["getnextnode"],
+}
+
+MAX_DOC_FRACTION = 0.02
+
+
+def build_index(path: Path) -> LexicalIndex:
+    index = LexicalIndex(str(path))
+    chunks = [
+        {"id": f"common-{i}", "text": f"Python3 example {i}: reading files and loops", "metadata": {"lecture_id": i}}
+        for i in range(200)
+    ]
+    chunks.append({
+        "id": "rare",
+        "text": "getNextNode returns the following node of a linked list",
+        "metadata": {"lecture_id": 999}
+    })
+    index.add(chunks)
+    return index
+
+
+def main() -> int:
+    failures = []
+    for question, expected in EXACT_TERMS.items():
+        terms = exact_terms(question)
+        if terms != expected:
+            failures.append(f"exact_terms({question!r}) = {terms}, expected {expected}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        index = build_index(Path(scratch) / "lexical_index.json")
+        # A term in every chunk only boosts the hybrid search; a term in one chunk takes the shortcut
+        for question, expected in {
+            "Show a Python3 example": [],
+            "What does getNextNode return?": ["getnextnode"],
+            "What is lecture99_notes?": [],  # Not indexed at all
+        }.items():
+            rare = index.rare_terms(exact_terms(question), MAX_DOC_FRACTION)
+            if rare != expected:
+                failures.append(f"rare_terms for {question!r} = {rare}, expected {expected}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# File: backend/scripts/elevenlabs_stub.py
+"""
+Local stand-in for the ElevenLabs streaming TTS endpoint.
+
+Answers POST /v1/text-to-speech/{voice_id}/stream after a fixed latency with
+fake MP3 bytes, streamed in chunks, sized roughly like real speech for the
+text. Run it and point the backend at it:
+
+    python scripts/elevenlabs_stub.py --port 8089 --latency 0.8
+    ELEVENLABS_BASE_URL=http://localhost:8089 ELEVENLABS_API_KEY=stub ELEVENLABS_VOICE_ID=stub ...
+"""
+import argparse
+import asyncio
+import logging
+
+from aiohttp import web
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ~1 KB of MP3 per 10 characters of text at ElevenLabs' default bitrate
+BYTES_PER_CHAR = 100
+CHUNK_SIZE = 4096
+
+
+def make_app(latency: float, chunk_delay: float) -> web.Application:
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def synthesize(request: web.Request) -> web.StreamResponse:
+        if not request.headers.get("xi-api-key"):
+            return web.json_response({"detail": "missing xi-api-key"}, status=401)
+        payload = await request.json()
+        text = payload.get("text", "")
+
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(latency)
+            response = web.StreamResponse(headers={"Content-Type": "audio/mpeg"})
+            await response.prepare(request)
+            remaining = max(len(text) * BYTES_PER_CHAR, CHUNK_SIZE)
+            while remaining > 0:
+                size = min(CHUNK_SIZE, remaining)
+                await response.write(b"\xff\xfb" + b"\x00" * (size - 2))
+                remaining -= size
+                if chunk_delay:
+                    await asyncio.sleep(chunk_delay)
+            await response.write_eof()
+            return response
+        finally:
+            stats["in_flight"] -= 1
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_post("/v1/text-to-speech/{voice_id}/stream", synthesize)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.8, help="seconds before the first audio byte")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="seconds between streamed chunks")
+    args = parser.parse_args()
+    logger.info(f"ElevenLabs stub listening on http://{args.host}:{args.port}")
+    web.run_app(make_app(args.latency, args.chunk_delay), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# File: backend/scripts/ingest_lectures.py
+"""
+Concurrent bulk ingestion of lecture files.
+
+Runs as a staged pipeline:
+  1. read + chunk    - files are split in a process pool, then near-duplicate
+                       chunks across lectures are collapsed
+  2. embed           - chunks are embedded with batched async requests,
+                       bounded concurrency and backoff on 429s
+  3. write           - Lecture rows are committed in one transaction and
+                       vectors are written to the store in bulk
+
+Chunking and embedding overlap: a file's chunks are queued for embedding as
+soon as its chunking finishes. Unchanged files (per the indexer manifest) are
+skipped unless --full is given.
+
+Usage:
+    python scripts/ingest_lectures.py [--dir data/lectures] [--workers 4]
+        [--batch-size 100] [--concurrency 4] [--max-retries 6] [--full]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from database import SessionLocal
+from rag.batch_embedder import AsyncBatchEmbedder
+from rag.indexer import LectureIndexer
+from rag.processor import RAGProcessor, build_chunk_records, make_text_splitter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_and_chunk(path: str) -> Tuple[str, str, List[str]]:
+    """Process-pool worker: read one lecture file and split it into chunk texts"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return os.path.basename(path), content, make_text_splitter().split_text(content)
+
+
+async def ingest(args) -> None:
+    started = time.perf_counter()
+    lectures_dir = Path(args.dir)
+    paths = sorted(lectures_dir.glob("*.txt"))
+    if not paths:
+        print(f"No lecture files found in {lectures_dir}")
+        return
+
+    processor = RAGProcessor()
+    indexer = LectureIndexer(processor)
+    embedder = AsyncBatchEmbedder(
+        processor.embeddings,
+        batch_size=args.batch_size,
+        max_concurrency=args.concurrency,
+        max_retries=args.max_retries
+    )
+    db = SessionLocal()
+
+    embed_queue: asyncio.Queue = asyncio.Queue()
+    lectures: Dict[str, Dict] = {}
+    all_chunks: List[Dict] = []
+    all_vectors: List[List[float]] = []
+    stage_seconds = {"chunk": 0.0, "embed": 0.0, "write": 0.0}
+    skipped = 0
+    dedup = processor.deduplicator.session() if processor.deduplicator else None
+
+    async def embed_worker():
+        while True:
+            chunks = await embed_queue.get()
+            try:
+                if chunks is None:
+                    return
+                vectors = await embedder.embed([chunk["text"] for chunk in chunks])
+                all_chunks.extend(chunks)
+                all_vectors.extend(vectors)
+            finally:
+                embed_queue.task_done()
+
+    try:
+        # Stage 1 -> 2: chunk in worker processes, hand each file to the embedders as it completes
+        embed_tasks = [asyncio.create_task(embed_worker()) for _ in range(args.concurrency)]
+        loop = asyncio.get_running_loop()
+        chunk_start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [loop.run_in_executor(pool, read_and_chunk, str(path)) for path in paths]
+            for future in asyncio.as_completed(futures):
+                filename, content, texts = await future
+                content_hash = indexer.content_hash(content)
+                if not args.full and indexer.is_unchanged(filename, content_hash):
+                    skipped += 1
+                    continue
+
+                entry = indexer.manifest["lectures"].get(filename)
+                lecture = indexer.get_or_create_lecture(db, filename, entry and entry["lecture_id"], content)
+                if entry and entry["lecture_id"] != lecture.id:
+                    # Row was recreated; drop chunks stored under the old id
+                    processor.delete_lecture(entry["lecture_id"])
+
+                chunks = build_chunk_records(lecture.id, texts, title=filename)
+                if dedup is not None:
+                    # Metadata of earlier canonical chunks is updated in place, which is
+                    # fine because nothing is written to the store before stage 3
+                    chunks = dedup.add(chunks)
+                lectures[filename] = {"lecture_id": lecture.id, "hash": content_hash, "chunks": chunks}
+                await embed_queue.put(chunks)
+        stage_seconds["chunk"] = time.perf_counter() - chunk_start
+
+        embed_start = time.perf_counter()
+        for _ in embed_tasks:
+            await embed_queue.put(None)
+        await asyncio.gather(*embed_tasks)
+        stage_seconds["embed"] = time.perf_counter() - embed_start
+
+        # Stage 3: bulk writes
+        write_start = time.perf_counter()
+        if all_chunks:
+            processor.bulk_replace_lectures(all_chunks, all_vectors)
+        if lectures:
+            db.commit()
+            for filename, lecture in lectures.items():
+                indexer.record(filename, lecture["lecture_id"], lecture["hash"], lecture["chunks"])
+            indexer.save()
+        stage_seconds["write"] = time.perf_counter() - write_start
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error ingesting lectures: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print("\nIngestion report")
+    print(f"  files:            {len(paths)} found, {len(lectures)} ingested, {skipped} unchanged")
+    print(f"  chunks:           {len(all_chunks)}")
+    if dedup is not None:
+        print(f"  deduplication:    {dedup.report}")
+    print(f"  embeddings:       {embedder.embedded} from API in {embedder.api_calls} requests, "
+          f"{embedder.cache_hits} from cache, {embedder.rate_limited} rate-limited retries")
+    print(f"  stage time:       chunk {stage_seconds['chunk']:.2f}s (overlaps embed), "
+          f"embed drain {stage_seconds['embed']:.2f}s, write {stage_seconds['write']:.2f}s")
+    print(f"  total time:       {elapsed:.2f}s")
+    avg_request = embedder.api_seconds / embedder.api_calls if embedder.api_calls else 0.0
+    print(f"  throughput:       {len(all_chunks) / elapsed:,.1f} chunks/sec, "
+          f"{embedder.embedded / elapsed:,.1f} embeddings/sec "
+          f"(avg embedding request {avg_request * 1000:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=str(backend_dir / "data" / "lectures"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="chunking processes")
+    parser.add_argument("--batch-size", type=int, default=100, help="chunks per embedding request")
+    parser.add_argument("--concurrency", type=int, default=4, help="embedding requests in flight")
+    parser.add_argument("--max-retries", type=int, default=6, help="retries per batch on HTTP 429")
+    parser.add_argument("--full", action="store_true", help="re-ingest files the manifest says are unchanged")
+    asyncio.run(ingest(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,8 @@ def load_all_lectures():
                 print(f"  ↳ Error processing {lecture_file.name}: {str(e)}")
         
         print(f"\nSuccessfully processed {processed_count} out of {len(lecture_files)} lecture files")
+        if hasattr(processor.embeddings, "stats"):
+            print(f"Embedding cache: {processor.embeddings.stats()}")
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,98 @@
+# File: backend/scripts/load_test_tts.py
+"""
+Load test for TextToSpeech: fires N concurrent conversions and reports
+whether they overlapped or ran one after another.
+
+With requests overlapping, wall time stays close to a single request's
+latency (up to TTS_MAX_CONCURRENCY at a time). When they run in series,
+wall time is the sum of all the requests.
+
+Usage (against the local stub, which is started automatically with --stub):
+    python scripts/load_test_tts.py --stub --requests 16
+    python scripts/load_test_tts.py --requests 8        # uses ELEVENLABS_BASE_URL
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+SAMPLE_TEXT = (
+    "A binary search tree keeps smaller keys in the left subtree and larger keys "
+    "in the right subtree, so lookups take logarithmic time when the tree is balanced."
+)
+
+
+async def run(args) -> None:
+    from audio.text_to_speech import TextToSpeech
+    from app.config import settings
+
+    tts = TextToSpeech()
+    durations = []
+    # Unique text per run so the audio cache doesn't answer the requests
+    run_id = uuid.uuid4().hex[:8]
+
+    async def one(i: int):
+        start = time.perf_counter()
+        path = await tts.convert(f"{SAMPLE_TEXT} ({run_id}-{i})")
+        durations.append(time.perf_counter() - start)
+        if not args.keep:
+            path.unlink()
+
+    # Warm the connection pool so the test measures steady-state behaviour
+    await one(-1)
+    durations.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - started
+    await TextToSpeech.close()
+
+    serial = sum(durations)
+    p95 = sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]
+    print(f"\nTTS load test against {settings.ELEVENLABS_BASE_URL}")
+    print(f"  requests:         {args.requests} concurrent (limit {settings.TTS_MAX_CONCURRENCY})")
+    print(f"  per request:      p50 {statistics.median(durations) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+    print(f"  wall time:        {wall:.2f}s (sum of request times {serial:.2f}s)")
+    print(f"  overlap:          {serial / wall:.1f}x "
+          f"({'overlapping' if serial / wall > 1.5 else 'serialized'})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--stub", action="store_true", help="start scripts/elevenlabs_stub.py and test against it")
+    parser.add_argument("--stub-port", type=int, default=8089)
+    parser.add_argument("--stub-latency", type=float, default=0.8)
+    parser.add_argument("--keep", action="store_true", help="keep the generated audio files")
+    args = parser.parse_args()
+
+    stub = None
+    if args.stub:
+        import subprocess
+        # Settings are read at import time, so set these before importing the backend
+        os.environ["ELEVENLABS_BASE_URL"] = f"http://127.0.0.1:{args.stub_port}"
+        os.environ.setdefault("ELEVENLABS_API_KEY", "stub")
+        os.environ.setdefault("ELEVENLABS_VOICE_ID", "stub")
+        stub = subprocess.Popen([
+            sys.executable, str(backend_dir / "scripts" / "elevenlabs_stub.py"),
+            "--port", str(args.stub_port), "--latency", str(args.stub_latency)
+        ])
+        time.sleep(1.0)
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+
+
+if __name__ == "__main__":
+    main()
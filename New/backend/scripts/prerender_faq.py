@@ -0,0 +1,50 @@
+# File: backend/scripts/prerender_faq.py
+"""
+Render audio for every FAQ answer into the TTS cache ahead of deployment,
+so the server's first FAQ hits are served without calling ElevenLabs.
+The example questions are embedded into the embedding cache too, so the
+server loads their vectors at startup without calling OpenAI.
+
+Usage:
+    python scripts/prerender_faq.py
+"""
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from langchain_openai import OpenAIEmbeddings
+
+from app.config import settings
+from audio.text_to_speech import TextToSpeech
+from qa.faq import FAQTable
+from rag.embedding_cache import CachedEmbeddings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    # Stored vectors only help the server when they land in its embedding cache
+    embeddings = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(openai_api_key=settings.OPENAI_API_KEY),
+            path=os.path.join(settings.CACHE_DIR, "embeddings.sqlite3"),
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+        )
+    faq = FAQTable(settings.FAQ_PATH, embeddings, TextToSpeech())
+    try:
+        await faq.embed_examples()
+        rendered = await faq.prerender()
+    finally:
+        await TextToSpeech.close()
+    print(f"{len(faq.intents)} FAQ intents, {rendered} answers rendered")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
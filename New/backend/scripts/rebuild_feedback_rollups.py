@@ -0,0 +1,52 @@
+# File: backend/scripts/rebuild_feedback_rollups.py
+"""
+Bring an existing database up to date for the paginated feedback API:
+create the feedback_rollups table and the feedback pagination indexes if
+they are missing, then recompute every rollup row from the feedback table.
+
+New databases get both from init_db and keep their rollups current as
+feedback is submitted; run this once on a database created before them,
+or whenever the rollups need to be recomputed.
+
+Usage:
+    python scripts/rebuild_feedback_rollups.py
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from database import SessionLocal, engine
+from database.models import Feedback, FeedbackRollup
+from database.rollups import rebuild_rollups
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    FeedbackRollup.__table__.create(bind=engine, checkfirst=True)
+    for index in Feedback.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    logger.info("Feedback rollup table and indexes are in place")
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_rollups(db)
+        logger.info(f"Feedback rollups rebuilt: {rows} (category, day) rows")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error rebuilding feedback rollups: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    main()
@@ -1,4 +1,5 @@
 # test_rag.py
+import time
 import requests
 
 # Your lecture content
@@ -25,6 +26,15 @@ response = requests.post(
 
 print("Lecture Added:", response.json())
 
+# The lecture is chunked and embedded in the background; wait for its job
+job_url = response.headers["Location"]
+while True:
+    job = requests.get(job_url).json()
+    print(f"Ingestion {job['status']}: {job['chunks_done']}/{job['chunks_total'] or '?'} chunks")
+    if job["status"] in ("succeeded", "failed"):
+        break
+    time.sleep(1)
+
 # Test RAG with a question
 test_question = "What are the key concepts in machine learning?"
 response = requests.post(
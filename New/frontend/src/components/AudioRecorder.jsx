@@ -1,6 +1,7 @@
 // frontend/src/components/AudioRecorder.jsx
 import React, { useState, useRef, useEffect } from 'react';
 import { Mic, MicOff, Loader } from 'lucide-react';
+import { SpeechStream } from '../services/speechStream';
 const SILENCE_THRESHOLD = 0.08; // ← Adjust based on testing
 
 export const AudioRecorder = ({
@@ -26,6 +27,7 @@ export const AudioRecorder = ({
     const hasManuallyStopped = useRef(false); // Prevents double stop
     const hasCompleted = useRef(false);
     const stream = useRef(null);
+    const speechStream = useRef(null); // Live server-side transcription, when available
 
     const finalizeRecording = () => {
         if (hasCompleted.current) {
@@ -49,12 +51,29 @@ export const AudioRecorder = ({
         if (stream.current) {
             stream.current.getTracks().forEach(track => track.stop());
         }
-        
-        try {
-            onRecordingComplete?.(audioBlob, finalTranscript);
-            console.log("✅ Recording sent to backend successfully");
-        } catch (err) {
-            console.error("❌ Error in onRecordingComplete:", err);
+
+        const complete = (text, options) => {
+            try {
+                onRecordingComplete?.(audioBlob, text, options);
+                console.log("✅ Recording sent to backend successfully");
+            } catch (err) {
+                console.error("❌ Error in onRecordingComplete:", err);
+            }
+        };
+
+        if (speechStream.current) {
+            // The server has been transcribing all along; its final transcript
+            // arrives moments after the student stops, so no upload is needed
+            const live = speechStream.current;
+            speechStream.current = null;
+            live.finish()
+                .then(text => complete(text, { serverTranscript: text }))
+                .catch(err => {
+                    console.error("❌ Live transcription failed, uploading recording:", err);
+                    complete(finalTranscript);
+                });
+        } else {
+            complete(finalTranscript);
         }
     };
 
@@ -72,6 +91,7 @@ export const AudioRecorder = ({
             if (stream.current) {
                 stream.current.getTracks().forEach(track => track.stop());
             }
+            speechStream.current?.close();
         };
     }, []);
 
@@ -194,13 +214,28 @@ export const AudioRecorder = ({
             setSilenceTime(0);
             setAudioData([]);
 
-            // Initialize speech recognition
-            initializeRecognition();
+            // Stream audio to the server for live transcription; fall back to
+            // the browser's speech recognition if the stream can't be opened
+            const updateTranscript = (text) => {
+                setTranscript(text);
+                onTranscriptUpdate?.(text);
+            };
+            try {
+                speechStream.current = new SpeechStream({ onPartial: updateTranscript, onFinal: updateTranscript });
+                await speechStream.current.start(stream.current);
+            } catch (err) {
+                console.warn("⚠️ Live transcription unavailable, using browser recognition:", err);
+                speechStream.current?.close();
+                speechStream.current = null;
+                initializeRecognition();
+            }
 
             // Start recording
             console.log("🎙️ Starting recording");
             mediaRecorder.current.start(500); // Collect data every 500ms for more chunks
-            recognitionRef.current?.start();
+            if (!speechStream.current) {
+                recognitionRef.current?.start();
+            }
             setIsRecording(true);
             onRecordingStart?.();
             
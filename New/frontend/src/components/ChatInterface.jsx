@@ -79,7 +79,7 @@ useEffect(() => {
         setTranscript(newTranscript);
     };
 
-    const handleAudioSubmit = async (audioBlob, finalTranscript) => {
+    const handleAudioSubmit = async (audioBlob, finalTranscript, { serverTranscript } = {}) => {
         console.log("🎧 handleAudioSubmit called with transcript:", finalTranscript);
         setIsRecording(false); // Ensure UI shows we're not recording anymore
 
@@ -94,7 +94,8 @@ useEffect(() => {
             await sendMessage({ 
                 type: 'audio', 
                 content: audioBlob,
-                transcript: finalTranscript 
+                transcript: finalTranscript,
+                serverTranscript
             });
             console.log("✅ Audio message sent successfully");
 
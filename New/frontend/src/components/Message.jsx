@@ -112,10 +112,11 @@ export const Message = ({ message, isLatest }) => {
                     </div>
                 )}
                 
-                {message.audioUrl && (
+                {(message.audioUrl || message.audioSegments?.length > 0) && (
                     <div className="mt-2 transition-all duration-300 transform hover:translate-y-0.5">
                         <ResponsePlayer 
                             audioUrl={message.audioUrl}
+                            audioSegments={message.audioSegments}
                             autoPlay={isLatest}
                         />
                     </div>
@@ -1,16 +1,41 @@
 // File: frontend/src/components/ResponsePlayer.jsx
 import React, { useState, useRef, useEffect } from 'react';
 
-export const ResponsePlayer = ({ audioUrl, autoPlay = false, onComplete, onTranscriptionEnd }) => {
+// Plays either a single audioUrl or audioSegments, the per-sentence clips of
+// a streamed answer, one after another as they arrive
+export const ResponsePlayer = ({ audioUrl, audioSegments, autoPlay = false, onComplete, onTranscriptionEnd }) => {
     const [isPlaying, setIsPlaying] = useState(false);
     const [error, setError] = useState(null);
     const [loading, setLoading] = useState(false);
     const [hasAutoPlayed, setHasAutoPlayed] = useState(false);  // Track first auto-play
+    const [segmentIndex, setSegmentIndex] = useState(0);
+    const [waitingForSegment, setWaitingForSegment] = useState(false);
+    const continueRef = useRef(false);  // Play the next segment once it loads
     const audioRef = useRef(null);
 
+    const segmentCount = audioSegments ? audioSegments.length : 0;
+    const src = segmentCount ? audioSegments[segmentIndex] : audioUrl;
+
+    // Advance to a segment that arrived while the previous one was playing
+    useEffect(() => {
+        if (waitingForSegment && segmentIndex + 1 < segmentCount) {
+            setWaitingForSegment(false);
+            continueRef.current = true;
+            setSegmentIndex(segmentIndex + 1);
+        }
+    }, [waitingForSegment, segmentIndex, segmentCount]);
+
+    // Keep playing through the segments
+    useEffect(() => {
+        if (continueRef.current && audioRef.current) {
+            continueRef.current = false;
+            audioRef.current.play().catch(err => console.error('Segment play error:', err));
+        }
+    }, [segmentIndex]);
+
     // Auto-play when the audio URL changes (first time only)
     useEffect(() => {
-        if (audioUrl && autoPlay && audioRef.current && !hasAutoPlayed) {
+        if (src && autoPlay && audioRef.current && !hasAutoPlayed) {
             setLoading(true);
             audioRef.current.play()
                 .then(() => {
@@ -26,10 +51,19 @@ export const ResponsePlayer = ({ audioUrl, autoPlay = false, onComplete, onTrans
                     setLoading(false);
                 });
         }
-    }, [audioUrl, autoPlay, hasAutoPlayed, onTranscriptionEnd]);
+    }, [src, autoPlay, hasAutoPlayed, onTranscriptionEnd]);
 
     // Reset transcribing state after audio ends
     const handleAudioEnded = () => {
+        if (segmentCount) {
+            if (segmentIndex + 1 < segmentCount) {
+                continueRef.current = true;
+                setSegmentIndex(segmentIndex + 1);
+                return;
+            }
+            // More segments may still be on their way
+            setWaitingForSegment(true);
+        }
         setIsPlaying(false);
         if (onComplete) onComplete();  // Notify parent that playback is complete
     };
@@ -40,6 +74,13 @@ export const ResponsePlayer = ({ audioUrl, autoPlay = false, onComplete, onTrans
             if (isPlaying) {
                 audioRef.current.pause();
             } else {
+                setWaitingForSegment(false);
+                if (segmentCount && audioRef.current.ended) {
+                    // Replay the answer from the first sentence
+                    continueRef.current = true;
+                    setSegmentIndex(0);
+                    return;
+                }
                 setLoading(true);
                 audioRef.current.play()
                     .then(() => {
@@ -62,7 +103,7 @@ export const ResponsePlayer = ({ audioUrl, autoPlay = false, onComplete, onTrans
 
             <audio
                 ref={audioRef}
-                src={audioUrl}
+                src={src}
                 preload="metadata"
                 onPlay={() => setIsPlaying(true)}
                 onPause={() => setIsPlaying(false)}
@@ -76,7 +117,7 @@ export const ResponsePlayer = ({ audioUrl, autoPlay = false, onComplete, onTrans
 
             <button
                 onClick={togglePlay}
-                disabled={!audioUrl || loading}
+                disabled={!src || loading}
                 className={`px-4 py-2 rounded-md ${isPlaying ? 'bg-red-500' : 'bg-blue-500'} text-white`}
             >
                 {loading ? 'Loading...' : isPlaying ? 'Pause' : 'Play Response'}
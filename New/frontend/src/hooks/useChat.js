@@ -14,50 +14,71 @@ export const useChat = () => {
         };
     }, []);
 
-    const sendMessage = useCallback(async ({ type, content }) => {
-        try {
-            setIsLoading(true);
-            setError(null);
-
-            let userMessage = '';
-            let response;
+    // Adds an assistant message and fills it in from an answer stream.
+    // `request` starts the stream (api.streamQuestion or api.askAudio) with the handlers.
+    const streamAnswer = useCallback(async (request, handlers = {}) => {
+        const updateLast = (changes) => setMessages(prev => {
+            const last = prev[prev.length - 1];
+            return [...prev.slice(0, -1), { ...last, ...changes(last) }];
+        });
 
-            if (type === 'audio') {
-                // First, convert audio to text
-                const textResult = await api.sendAudio(content);
-                userMessage = textResult.text;
-                
-                // Add the transcribed message to the chat immediately
+        await request({
+            ...handlers,
+            onSources: ({ sources }) => {
+                setIsLoading(false);
                 setMessages(prev => [...prev, {
-                    sender: 'user',
-                    text: userMessage,
+                    sender: 'assistant',
+                    text: '',
+                    sources,
                     timestamp: new Date()
                 }]);
+            },
+            onToken: ({ text }) => updateLast(last => ({ text: last.text + text })),
+            // Sentence audio arrives in order while the answer is still generating
+            onAudio: ({ url }) => url && updateLast(last => ({
+                audioSegments: [...(last.audioSegments || []), url]
+            })),
+            onDone: ({ confidence_score, audio_url }) => updateLast(() => ({
+                confidence_score,
+                audioUrl: audio_url
+            })),
+            onError: ({ message }) => setError(message),
+        });
+    }, []);
 
-                // Then send the transcribed text to get response
-                response = await api.sendQuestion(userMessage);
-            } else {
-                userMessage = content;
-                // Add the text message to chat immediately
-                setMessages(prev => [...prev, {
-                    sender: 'user',
-                    text: userMessage,
-                    timestamp: new Date()
-                }]);
+    const sendMessage = useCallback(async ({ type, content, serverTranscript }) => {
+        const addUserMessage = (text) => setMessages(prev => [...prev, {
+            sender: 'user',
+            text,
+            timestamp: new Date()
+        }]);
 
-                // Send the text to get response
-                response = await api.sendQuestion(content);
+        try {
+            setIsLoading(true);
+            setError(null);
+
+            if (type === 'audio' && serverTranscript === undefined) {
+                // One request: the server transcribes the recording and streams
+                // the answer, sending the transcript first
+                await streamAnswer(
+                    (handlers) => api.askAudio(content, handlers),
+                    { onTranscript: ({ text }) => addUserMessage(text) }
+                );
+                return;
             }
 
-            // Add the assistant's response
-            setMessages(prev => [...prev, {
-                sender: 'assistant',
-                text: response.answer,
-                audioUrl: response.audio_url,
-                sources: response.sources,
-                confidence_score: response.confidence_score,
-                timestamp: new Date()
-            }]);
+            // Typed questions, or spoken ones the live stream already transcribed
+            const question = type === 'audio' ? serverTranscript.trim() : content;
+            if (!question) {
+                // The live stream heard only silence; don't ask about nothing
+                setError('No speech detected in the recording');
+                return;
+            }
+            // Add the message to chat immediately
+            addUserMessage(question);
+
+            // Stream the answer so it appears as it is generated
+            await streamAnswer((handlers) => api.streamQuestion(question, handlers));
 
         } catch (err) {
             setError(err.message);
@@ -65,7 +86,7 @@ export const useChat = () => {
         } finally {
             setIsLoading(false);
         }
-    }, []);
+    }, [streamAnswer]);
 
     return { messages, isLoading, error, sendMessage };
 };
\ No newline at end of file
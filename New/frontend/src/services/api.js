@@ -6,6 +6,43 @@ const API_ENDPOINT = `${API_BASE_URL}${API_PATH}`;
 
 console.log('API Endpoint:', API_ENDPOINT);
 
+// Dispatches Server-Sent Events from a fetch response to handlers keyed by event name
+const readEventStream = async (response, handlers) => {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of raw.split('\n')) {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            }
+            if (data && handlers[event]) {
+                handlers[event](JSON.parse(data));
+            }
+        }
+    }
+};
+
+// Signed-in students send their token, so the server's per-student request
+// limits apply to them rather than to their network address
+const authHeaders = () => {
+    const token = localStorage.getItem('token');
+    return token ? { 'Authorization': `Bearer ${token}` } : {};
+};
+
 export const api = {
     async sendQuestion(question) {
         try {
@@ -13,6 +50,7 @@ export const api = {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
+                    ...authHeaders(),
                 },
                 body: JSON.stringify({ question }),
                 credentials: 'include', // Include cookies for CORS with credentials
@@ -29,6 +67,57 @@ export const api = {
         }
     },
 
+    // Streams an answer over Server-Sent Events. Handlers receive the parsed
+    // data of each event: onSources({ sources }), onToken({ text }),
+    // onAudio({ index, url }) for each spoken sentence,
+    // onDone({ confidence_score, audio_url, audio_segments }) and onError({ message }).
+    async streamQuestion(question, { onSources, onToken, onAudio, onDone, onError } = {}) {
+        const response = await fetch(`${API_ENDPOINT}/qa/ask/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+                ...authHeaders(),
+            },
+            body: JSON.stringify({ question }),
+            credentials: 'include', // Include cookies for CORS with credentials
+        });
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        await readEventStream(response, {
+            sources: onSources, token: onToken, audio: onAudio, done: onDone, error: onError
+        });
+    },
+
+    // Asks a spoken question in one request: the server transcribes the
+    // recording and streams the answer. Handlers are those of streamQuestion
+    // plus onTranscript({ text }), which arrives first.
+    async askAudio(audioBlob, { onTranscript, onSources, onToken, onAudio, onDone, onError } = {}) {
+        const formData = new FormData();
+        formData.append('audio', audioBlob, 'recording.webm');
+
+        const response = await fetch(`${API_ENDPOINT}/qa/ask-audio?stream=true`, {
+            method: 'POST',
+            headers: {
+                'Accept': 'text/event-stream',
+                ...authHeaders(),
+            },
+            body: formData,
+            credentials: 'include', // Include cookies for CORS with credentials
+        });
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        await readEventStream(response, {
+            transcript: onTranscript, sources: onSources, token: onToken, audio: onAudio, done: onDone, error: onError
+        });
+    },
+
     async sendAudio(audioBlob) {
         try {
             const formData = new FormData();
@@ -36,6 +125,7 @@ export const api = {
 
             const response = await fetch(`${API_ENDPOINT}/audio/speech-to-text`, {
                 method: 'POST',
+                headers: authHeaders(),
                 body: formData,
                 credentials: 'include', // Include cookies for CORS with credentials
             });
@@ -57,6 +147,7 @@ export const api = {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
+                    ...authHeaders(),
                 },
                 body: JSON.stringify({ text }),
                 credentials: 'include', // Include cookies for CORS with credentials
@@ -0,0 +1,116 @@
+// File: frontend/src/services/speechStream.js
+// Streams microphone audio to the backend for live transcription.
+// Audio is sent as 16 kHz mono 16-bit PCM over a WebSocket; the server
+// answers with partial transcripts while the student speaks and a final
+// transcript shortly after they stop.
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const WS_ENDPOINT = `${API_BASE_URL.replace(/^http/, 'ws')}/api/audio/stream`;
+const TARGET_RATE = 16000;
+
+// Average input samples down to 16 kHz and convert to 16-bit PCM
+const toPcm16 = (input, inputRate) => {
+    const ratio = inputRate / TARGET_RATE;
+    const length = Math.floor(input.length / ratio);
+    const output = new Int16Array(length);
+    for (let i = 0; i < length; i++) {
+        const start = Math.floor(i * ratio);
+        const end = Math.min(input.length, Math.floor((i + 1) * ratio));
+        let sum = 0;
+        for (let j = start; j < end; j++) sum += input[j];
+        const sample = Math.max(-1, Math.min(1, sum / Math.max(1, end - start)));
+        output[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+    }
+    return output;
+};
+
+export class SpeechStream {
+    constructor({ onPartial, onFinal } = {}) {
+        this.onPartial = onPartial;
+        this.onFinal = onFinal;
+        this.ws = null;
+        this.audioContext = null;
+        this.processor = null;
+        this.source = null;
+        this.transcript = '';
+        this.done = null;
+    }
+
+    async start(mediaStream) {
+        this.ws = new WebSocket(WS_ENDPOINT);
+        this.ws.binaryType = 'arraybuffer';
+
+        await new Promise((resolve, reject) => {
+            this.ws.onopen = resolve;
+            this.ws.onerror = reject;
+        });
+
+        this.done = new Promise((resolve, reject) => {
+            this.ws.onmessage = (event) => {
+                const message = JSON.parse(event.data);
+                if (message.type === 'partial') {
+                    this.onPartial?.(message.text);
+                } else if (message.type === 'final') {
+                    this.transcript = message.text;
+                    this.onFinal?.(message.text);
+                    if (message.done) resolve(message.text);
+                } else if (message.type === 'error') {
+                    reject(new Error(message.message));
+                }
+            };
+            this.ws.onclose = () => resolve(this.transcript);
+        });
+        // Errors surface through finish(); don't report them as unhandled before that
+        this.done.catch(() => {});
+
+        this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        this.source = this.audioContext.createMediaStreamSource(mediaStream);
+        this.processor = this.audioContext.createScriptProcessor(4096, 1, 1);
+        this.processor.onaudioprocess = (event) => {
+            if (this.ws?.readyState === WebSocket.OPEN) {
+                const pcm = toPcm16(event.inputBuffer.getChannelData(0), this.audioContext.sampleRate);
+                this.ws.send(pcm.buffer);
+            }
+        };
+        this.source.connect(this.processor);
+        // The processor only runs while connected to an output; it writes silence
+        this.processor.connect(this.audioContext.destination);
+    }
+
+    // Stop sending audio and wait for the final transcript
+    async finish(timeoutMs = 5000) {
+        this.stopCapture();
+        if (this.ws?.readyState === WebSocket.OPEN) {
+            this.ws.send('end');
+        }
+        const timeout = new Promise((resolve) => setTimeout(() => resolve(this.transcript), timeoutMs));
+        try {
+            return await Promise.race([this.done, timeout]);
+        } finally {
+            this.close();
+        }
+    }
+
+    stopCapture() {
+        if (this.processor) {
+            this.processor.disconnect();
+            this.processor.onaudioprocess = null;
+            this.processor = null;
+        }
+        if (this.source) {
+            this.source.disconnect();
+            this.source = null;
+        }
+        if (this.audioContext) {
+            this.audioContext.close().catch(console.error);
+            this.audioContext = null;
+        }
+    }
+
+    close() {
+        this.stopCapture();
+        if (this.ws && this.ws.readyState <= WebSocket.OPEN) {
+            this.ws.close();
+        }
+        this.ws = null;
+    }
+}